@@ -0,0 +1,92 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.append(PROJECT_ROOT)
+
+import numpy as np
+from src.embeddings.local import LocalEmbedder
+from src.retrieval.benchmark import DEFAULT_GOLDEN_PATH, load_golden_dataset
+
+# 비교 구성: (이름, 백엔드, 마이크로배치 최대 크기, 최대 대기 ms)
+# "torch-single"은 기존 경로(질의 1건씩 인코딩)를 재현합니다.
+CONFIGS = {
+    "torch-single": ("torch", 1, 0.0),
+    "torch-batched": ("torch", None, None),
+    "onnx": ("onnx", None, None),
+    "onnx-int8": ("onnx-int8", None, None),
+}
+
+async def run_load(embedder: LocalEmbedder, queries, concurrency: int):
+    """동시성 concurrency로 질의를 모두 임베딩하고 (벡터, 지연 목록, 총 소요 시간)을 반환합니다."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = [0.0] * len(queries)
+
+    async def _one(i: int, query: str):
+        async with semaphore:
+            started = time.perf_counter()
+            vector = await embedder.embed_query(query)
+            latencies[i] = (time.perf_counter() - started) * 1000
+            return vector
+
+    started = time.perf_counter()
+    vectors = await asyncio.gather(*(_one(i, q) for i, q in enumerate(queries)))
+    return np.asarray(vectors, dtype=np.float32), latencies, time.perf_counter() - started
+
+async def main():
+    parser = argparse.ArgumentParser(description="LocalEmbedder 백엔드/마이크로배치 구성별 질의 임베딩 지연·처리량 비교")
+    parser.add_argument("--configs", default="torch-single,torch-batched,onnx-int8", help=f"비교 구성 (쉼표 구분, 가능: {', '.join(CONFIGS)})")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시 요청 수 목록 (쉼표 구분)")
+    parser.add_argument("--golden", default=DEFAULT_GOLDEN_PATH, help="질의를 가져올 골든 데이터셋 경로")
+    parser.add_argument("--limit", type=int, default=256, help="사용할 질의 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    queries = [item["query"] for item in load_golden_dataset(args.golden)][:args.limit]
+    concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+    reports, reference = [], None
+
+    for name in args.configs.split(","):
+        backend, max_batch, max_wait = CONFIGS[name]
+        embedder = LocalEmbedder(backend=backend, max_batch_size=max_batch, max_wait_ms=max_wait)
+        await run_load(embedder, queries[:8], 8)  # 워밍업
+
+        for concurrency in concurrency_levels:
+            embedder.batcher.stats = {"requests": 0, "batches": 0, "max_batch": 0}
+            vectors, latencies, elapsed = await run_load(embedder, queries, concurrency)
+            if reference is None:
+                reference = vectors
+            # 첫 구성 대비 코사인 유사도 (양자화에 따른 벡터 품질 변화)
+            cosine = np.sum(vectors * reference, axis=1)
+            report = {
+                "config": name,
+                "backend": backend,
+                "concurrency": concurrency,
+                "queries": len(queries),
+                "throughput_qps": round(len(queries) / elapsed, 1),
+                "latency_ms": {p: round(float(np.percentile(latencies, q)), 1) for p, q in (("p50", 50), ("p95", 95), ("p99", 99))},
+                "batching": embedder.batcher.snapshot(),
+                "cosine_vs_reference": {"mean": round(float(cosine.mean()), 4), "min": round(float(cosine.min()), 4)},
+                "torch_threads": embedder.torch_threads,
+                "workers": embedder.workers,
+            }
+            reports.append(report)
+            print(f"📊 {name:<14} c={concurrency:<3} {report['throughput_qps']:>7} q/s  "
+                  f"p50={report['latency_ms']['p50']}ms p95={report['latency_ms']['p95']}ms  "
+                  f"평균 배치 {report['batching']['avg_batch']}  cos(mean/min)={report['cosine_vs_reference']['mean']}/{report['cosine_vs_reference']['min']}")
+        embedder.executor.shutdown(wait=False)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
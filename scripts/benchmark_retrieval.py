@@ -0,0 +1,160 @@
+import sys
+import os
+import io
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.append(PROJECT_ROOT)
+
+from src.retrieval.benchmark import (
+    DEFAULT_GOLDEN_PATH, DEFAULT_K_VALUES, load_golden_dataset, run_benchmark, RecordedRetriever,
+    RecordedQueryEmbedder, default_query_vectors_path,
+)
+
+def build_retriever(kind: str, backend: str, version: str, collection_name: str, embedder=None):
+    """
+    리트리버 종류(bm25/vector/hybrid)와 백엔드(atlas/local) 조합으로 리트리버를 생성합니다.
+    embedder를 주면 vector/hybrid의 질의 임베더로 사용합니다 (기본: 공유 임베더).
+    """
+    if kind == "bm25":
+        from src.retrieval.bm25_retriever import BM25Retriever
+        return BM25Retriever(version=version, collection_name=collection_name, backend=backend)
+    if kind == "vector":
+        from src.retrieval.vector_retriever import VectorRetriever
+        return VectorRetriever(version=version, collection_name=collection_name, embedder=embedder, backend=backend)
+    from src.retrieval.hybrid_search import HybridRetriever
+    return HybridRetriever(version=version, collection_name=collection_name, embedder=embedder,
+                           keyword_backend=backend, vector_backend=backend)
+
+def apply_profile(retriever, profile):
+    """
+    로컬 벡터 인덱스를 임베딩 프로파일(차원 축소 / int8)로 변환하고, 질의 임베더를 같은 차원으로 맞춥니다.
+    반환값: 변환된 인덱스의 벡터 메모리(바이트)
+    """
+    attr = "local_index" if hasattr(retriever, "local_index") else "local_vector_index"
+    base = getattr(retriever, attr)
+    if base is None:
+        raise ValueError("--profiles는 --backend local의 vector/hybrid 리트리버에서만 사용할 수 있습니다.")
+    index = base.with_profile(profile)
+    setattr(retriever, attr, index)
+    if isinstance(retriever.embedder, RecordedQueryEmbedder):
+        retriever.embedder = retriever.embedder.with_profile(profile)
+    elif profile.dimension != retriever.embedder.dimension:
+        # 공유 임베더와 같은 제공자 + 질의 캐시 경로 (캐시 키에 차원이 포함되어 프로파일 간 섞이지 않음)
+        from src.embeddings.factory import EmbeddingFactory
+        retriever.embedder = EmbeddingFactory.get_shared_embedder(getattr(retriever.embedder, "provider", None), profile)
+    return index.memory_bytes
+
+def print_report(report: dict, k_values):
+    overall = report["overall"]
+    latency = overall["latency_ms"]
+    print(f"\n📊 {report['retriever']} ({overall['queries']}건, 동시성 {report['concurrency']})")
+    print("   " + "  ".join(f"R@{k}={overall[f'recall@{k}']:.3f}" for k in k_values)
+          + f"  Hit@{max(k_values)}={overall[f'hit_rate@{max(k_values)}']:.3f}  MRR={overall['mrr']:.3f}")
+    print(f"   p50={latency['p50']}ms  p95={latency['p95']}ms  p99={latency['p99']}ms  "
+          f"{overall['throughput_qps']} q/s  errors={overall['errors']}  partial={overall['partial']}")
+    if "index_bytes" in report:
+        print(f"   profile={report['profile']}  index={report['index_bytes'] / 1024 / 1024:.2f}MB")
+    for specialist, stats in report["per_specialist"].items():
+        print(f"   - {specialist:<12} n={stats['queries']:<5} Hit@{max(k_values)}={stats[f'hit_rate@{max(k_values)}']:.3f}  "
+              f"MRR={stats['mrr']:.3f}  p95={stats['latency_ms']['p95']}ms")
+
+async def main():
+    parser = argparse.ArgumentParser(description="골든 데이터셋 기반 리트리버 벤치마크 (품질 + 지연)")
+    parser.add_argument("--dataset", default=DEFAULT_GOLDEN_PATH, help="골든 데이터셋 경로")
+    parser.add_argument("--retrievers", nargs="+", choices=["bm25", "vector", "hybrid"], default=["bm25", "vector", "hybrid"])
+    parser.add_argument("--backend", choices=["atlas", "local"], default="local", help="검색 백엔드 (local: 인프로세스 인덱스)")
+    parser.add_argument("--fixture", nargs="+", help="녹화된 결과 파일로 재생 (지정 시 --retrievers/--backend 무시)")
+    parser.add_argument("--record", help="실행 결과를 fixture로 녹화할 디렉토리")
+    parser.add_argument("--query-vectors", choices=["record", "replay"],
+                        help="vector/hybrid 질의 벡터: record=현재 임베더로 계산해 저장, replay=저장된 벡터 사용 (임베딩 API/모델 불필요)")
+    parser.add_argument("--query-vectors-path", help="질의 벡터 파일 경로 (기본: 골든 데이터셋 옆 *.query_vectors.npz)")
+    parser.add_argument("--version", default="v3")
+    parser.add_argument("--collection", default="care_guides")
+    parser.add_argument("--k", nargs="+", type=int, default=list(DEFAULT_K_VALUES), help="recall@k/hit_rate@k의 k 값")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 실행 쿼리 수 상한")
+    parser.add_argument("--sample", type=int, help="표본 크기 (기본: 전체)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON 결과 저장 경로 (기본: 표준 출력 요약만)")
+    parser.add_argument("--verbose", action="store_true", help="리트리버의 쿼리별 로그 출력")
+    parser.add_argument("--profiles", nargs="+",
+                        help="로컬 vector/hybrid를 임베딩 프로파일별로 비교 (예: 1536-float32 512-float32 512-int8)")
+    args = parser.parse_args()
+
+    dataset = load_golden_dataset(args.dataset, args.sample, args.seed)
+    print(f"📚 골든 데이터셋 {len(dataset)}건 로드 ({args.dataset})")
+
+    # 질의 벡터 녹화/재생: 재생 시 vector/hybrid가 질의 임베딩 호출 없이 동작 (지연에 임베딩 시간이 빠짐)
+    query_embedder = None
+    if args.query_vectors and not args.fixture:
+        vectors_path = args.query_vectors_path or default_query_vectors_path(args.dataset)
+        if args.query_vectors == "record":
+            from src.embeddings.factory import EmbeddingFactory
+            count = await RecordedQueryEmbedder.record(EmbeddingFactory.get_shared_embedder(), dataset,
+                                                       vectors_path, args.concurrency)
+            print(f"💾 질의 벡터 {count}건 저장: {vectors_path}")
+        else:
+            query_embedder = RecordedQueryEmbedder.load(vectors_path)
+            print(f"📦 질의 벡터 재생: {vectors_path} ({query_embedder.model_name}, {query_embedder.dimension}차원)")
+
+    if args.fixture:
+        recorded = [RecordedRetriever(path) for path in args.fixture]
+        targets = [(retriever.name, retriever) for retriever in recorded]
+    else:
+        targets = [(f"{kind}-{args.backend}", build_retriever(kind, args.backend, args.version, args.collection, query_embedder))
+                   for kind in args.retrievers]
+
+    # 프로파일 비교: vector/hybrid 리트리버마다 프로파일별 인덱스/임베더로 바꾼 사본을 측정
+    profiled = {}
+    if args.profiles and not args.fixture:
+        from src.embeddings.profile import EmbeddingProfile
+        expanded = []
+        for name, retriever in targets:
+            if name.startswith("bm25"):
+                expanded.append((name, retriever))
+                continue
+            kind = name.split("-")[0]
+            for value in args.profiles:
+                profile = EmbeddingProfile.parse(value)
+                variant = build_retriever(kind, args.backend, args.version, args.collection, query_embedder)
+                variant_name = f"{name}@{profile.name}"
+                profiled[variant_name] = (profile.name, apply_profile(variant, profile))
+                expanded.append((variant_name, variant))
+        targets = expanded
+
+    reports = []
+    for name, retriever in targets:
+        # 리트리버의 쿼리별 print 로그가 지연 측정과 출력을 가리지 않도록 기본적으로 숨깁니다
+        sink = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with sink:
+            report = await run_benchmark(retriever, dataset, name, args.k, args.concurrency)
+            if args.record and not args.fixture:
+                await RecordedRetriever.record(retriever, dataset, os.path.join(args.record, f"{name}.json"),
+                                               name, max(args.k), args.concurrency)
+        if name in profiled:
+            report["profile"], report["index_bytes"] = profiled[name]
+        reports.append(report)
+        print_report(report, sorted(set(args.k)))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        payload = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "dataset": args.dataset,
+            "queries": len(dataset),
+            "sample": args.sample,
+            "seed": args.seed,
+            "reports": reports,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+import sys
+import os
+import time
+import asyncio
+import argparse
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.append(PROJECT_ROOT)
+
+from src.core.config import ZipsaConfig, RetrievalConfig
+from src.retrieval.bm25_index import BM25Index
+
+async def main():
+    parser = argparse.ArgumentParser(description="인프로세스 BM25 인덱스 생성 (tokenized_text 기반)")
+    parser.add_argument("--source", choices=["json", "mongo"], default="json", help="문서 출처 (기본: json)")
+    parser.add_argument("--input", default="data/v3/processed.json", help="--source json일 때 입력 파일")
+    parser.add_argument("--output", default=RetrievalConfig.local_index_path("bm25", "v3"), help="인덱스 저장 디렉토리")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.source == "mongo":
+        from src.utils.mongodb import MongoDBManager
+        policy = ZipsaConfig.get_policy("v3")
+        collection = MongoDBManager.get_v3_db()[policy.collection_name]
+        index = await BM25Index.from_collection(collection)
+    else:
+        index = BM25Index.from_json(args.input)
+
+    # Matchmaker는 categories=Breeds 필터로 검색하므로 품종 문서가 없는 인덱스는 추천 검색이 항상 비게 됨
+    breeds = sum(1 for doc in index.docs if "Breeds" in (doc.get("categories") or []))
+    if breeds == 0:
+        print(f"❌ {args.source} 원본에 품종 문서(categories=Breeds)가 없습니다. "
+              "process_breeds_v3.py로 품종을 적재한 뒤 --source mongo로 만들거나, 품종 문서가 포함된 --input을 지정하세요.")
+        sys.exit(1)
+    index.save(args.output)
+    print(f"✨ BM25 인덱스 저장 완료: {args.output} (문서 {len(index.docs)}건, 품종 {breeds}건, 어휘 {len(index.vocab)}개, {time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    BM25Index.load(args.output)
+    print(f"⚡ 로드 시간: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    asyncio.run(main())
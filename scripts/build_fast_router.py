@@ -0,0 +1,84 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.append(PROJECT_ROOT)
+
+from src.core.config import RouterConfig
+from src.embeddings.factory import EmbeddingFactory
+from src.retrieval.benchmark import DEFAULT_GOLDEN_PATH, load_golden_dataset
+from src.agents.fast_router import FastRouter, ROUTES, SPECIALIST_ROUTES, METHODS
+
+def load_exemplars(golden_path: str, log_paths):
+    """골든 데이터셋(specialist → 경로)과 라벨링된 대화 로그(JSONL: {"query", "route"})를 (질의, 경로) 리스트로 읽습니다."""
+    exemplars = [(item["query"], SPECIALIST_ROUTES[item["specialist"]])
+                 for item in load_golden_dataset(golden_path) if item.get("specialist") in SPECIALIST_ROUTES]
+    for path in log_paths or []:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("query") and record.get("route") in ROUTES:
+                    exemplars.append((record["query"], record["route"]))
+    return exemplars
+
+async def embed_queries(embedder, provider: str, texts, concurrency: int = 32):
+    """
+    서비스와 같은 질의 임베딩 공간에서 예시를 임베딩합니다.
+    OpenAI는 질의/문서 임베딩이 동일하므로 문서 배치 API를, 로컬(E5)은 'query:' 접두사가 붙는 embed_query를 사용합니다.
+    """
+    if provider != "local":
+        return await embedder.embed_documents_array(texts)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(text):
+        async with semaphore:
+            return await embedder.embed_query(text)
+
+    return await asyncio.gather(*(_one(text) for text in texts))
+
+async def main():
+    parser = argparse.ArgumentParser(description="head_butler 패스트 패스 라우터 생성 (경로별 centroid / k-NN + 임계값 보정)")
+    parser.add_argument("--golden", default=DEFAULT_GOLDEN_PATH, help="골든 데이터셋 경로 (specialist 라벨 사용)")
+    parser.add_argument("--logs", nargs="*", help="라벨링된 대화 로그 JSONL ({\"query\": ..., \"route\": ...})")
+    parser.add_argument("--provider", help="임베딩 제공자 (기본: EMBEDDING_PROVIDER, 서비스와 같아야 함)")
+    parser.add_argument("--method", choices=METHODS, default="centroid")
+    parser.add_argument("--k", type=int, default=5, help="knn 방식에서 경로별 평균낼 이웃 수")
+    parser.add_argument("--min-margin", type=float, default=0.02, help="1·2위 경로 점수 차 최소값")
+    parser.add_argument("--target-precision", type=float, default=0.95, help="임계값 보정 목표 정밀도 (1 - 허용 불일치율)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="보정용 홀드아웃 비율")
+    parser.add_argument("--output", default=RouterConfig.FAST_PATH_PATH, help="라우터 저장 디렉토리")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    exemplars = load_exemplars(args.golden, args.logs)
+    print(f"📚 예시 {len(exemplars)}건 로드 ({', '.join(f'{r}={sum(1 for _, x in exemplars if x == r)}' for r in ROUTES)})")
+
+    provider = EmbeddingFactory.resolve_provider(args.provider)
+    embedder = EmbeddingFactory.get_shared_embedder(provider)
+    vectors = await embed_queries(embedder, provider, [query for query, _ in exemplars])
+
+    router = FastRouter.build(
+        vectors, [route for _, route in exemplars], method=args.method, k=args.k, min_margin=args.min_margin,
+        target_precision=args.target_precision, holdout=args.holdout,
+        meta={"provider": provider, "model": getattr(embedder, "model_name", embedder.__class__.__name__)},
+    )
+    router.save(args.output)
+
+    calibration = router.meta["calibration"]
+    print(f"✨ 패스트 패스 라우터 저장 완료: {args.output} ({router.method}, {router.dimension}차원, {time.perf_counter() - start:.2f}s)")
+    print(f"   홀드아웃 {calibration['count']}건: coverage={calibration['coverage']:.1%}  disagreement={calibration['disagreement']:.1%}  "
+          f"top1={calibration['top1_accuracy']:.1%}")
+    for route, stats in calibration["per_route"].items():
+        threshold = "LLM 전용" if stats["threshold"] is None else f"{stats['threshold']:.3f}"
+        print(f"   - {route:<11} n={stats['count']:<5} coverage={stats['coverage']:.1%}  threshold={threshold}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+import sys
+import os
+import time
+import asyncio
+import argparse
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.append(PROJECT_ROOT)
+
+from src.core.config import ZipsaConfig, RetrievalConfig
+from src.retrieval.vector_index import VectorIndex
+
+async def main():
+    parser = argparse.ArgumentParser(description="인프로세스 벡터 인덱스 생성 (V3Embedder 임베딩 기반)")
+    parser.add_argument("--source", choices=["file", "mongo"], default="file", help="임베딩 출처 (기본: file)")
+    parser.add_argument("--input", default="data/v3/embedded", help="--source file일 때 V3Embedder 출력 (컬럼형 산출물 디렉토리)")
+    parser.add_argument("--mode", choices=["auto", "exact", "ivf", "hnsw"], default="auto", help="인덱스 모드")
+    parser.add_argument("--nprobe", type=int, default=8, help="ivf 모드에서 탐색할 클러스터 수")
+    parser.add_argument("--output", default=RetrievalConfig.local_index_path("vector", "v3"), help="인덱스 저장 디렉토리")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.source == "mongo":
+        from src.utils.mongodb import MongoDBManager
+        policy = ZipsaConfig.get_policy("v3")
+        collection = MongoDBManager.get_v3_db()[policy.collection_name]
+        index = await VectorIndex.from_collection(collection, mode=args.mode, nprobe=args.nprobe)
+    else:
+        index = VectorIndex.from_artifact(args.input, mode=args.mode, nprobe=args.nprobe)
+    index.save(args.output)
+    print(f"✨ 벡터 인덱스 저장 완료: {args.output} (문서 {len(index.docs)}건, {index.dimension}차원, 모드 {index.mode}, {time.perf_counter() - start:.2f}s)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
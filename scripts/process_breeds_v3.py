@@ -3,7 +3,6 @@ import json
 import asyncio
 from tqdm import tqdm
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
 
 # Local Modules
 import sys
@@ -12,6 +11,8 @@ from src.pipelines.v3.schemas import StoredBreedV3, BreedStats
 from src.utils.text import tokenize_korean
 from src.embeddings.factory import EmbeddingFactory
 from src.core.config import ZipsaConfig
+from src.utils.mongodb import MongoDBManager
+from src.pipelines.bulk import BulkUpserter
 
 load_dotenv()
 
@@ -21,9 +22,8 @@ class BreedPipeline:
         self.embedder = EmbeddingFactory.get_embedder("openai")
         
         # Initialize DB (Using V3 Policy Config)
-        self.db_client = AsyncIOMotorClient(os.getenv("MONGO_V3_URI"))
         v3_policy = ZipsaConfig.get_policy("v3")
-        self.db = self.db_client[v3_policy.db_name] # cat_library
+        self.db = MongoDBManager.get_v3_db() # cat_library
         self.collection = self.db[v3_policy.collection_name] # care_guides (Unified Collection Strategy)
         
     async def process(self):
@@ -133,23 +133,18 @@ class BreedPipeline:
             print("⚠️ No documents to save.")
             return
 
-        operations = []
-        from pymongo import UpdateOne
-        
-        for doc in documents:
-            op = UpdateOne(
-                {"uid": doc.uid},
-                {"$set": doc.model_dump()},
-                upsert=True
-            )
-            operations.append(op)
-            
-        if operations:
-            result = await self.collection.bulk_write(operations)
-            print(f"✅ Upserted: {result.upserted_count}, Modified: {result.modified_count}")
+        # Same chunked unordered bulk_write path as the article loaders
+        report = await BulkUpserter(self.collection).upsert(
+            (doc.model_dump() for doc in documents), key_fn=lambda item: {"uid": item["uid"]},
+            total=len(documents), desc="Upserting"
+        )
+        print(f"✅ {report.summary()}")
         
         print("🎉 Breed Pipeline Completed!")
 
 if __name__ == "__main__":
     pipeline = BreedPipeline()
-    asyncio.run(pipeline.process())
+    try:
+        asyncio.run(pipeline.process())
+    finally:
+        MongoDBManager.close_all()
@@ -0,0 +1,59 @@
+import sys
+import os
+import json
+import asyncio
+import argparse
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.append(PROJECT_ROOT)
+
+from pymongo.operations import SearchIndexModel
+from src.core.config import ZipsaConfig
+from src.utils.mongodb import MongoDBManager
+
+INDEX_CONFIGS = {
+    "v1": MongoDBManager.get_v1_index_config,
+    "v2": MongoDBManager.get_v2_index_config,
+    "v3": MongoDBManager.get_v3_index_config,
+}
+
+def _filter_paths(definition):
+    return {field["path"] for field in definition.get("fields", []) if field.get("type") == "filter"}
+
+async def main():
+    parser = argparse.ArgumentParser(description="Atlas vector_index 정의를 코드(MongoDBManager.get_v*_index_config)와 맞춤 (없으면 생성, 다르면 갱신)")
+    parser.add_argument("--version", choices=list(INDEX_CONFIGS), default="v3")
+    parser.add_argument("--dry-run", action="store_true", help="변경 사항만 출력하고 적용하지 않음")
+    args = parser.parse_args()
+
+    config = INDEX_CONFIGS[args.version]()
+    policy = ZipsaConfig.get_policy(args.version)
+    collection = MongoDBManager.get_db(args.version)[policy.collection_name]
+
+    existing = None
+    async for index in collection.list_search_indexes(config["name"]):
+        existing = index
+    current = (existing or {}).get("latestDefinition") or {}
+
+    added = sorted(_filter_paths(config["definition"]) - _filter_paths(current))
+    removed = sorted(_filter_paths(current) - _filter_paths(config["definition"]))
+    if existing is not None and current == config["definition"]:
+        print(f"✅ {policy.collection_name}.{config['name']}: 이미 최신 정의입니다.")
+        return
+
+    print(f"📋 {policy.collection_name}.{config['name']}: {'갱신' if existing else '생성'} (필터 경로 추가 {added or '-'}, 제거 {removed or '-'})")
+    if args.dry_run:
+        print(json.dumps(config["definition"], ensure_ascii=False, indent=2))
+        return
+
+    if existing is None:
+        await collection.create_search_index(SearchIndexModel(definition=config["definition"], name=config["name"], type="vectorSearch"))
+    else:
+        await collection.update_search_index(config["name"], config["definition"])
+    # Atlas는 인덱스를 백그라운드에서 다시 빌드하며, 빌드 중에도 이전 정의로 검색이 계속 동작합니다.
+    print("✨ 요청 완료. 상태가 READY가 되면 VECTOR_TOMBSTONE_PREFILTER=true로 툼스톤 pre-filter를 켜세요.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,4 +13,5 @@ from src.pipelines.v1.preprocessor import V1Preprocessor
 
 if __name__ == "__main__":
     processor = V1Preprocessor()
-    processor.run()
+    # --fresh: ignore checkpoints and reprocess from scratch
+    processor.run(resume="--fresh" not in sys.argv)
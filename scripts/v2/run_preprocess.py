@@ -15,4 +15,5 @@ from src.pipelines.v2.preprocessor import V2Preprocessor
 if __name__ == "__main__":
     processor = V2Preprocessor()
     # V2 preprocessor uses LLM and is async
-    processor.run()
+    # --fresh: ignore checkpoints and reprocess from scratch
+    processor.run(resume="--fresh" not in sys.argv)
@@ -0,0 +1,33 @@
+import sys
+import os
+import json
+import asyncio
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__)) # scripts/v3/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR)) # project root
+sys.path.append(PROJECT_ROOT)
+
+from src.pipelines.v3.incremental import V3IncrementalIngestor
+from src.utils.mongodb import MongoDBManager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+async def main():
+    # 사용법: run_incremental.py [--dry-run] [--fresh]
+    #   --dry-run: 신규/변경/삭제 건수만 계산하고 종료
+    #   --fresh: 분류 체크포인트를 무시하고 대상 문서를 처음부터 처리
+    ingestor = V3IncrementalIngestor()
+    await MongoDBManager.warm_up()
+    try:
+        report = await ingestor.run(resume="--fresh" not in sys.argv, dry_run="--dry-run" in sys.argv)
+    finally:
+        MongoDBManager.close_all()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    # 처리에 실패한 문서가 있으면 (매니페스트에 남지 않아 다음 실행에서 재처리) 실패로 종료
+    if report.get("failed"):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
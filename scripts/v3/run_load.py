@@ -8,12 +8,17 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
 sys.path.append(PROJECT_ROOT)
 
 from src.pipelines.v3.loader import V3Loader
+from src.utils.mongodb import MongoDBManager
 
 async def main():
     loader = V3Loader()
     # Input is the output of embedder
-    input_path = "data/v3/embedded.pkl"
-    await loader.run(input_path)
+    input_path = "data/v3/embedded"
+    await MongoDBManager.warm_up()
+    try:
+        await loader.run(input_path)
+    finally:
+        MongoDBManager.close_all()
 
 if __name__ == "__main__":
     asyncio.run(main())
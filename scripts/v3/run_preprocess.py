@@ -13,12 +13,15 @@ from dotenv import load_dotenv
 load_dotenv()
 
 async def main():
+    # 사용법: run_preprocess.py [limit] [--fresh]  (--fresh: 체크포인트를 무시하고 처음부터 처리)
+    args = [arg for arg in sys.argv[1:] if arg != "--fresh"]
+    resume = "--fresh" not in sys.argv
     limit = None
-    if len(sys.argv) > 1:
-        limit = int(sys.argv[1])
+    if args:
+        limit = int(args[0])
         
     processor = V3Preprocessor()
-    await processor.run(limit=limit)
+    await processor.run(limit=limit, resume=resume)
 
 if __name__ == "__main__":
     asyncio.run(main())
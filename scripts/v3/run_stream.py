@@ -0,0 +1,35 @@
+import sys
+import os
+import json
+import asyncio
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__)) # scripts/v3/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR)) # project root
+sys.path.append(PROJECT_ROOT)
+
+from src.pipelines.v3.streaming import V3StreamingPipeline
+from src.utils.mongodb import MongoDBManager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+async def main():
+    # 사용법: run_stream.py [limit] [--fresh]  (전처리 → 임베딩 → 적재를 큐로 연결해 한 번에 실행)
+    args = [arg for arg in sys.argv[1:] if arg != "--fresh"]
+    resume = "--fresh" not in sys.argv
+    limit = int(args[0]) if args else None
+
+    pipeline = V3StreamingPipeline()
+    await MongoDBManager.warm_up()
+    try:
+        report = await pipeline.run(limit=limit, resume=resume)
+    finally:
+        MongoDBManager.close_all()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    # 분류 배치가 최종 실패한 경우 일부만 적재되었으므로 실패로 종료
+    if report["failed_batches"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Ensure project root is in path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+sys.path.append(PROJECT_ROOT)
+
+from src.retrieval.breed_names import BreedNameIndex
+
+# V3 품종 문서 중 이름 조회에 필요한 필드만 (별칭은 synonyms.json에서 로드)
+DOCS = [
+    {"uid": "korean_shorthair", "name_ko": "코리안 쇼트헤어", "name_en": "Korean Shorthair"},
+    {"uid": "birman", "name_ko": "버만", "name_en": "Birman"},
+    {"uid": "siamese", "name_ko": "샴", "name_en": "Siamese"},
+    {"uid": "bengal", "name_ko": "벵갈", "name_en": "Bengal"},
+    {"uid": "exotic", "name_ko": "엑조틱 쇼트헤어", "name_en": "Exotic Shorthair"},
+    {"uid": "aegean", "name_ko": "에게안", "name_en": "Aegean"},
+    {"uid": "maine_coon", "name_ko": "메인 쿤", "name_en": "Maine Coon"},
+]
+
+# (질문, 기대 품종 uid 목록) — 빈 목록이면 품종을 찾지 않아야 함 (LOOKUP의 '모르는 품종' 안내)
+CASES = [
+    ("우리 고양이가 무슨 종이야", []),
+    ("고양이가 어떤 품종이야", []),
+    ("버만큼 큰 고양이 있어?", []),
+    ("샴푸 추천해줘", []),
+    ("버만은 어때?", ["birman"]),
+    ("버만처럼 얌전한 애", ["birman"]),
+    ("샴이랑 벵갈 비교해줘", ["siamese", "bengal"]),
+    ("길고양이 입양하려고", ["korean_shorthair"]),
+    ("벵골 고양이 성격", ["bengal"]),
+    ("엑죠틱이 궁금해", ["exotic"]),
+    ("메인쿤 성격 어때?", ["maine_coon"]),
+]
+
+
+def validate():
+    index = BreedNameIndex(DOCS)
+    print(f"=== Breed Name Index Validation ({len(index)} keys) ===\n")
+
+    failures = 0
+    for question, expected in CASES:
+        hits = index.find(question)
+        found = [hit.doc["uid"] for hit in hits]
+        if found == expected:
+            print(f"   - [PASS] {question!r} → {found or '(없음)'}")
+        else:
+            failures += 1
+            detail = [(hit.doc["uid"], hit.alias, hit.score) for hit in hits]
+            print(f"   - [FAIL] {question!r} → {detail} (기대: {expected or '(없음)'})")
+
+    print(f"\n{len(CASES) - failures}/{len(CASES)} passed")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if validate() else 1)
@@ -11,7 +11,8 @@ from pydantic import BaseModel, Field
 
 from .state import AgentState
 from src.core.prompts.prompt_manager import prompt_manager
-from src.retrieval.hybrid_search import HybridRetriever
+from src.retrieval.registry import RetrieverRegistry
+from .speculation import SPECULATIVE_RETRIEVAL
 
 llm_router = init_chat_model(LLMConfig.ROUTER_MODEL, model_provider="openai")
 llm_basic = init_chat_model(LLMConfig.BASIC_MODEL, model_provider="openai")
@@ -61,14 +62,16 @@ async def care_team_node(state: AgentState) -> Command:
     ], config={"tags": ["router_classification"]})
 
     config = SPECIALIST_CONFIG[decision.category]
+    # 세부 분류가 확정되었으므로 다른 태그의 추측 검색은 취소
+    SPECULATIVE_RETRIEVAL.keep_only(last_msg, [config["specialist_tag"]])
 
     # 2. 페르소나 프롬프트 로딩
     persona = prompt_manager.get_prompt(config["persona_key"], field="persona")
 
-    # 3. 전문가 태그 기반 RAG 검색
-    retriever = HybridRetriever(version="v3", collection_name="care_guides")
-    results = await retriever.search(
-        last_msg, specialist=config["specialist_tag"], limit=3
+    # 3. 전문가 태그 기반 RAG 검색 (추측 검색 결과가 있으면 재사용)
+    retriever = RetrieverRegistry.get_hybrid(version="v3", collection_name="care_guides")
+    results = await SPECULATIVE_RETRIEVAL.search(
+        retriever, last_msg, specialist=config["specialist_tag"], limit=3
     )
 
     # 4. RAG 컨텍스트 압축 — LLM이 원문에서 핵심 정보 추출
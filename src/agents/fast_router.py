@@ -0,0 +1,280 @@
+"""
+수석 집사 패스트 패스 라우터: 질의 임베딩과 경로별 centroid / k-NN 예시의 유사도로 LLM 분류 없이 라우팅
+"""
+import os
+import json
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+
+ROUTES = ("matchmaker", "liaison", "care", "general")
+
+# 골든 데이터셋 specialist → head_butler 라우팅 경로
+SPECIALIST_ROUTES = {
+    "Matchmaker": "matchmaker",
+    "Liaison": "liaison",
+    "Physician": "care",
+    "Peacekeeper": "care",
+    "General": "general",
+    "General Info": "general",
+}
+
+METHODS = ("centroid", "knn")
+
+
+def _normalize(vectors) -> np.ndarray:
+    arr = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return arr / norms
+
+
+@dataclass
+class FastRouteDecision:
+    """패스트 패스 판정 결과. confident=False면 LLM 라우터로 넘깁니다."""
+    route: str
+    score: float
+    margin: float
+    confident: bool
+
+
+class FastRouter:
+    """
+    질의 임베딩의 경로별 점수로 head_butler 라우팅을 미리 결정합니다.
+    - centroid: 경로별 예시 평균 벡터와의 코사인 유사도
+    - knn: 경로별로 가장 가까운 예시 k개의 평균 유사도
+    최고 점수 경로의 점수가 보정된 경로별 임계값 이상이고 2위와의 차이가 min_margin 이상일 때만 확신(confident)으로 판정합니다.
+    임계값은 build() 시 홀드아웃 예시에서 목표 정밀도(target_precision)를 만족하는 가장 낮은 점수로 정합니다.
+    """
+    _loaded: Dict[str, "FastRouter"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, routes: Sequence[str], centroids: np.ndarray, exemplars: np.ndarray, exemplar_labels: np.ndarray,
+                 thresholds: Dict[str, float], method: str = "centroid", k: int = 5, min_margin: float = 0.02,
+                 meta: Dict[str, Any] = None):
+        if method not in METHODS:
+            raise ValueError(f"지원되지 않는 라우팅 방식입니다: {method} (가능: {', '.join(METHODS)})")
+        self.routes = list(routes)
+        self.centroids = centroids
+        self.exemplars = exemplars
+        self.exemplar_labels = exemplar_labels
+        self.thresholds = thresholds
+        self.method = method
+        self.k = k
+        self.min_margin = min_margin
+        self.meta = meta or {}
+        self.dimension = centroids.shape[1]
+
+    # ------------------------------------------------------------------ 점수/판정
+
+    def scores(self, vectors) -> np.ndarray:
+        """(M, dimension) 질의 벡터 → (M, 경로 수) 경로별 점수."""
+        queries = _normalize(np.atleast_2d(vectors))
+        if self.method == "centroid":
+            return queries @ self.centroids.T
+        sims = queries @ self.exemplars.T
+        scores = np.full((len(queries), len(self.routes)), -1.0, dtype=np.float32)
+        for r in range(len(self.routes)):
+            route_sims = sims[:, self.exemplar_labels == r]
+            if route_sims.shape[1] == 0:
+                continue
+            k = min(self.k, route_sims.shape[1])
+            scores[:, r] = -np.sort(-route_sims, axis=1)[:, :k].mean(axis=1)
+        return scores
+
+    def _decide(self, row: np.ndarray) -> FastRouteDecision:
+        order = np.argsort(-row)
+        best = int(order[0])
+        score = float(row[best])
+        margin = score - float(row[order[1]]) if len(order) > 1 else score
+        route = self.routes[best]
+        confident = score >= self.thresholds.get(route, float("inf")) and margin >= self.min_margin
+        return FastRouteDecision(route=route, score=score, margin=margin, confident=confident)
+
+    def route(self, vector) -> FastRouteDecision:
+        if len(vector) != self.dimension:
+            raise ValueError(f"질의 벡터 차원이 라우터와 다릅니다: 라우터 {self.dimension}, 질의 {len(vector)}")
+        return self._decide(self.scores(vector)[0])
+
+    # ------------------------------------------------------------------ 생성/보정
+
+    @staticmethod
+    def _fit(vectors: np.ndarray, labels: np.ndarray, num_routes: int) -> np.ndarray:
+        centroids = np.zeros((num_routes, vectors.shape[1]), dtype=np.float32)
+        for r in range(num_routes):
+            members = vectors[labels == r]
+            if len(members):
+                centroids[r] = members.mean(axis=0)
+        return _normalize(centroids)
+
+    def calibrate(self, vectors: np.ndarray, labels: np.ndarray, target_precision: float = 0.95,
+                  min_support: int = 5) -> Dict[str, Any]:
+        """
+        라벨이 있는 홀드아웃 벡터로 경로별 임계값을 정합니다.
+        경로 r로 예측된 예시를 점수 내림차순으로 보며, 누적 정밀도가 target_precision 이상인 가장 깊은 지점의 점수를 임계값으로 사용합니다.
+        해당 예측이 min_support건 미만이거나 목표를 만족하는 지점이 없으면 그 경로는 항상 LLM으로 넘깁니다 (임계값 inf).
+        """
+        decisions = [self._decide(row) for row in self.scores(vectors)]
+        thresholds = {}
+        for r, route in enumerate(self.routes):
+            picked = [(d.score, labels[i] == r) for i, d in enumerate(decisions)
+                      if d.route == route and d.margin >= self.min_margin]
+            thresholds[route] = float("inf")
+            if len(picked) < min_support:
+                continue
+            picked.sort(key=lambda x: -x[0])
+            correct = np.cumsum([ok for _, ok in picked])
+            precision = correct / np.arange(1, len(picked) + 1)
+            passing = np.flatnonzero((precision >= target_precision) & (np.arange(1, len(picked) + 1) >= min_support))
+            if len(passing):
+                thresholds[route] = float(picked[passing[-1]][0])
+        self.thresholds = thresholds
+        return self.evaluate(vectors, labels)
+
+    def evaluate(self, vectors: np.ndarray, labels: np.ndarray) -> Dict[str, Any]:
+        """
+        라벨 데이터에 대한 패스트 패스 지표.
+        - coverage: LLM 없이 라우팅된 비율
+        - disagreement: 패스트 패스로 라우팅된 건 중 라벨과 다른 비율
+        - top1_accuracy: 임계값과 무관한 최고 점수 경로의 정확도 (LLM 폴백 건 포함)
+        """
+        decisions = [self._decide(row) for row in self.scores(vectors)]
+        fast = [i for i, d in enumerate(decisions) if d.confident]
+        wrong = [i for i in fast if self.routes.index(decisions[i].route) != labels[i]]
+        per_route = {}
+        for r, route in enumerate(self.routes):
+            members = [i for i in range(len(labels)) if labels[i] == r]
+            routed = [i for i in members if decisions[i].confident]
+            per_route[route] = {
+                "count": len(members),
+                "coverage": round(len(routed) / len(members), 4) if members else 0.0,
+                "threshold": None if self.thresholds.get(route, float("inf")) == float("inf") else round(self.thresholds[route], 4),
+            }
+        return {
+            "count": len(labels),
+            "coverage": round(len(fast) / len(labels), 4) if len(labels) else 0.0,
+            "disagreement": round(len(wrong) / len(fast), 4) if fast else 0.0,
+            "top1_accuracy": round(float(np.mean([self.routes.index(d.route) == labels[i] for i, d in enumerate(decisions)])), 4) if decisions else 0.0,
+            "per_route": per_route,
+        }
+
+    @classmethod
+    def build(cls, vectors, routes: Sequence[str], method: str = "centroid", k: int = 5, min_margin: float = 0.02,
+              target_precision: float = 0.95, holdout: float = 0.2, seed: int = 42, meta: Dict[str, Any] = None) -> "FastRouter":
+        """
+        (예시 벡터, 경로 라벨)로 라우터를 생성합니다. 경로별 층화 분할한 홀드아웃으로 임계값을 보정한 뒤,
+        같은 임계값을 유지한 채 전체 예시로 centroid/예시를 다시 만듭니다. 보정 지표는 meta["calibration"]에 기록됩니다.
+        """
+        vectors = _normalize(vectors)
+        labels = np.array([ROUTES.index(route) for route in routes], dtype=np.int32)
+
+        rng = random.Random(seed)
+        held = np.zeros(len(labels), dtype=bool)
+        for r in range(len(ROUTES)):
+            members = list(np.flatnonzero(labels == r))
+            rng.shuffle(members)
+            held[members[:int(len(members) * holdout)]] = True
+
+        train = ~held
+        router = cls(ROUTES, cls._fit(vectors[train], labels[train], len(ROUTES)), vectors[train], labels[train],
+                     thresholds={}, method=method, k=k, min_margin=min_margin)
+        calibration = router.calibrate(vectors[held], labels[held], target_precision)
+
+        meta = dict(meta or {})
+        meta.update({"calibration": calibration, "target_precision": target_precision, "exemplars": len(labels),
+                     "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        return cls(ROUTES, cls._fit(vectors, labels, len(ROUTES)), vectors, labels, router.thresholds,
+                   method=method, k=k, min_margin=min_margin, meta=meta)
+
+    # ------------------------------------------------------------------ 저장/로드
+
+    def save(self, path: str):
+        """router.npz (centroid + 예시) + router.json (경로, 임계값, 보정 지표) 디렉토리로 저장합니다."""
+        os.makedirs(path, exist_ok=True)
+        np.savez(os.path.join(path, "router.npz"), centroids=self.centroids, exemplars=self.exemplars, labels=self.exemplar_labels)
+        with open(os.path.join(path, "router.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "routes": self.routes,
+                "method": self.method,
+                "k": self.k,
+                "min_margin": self.min_margin,
+                "dimension": self.dimension,
+                "thresholds": {route: (None if t == float("inf") else t) for route, t in self.thresholds.items()},
+                **self.meta,
+            }, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "FastRouter":
+        meta_path = os.path.join(path, "router.json")
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"패스트 패스 라우터를 찾을 수 없습니다: {path} (scripts/build_fast_router.py로 먼저 생성하세요)")
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with np.load(os.path.join(path, "router.npz")) as arrays:
+            centroids, exemplars, labels = arrays["centroids"], arrays["exemplars"], arrays["labels"]
+        thresholds = {route: (float("inf") if t is None else t) for route, t in meta.pop("thresholds").items()}
+        return cls(meta.pop("routes"), centroids, exemplars, labels, thresholds,
+                   method=meta.pop("method"), k=meta.pop("k"), min_margin=meta.pop("min_margin"), meta=meta)
+
+    @classmethod
+    def load_shared(cls, path: str) -> "FastRouter":
+        """경로별로 프로세스에서 한 번만 로드되는 공유 라우터를 반환합니다."""
+        with cls._lock:
+            if path not in cls._loaded:
+                cls._loaded[path] = cls.load(path)
+            return cls._loaded[path]
+
+
+class FastRouterStats:
+    """
+    서비스 중 패스트 패스 지표를 집계합니다.
+    - coverage: 전체 턴 중 LLM 분류 없이 라우팅된 비율
+    - disagreement: 섀도 검사(패스트 패스 턴 일부를 LLM으로도 분류) 중 결과가 달랐던 비율
+    - fallback_agreement: LLM으로 넘긴 턴에서 라우터 1순위가 LLM 결정과 같았던 비율 (임계값 완화 여지)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {
+            "turns": 0, "fast_path": 0, "llm": 0, "errors": 0,
+            "shadow_checks": 0, "shadow_disagreements": 0,
+            "fallback_compared": 0, "fallback_agreements": 0,
+        }
+        self.routes: Dict[str, int] = {}
+
+    def record(self, decision: Optional[FastRouteDecision], final_route: str = None, error: bool = False):
+        with self._lock:
+            self.counts["turns"] += 1
+            if error:
+                self.counts["errors"] += 1
+            if decision is not None and decision.confident:
+                self.counts["fast_path"] += 1
+                self.routes[decision.route] = self.routes.get(decision.route, 0) + 1
+                return
+            self.counts["llm"] += 1
+            if decision is not None and final_route is not None:
+                self.counts["fallback_compared"] += 1
+                self.counts["fallback_agreements"] += int(decision.route == final_route)
+
+    def record_shadow(self, decision: FastRouteDecision, llm_route: str):
+        with self._lock:
+            self.counts["shadow_checks"] += 1
+            if decision.route != llm_route:
+                self.counts["shadow_disagreements"] += 1
+                logging.info(f"[FAST ROUTER] 섀도 불일치: fast={decision.route}({decision.score:.3f}) llm={llm_route}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.counts)
+            stats["fast_path_routes"] = dict(self.routes)
+        stats["coverage"] = round(stats["fast_path"] / stats["turns"], 4) if stats["turns"] else 0.0
+        stats["disagreement"] = round(stats["shadow_disagreements"] / stats["shadow_checks"], 4) if stats["shadow_checks"] else 0.0
+        stats["fallback_agreement"] = round(stats["fallback_agreements"] / stats["fallback_compared"], 4) if stats["fallback_compared"] else 0.0
+        return stats
+
+
+ROUTER_STATS = FastRouterStats()
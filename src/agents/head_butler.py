@@ -2,16 +2,22 @@
 수석 집사: 메인 라우터 및 응답 합성기
 """
 import json
+import random
+import asyncio
+import logging
 
 from langchain.chat_models import init_chat_model
-from src.core.config import LLMConfig
-from langchain_core.messages import SystemMessage
+from src.core.config import LLMConfig, RouterConfig
+from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.types import Command
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import Literal, Optional
 
 from .state import AgentState
+from .fast_router import FastRouter, FastRouteDecision, ROUTER_STATS
+from .speculation import SPECULATIVE_RETRIEVAL
 from src.core.prompts.prompt_manager import prompt_manager
+from src.embeddings.factory import EmbeddingFactory
 
 llm_router = init_chat_model(LLMConfig.ROUTER_MODEL, model_provider="openai")
 llm_basic = init_chat_model(LLMConfig.BASIC_MODEL, model_provider="openai")
@@ -40,6 +46,80 @@ POSTPROCESS_PROMPT = """당신은 ZIPSA의 수석 집사냥입니다.
 """
 
 
+_fast_router = None
+_shadow_tasks = set()
+
+
+def _get_fast_router() -> Optional[FastRouter]:
+    """패스트 패스 라우터를 한 번만 로드합니다. 비활성/미생성/임베더 차원 불일치면 None (LLM 분류만 사용)."""
+    global _fast_router
+    if _fast_router is None:
+        _fast_router = False
+        if RouterConfig.FAST_PATH_ENABLED:
+            try:
+                router = FastRouter.load_shared(RouterConfig.FAST_PATH_PATH)
+                dimension = EmbeddingFactory.get_shared_embedder().dimension
+                if router.dimension != dimension:
+                    logging.warning(f"[FAST ROUTER] 라우터 차원({router.dimension})이 임베더({dimension})와 달라 비활성화합니다.")
+                else:
+                    _fast_router = router
+            except FileNotFoundError as e:
+                logging.warning(f"[FAST ROUTER] {e}")
+    return _fast_router or None
+
+
+async def _fast_route(messages) -> Optional[FastRouteDecision]:
+    """마지막 사용자 메시지 임베딩으로 경로를 판정합니다. 라우터가 없으면 None."""
+    router = _get_fast_router()
+    query = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), None)
+    if router is None or not isinstance(query, str) or not query.strip():
+        return None
+    # 공유 임베더의 질의 캐시를 거치므로, 이후 전문가 검색에서 같은 질의를 임베딩하면 재사용됩니다.
+    vector = await EmbeddingFactory.get_shared_embedder().embed_query(query)
+    return router.route(vector)
+
+
+async def _classify_with_llm(messages) -> RouterDecision:
+    system_prompt = prompt_manager.get_prompt("head_butler")
+    router = llm_router.with_structured_output(RouterDecision)
+    return await router.ainvoke(
+        [SystemMessage(content=system_prompt)] + list(messages),
+        config={"tags": ["router_classification"]}
+    )
+
+
+async def _shadow_check(messages, decision: FastRouteDecision):
+    """패스트 패스 결정을 LLM 분류와 비교해 불일치율을 집계합니다 (응답 경로 밖에서 실행)."""
+    try:
+        llm_decision = await _classify_with_llm(messages)
+        ROUTER_STATS.record_shadow(decision, llm_decision.category)
+    except Exception as e:
+        logging.warning(f"[FAST ROUTER] 섀도 분류 실패: {e}")
+
+
+async def _route(messages) -> str:
+    """패스트 패스가 확신하면 LLM 없이, 아니면 LLM 라우터로 경로를 결정합니다."""
+    decision, error = None, False
+    try:
+        decision = await _fast_route(messages)
+    except Exception as e:
+        error = True
+        logging.warning(f"[FAST ROUTER] 판정 실패, LLM 분류로 대체: {e}")
+
+    if decision is not None and decision.confident:
+        ROUTER_STATS.record(decision, error=error)
+        print(f"⚡ [HEAD BUTLER]: 패스트 패스 라우팅 → {decision.route} (score={decision.score:.3f}, margin={decision.margin:.3f})")
+        if RouterConfig.SHADOW_RATE > 0 and random.random() < RouterConfig.SHADOW_RATE:
+            task = asyncio.create_task(_shadow_check(list(messages), decision))
+            _shadow_tasks.add(task)
+            task.add_done_callback(_shadow_tasks.discard)
+        return decision.route
+
+    llm_decision = await _classify_with_llm(messages)
+    ROUTER_STATS.record(decision, llm_decision.category, error=error)
+    return llm_decision.category
+
+
 async def head_butler_node(state: AgentState) -> Command:
     """
     수석 집사: 그래프의 메인 라우터 겸 유일한 종료 지점.
@@ -70,23 +150,24 @@ async def head_butler_node(state: AgentState) -> Command:
             goto="__end__"
         )
 
-    # 첫 방문: 분류 및 라우팅
-    system_prompt = prompt_manager.get_prompt("head_butler")
-    router = llm_router.with_structured_output(RouterDecision)
-    decision = await router.ainvoke(
-        [SystemMessage(content=system_prompt)] + state["messages"],
-        config={"tags": ["router_classification"]}
-    )
+    # 첫 방문: 분류 및 라우팅 (확신하는 질의는 임베딩 패스트 패스, 나머지는 LLM)
+    # 추측 검색(opt-in)은 분류를 기다리지 않고 원문 질의로 먼저 시작하고, 경로가 정해지면 나머지를 취소
+    query = state["messages"][-1].content
+    if isinstance(query, str):
+        SPECULATIVE_RETRIEVAL.launch(query)
+    category = await _route(state["messages"])
+    if isinstance(query, str):
+        SPECULATIVE_RETRIEVAL.keep_route(query, category)
 
     # 이전 턴의 잔여 결과 초기화
     updates: dict = {
-        "router_decision": decision.category,
+        "router_decision": category,
         "recommendations": [],
         "rag_docs": []
     }
 
     # 일반 질문은 직접 처리 → AIMessage → END
-    if decision.category == "general":
+    if category == "general":
         profile = state.get("user_profile", {})
         profile_context = f"거주: {profile.get('housing', '미설정')}, 활동량: {profile.get('activity', '미설정')}"
 
@@ -102,4 +183,4 @@ async def head_butler_node(state: AgentState) -> Command:
         return Command(update=updates, goto="__end__")
 
     # 전문가로 라우팅
-    return Command(update=updates, goto=decision.category)
+    return Command(update=updates, goto=category)
@@ -9,7 +9,8 @@ from langgraph.types import Command
 from .state import AgentState
 from .tools.animal_protection import search_abandoned_animals
 from src.core.prompts.prompt_manager import prompt_manager
-from src.retrieval.hybrid_search import HybridRetriever
+from src.retrieval.registry import RetrieverRegistry
+from .speculation import SPECULATIVE_RETRIEVAL
 
 llm_router = init_chat_model(LLMConfig.ROUTER_MODEL, model_provider="openai")
 llm_basic = init_chat_model(LLMConfig.BASIC_MODEL, model_provider="openai")
@@ -54,15 +55,17 @@ async def liaison_node(state: AgentState) -> Command:
         config={"tags": ["router_classification"]}
     )
     if hasattr(ai_msg, "tool_calls") and ai_msg.tool_calls:
+        # 도구 경로에서는 가이드 검색을 하지 않으므로 추측 검색 취소
+        SPECULATIVE_RETRIEVAL.keep_only(query)
         return Command(
             update={"messages": [ai_msg]},
             goto="tools"
         )
 
-    # 2. 리에종 전문가 태그 기반 RAG 검색
-    retriever = HybridRetriever(version="v3", collection_name="care_guides")
-    raw_results = await retriever.search(
-        query, specialist="Liaison", limit=3
+    # 2. 리에종 전문가 태그 기반 RAG 검색 (추측 검색 결과가 있으면 재사용)
+    retriever = RetrieverRegistry.get_hybrid(version="v3", collection_name="care_guides")
+    raw_results = await SPECULATIVE_RETRIEVAL.search(
+        retriever, query, specialist="Liaison", limit=3
     )
 
     results = []
@@ -6,19 +6,73 @@ from langchain_core.messages import SystemMessage
 from langgraph.types import Command
 from .state import AgentState
 from src.core.prompts.prompt_manager import prompt_manager
-from src.retrieval.hybrid_search import HybridRetriever
-from src.core.models.user_profile import UserProfile
-from src.core.models.matchmaker import BreedSelection, SearchIntent
+from src.retrieval.registry import RetrieverRegistry
+from .speculation import SPECULATIVE_RETRIEVAL
+from src.retrieval.breed_catalog import BreedCatalog, BreedMatch, STAT_LABELS, OP_SYMBOLS
+from src.core.models.user_profile import UserProfile, text_preferences
+from src.core.models.matchmaker import SearchIntent, BreedConstraint
+from .tools.breed_filter import query_breed_docs, to_cards
 
 llm_router = init_chat_model(LLMConfig.ROUTER_MODEL, model_provider="openai", temperature=0)
 llm_basic = init_chat_model(LLMConfig.BASIC_MODEL, model_provider="openai", temperature=0)
 
+def _breed_source(r: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": r.get("name_ko", ""),
+        "subtitle": r.get("name_en", ""),
+        "source": "TheCatAPI, Wikipedia",
+        "url": r.get("source_url") or r.get("source_urls", [""])[0] if r.get("source_urls") else "",
+    }
+
+async def _filter_recommendation(intent: SearchIntent, query: str, profile: UserProfile, persona: str, context: str) -> Command:
+    """
+    수치 조건으로 표현된 질문을 품종 카탈로그 구조화 질의로 처리합니다 (하이브리드 검색·요약 LLM 호출 없음).
+    추천 모드에서는 프로필의 안전 필수 제약도 gte 조건으로 합칩니다.
+    """
+    constraints = list(intent.constraints)
+    if intent.category == "RECOMMEND":
+        constraints += [BreedConstraint(field=stat, op="gte", value=minimum) for stat, minimum in profile.get_hard_constraints().items()]
+    docs, total = await query_breed_docs(constraints, intent.sort_by, limit=3)
+
+    condition_text = ", ".join(f"{STAT_LABELS[c.field]} {OP_SYMBOLS[c.op]} {c.value:g}" for c in constraints)
+    fields = [c.field for c in constraints] + [s.field for s in intent.sort_by]
+    print(f"🧮 [MATCHMAKER] Structured filter: {condition_text} → {total}종 일치, Selected: {[d.get('name_ko') for d in docs]}")
+
+    if docs:
+        catalog = await BreedCatalog.load_shared()
+        rag_context = f"[조건] {condition_text} (조건을 만족하는 품종 {total}종 중 상위 {len(docs)}종)\n" + "\n".join(
+            f"- {d.get('name_ko', '')} ({d.get('name_en', '')}): {catalog.describe(d, fields)}. {d.get('summary', '')}"
+            for d in docs
+        )
+    else:
+        # Head Butler가 조건을 완화해 보자고 안내하도록 전달
+        rag_context = f"[조건] {condition_text}\n모든 조건을 만족하는 품종을 찾지 못했습니다."
+
+    rag_docs = [_breed_source(d) for d in docs]
+    specialist_result = {
+        "source": "matchmaker",
+        "type": "breed_recommendation",
+        "specialist_name": "매치메이커 비서",
+        "persona": persona + f"\n\n**[{intent.category}]** 모드에서 품종 특성 조건으로 걸러냈습니다.\n\n[적용 조건]\n{condition_text}",
+        "user_context": context,
+        "rag_context": rag_context,
+        "rag_docs": rag_docs,
+    }
+    return Command(
+        update={
+            "specialist_result": specialist_result,
+            "recommendations": to_cards(docs),
+            "rag_docs": rag_docs,
+        },
+        goto="head_butler"
+    )
+
 async def matchmaker_node(state: AgentState) -> Command:
     """
     매치메이커: 고양이 품종 추천 전문가.
     1. 검색 의도 분류 (LOOKUP vs RECOMMEND)
-    2. 동적 쿼리 생성 및 검색
-    3. 에이전틱 선별 (Top 3)
+    2. 동적 쿼리 생성 및 검색 (수치 조건 질문은 구조화 필터로, 품종명 조회는 이름 색인으로 바로 응답)
+    3. 결정적 선별 (Top 3): 품종 카탈로그의 하드 제약 마스크 + 유연 선호 가중치 랭킹 (LLM은 설명 작성에만 사용)
     """
     query = state["messages"][-1].content
     
@@ -38,7 +92,11 @@ async def matchmaker_node(state: AgentState) -> Command:
         SystemMessage(content=(
             "당신은 고양이 전문가입니다. 사용자의 질문을 분석하여 검색 의도를 분류하세요.\n"
             "- LOOKUP: 특정 품종에 대한 정보나 특징을 묻는 경우 (프로필 무시)\n"
-            "- RECOMMEND: 추천을 요청하는 경우 (사용자 환경 프로필 반영 필요)"
+            "- RECOMMEND: 추천을 요청하는 경우 (사용자 환경 프로필 반영 필요)\n"
+            "질문이 품종 특성의 수치 조건(털 빠짐, 활동량, 아이/강아지 친화, 체중, 수명 등)으로 표현되면 constraints와 sort_by를 채우세요.\n"
+            "- stats는 1~5 척도 (indoor/lap/hypoallergenic은 0/1), weight_metric은 kg, life_span은 년\n"
+            "- 예: '털 덜 빠지고 아이랑 잘 지내는 품종' → shedding_level lte 2, child_friendly gte 4\n"
+            "- 예: '5kg 넘는 고양이 중 가장 똑똑한' → weight_metric gt 5, sort_by intelligence 내림차순"
         )),
         SystemMessage(content=query)
     ], config={"tags": ["router_classification"]})
@@ -55,48 +113,74 @@ async def matchmaker_node(state: AgentState) -> Command:
         
     print(f"🕵️ [MATCHMAKER] Intent: {intent.category}, Query: {search_query}")
 
-    # 3. 10건 후보 검색
-    retriever = HybridRetriever(version="v3", collection_name="care_guides")
-    raw_results = await retriever.search(
-        search_query, 
-        specialist="Matchmaker", # 필터링용 메타데이터 태그
-        filters={"categories": "Breeds"}, 
-        limit=10
-    )
-
-    if not raw_results:
-        return Command(update={"specialist_result": {"source": "matchmaker", "rag_docs": []}}, goto="head_butler")
-
-    # 4. 에이전틱 랭킹: LLM이 10건 중 최적 3건 선별
-    selection_prompt = f"""당신은 고양이 전문 매치메이커입니다. 
-아래의 [사용자 환경]과 [질문]을 바탕으로, 10개의 [후보 리스트] 중에서 가장 적합한 3마리를 선정하세요.
-
-[사용자 환경]
-{context if intent.category == "RECOMMEND" else "(단순 조회이므로 환경 무시)"}
-
-[질문]
-{query}
-
-[선정 원칙]
-1. 단순 조회(LOOKUP)일 경우 질문한 품종을 최우선으로 찾으세요. **만약 후보 리스트에 질문한 품종이 명확히 없다면, 억지로 비슷한 것을 선택하지 말고 빈 리스트([])를 반환하세요.**
-2. 추천(RECOMMEND)일 경우 알레르기/거주환경을 엄격히 고려하세요.
-
-[후보 리스트]
-"""
-    for i, r in enumerate(raw_results):
-        selection_prompt += f"{i}. {r.get('name_ko')} ({r.get('name_en')}): {r.get('summary')}\n"
-        selection_prompt += f"   - 특징: {', '.join(r.get('personality_traits', []))}\n"
-        selection_prompt += f"   - 통계: {r.get('stats', {})}\n\n"
+    # 재작성한 질의/필터로 검색하거나 검색을 생략하므로 원문 질의의 추측 검색은 사용하지 않음
+    SPECULATIVE_RETRIEVAL.keep_only(query)
+
+    # 2-1. 구조화 필터: 수치 조건 질문은 카탈로그 열 저장소 질의로 응답 (검색·요약 LLM 생략)
+    if intent.constraints:
+        return await _filter_recommendation(intent, query, profile, persona, context)
+
+    catalog = await BreedCatalog.load_shared()
+    if intent.category == "LOOKUP":
+        # 3. 단순 조회: 이름 색인(트라이 + n-gram)으로 질문한 품종을 바로 해석 (검색 생략, 없으면 모르는 품종으로 안내)
+        hits = catalog.names.find(f"{query} {intent.keywords}", limit=3)
+        matches = [
+            BreedMatch(hit.doc, hit.score, ["질문한 품종" if hit.exact else f"질문한 품종 ('{hit.alias}'와 비슷한 이름)"])
+            for hit in hits
+        ]
+        raw_results = [hit.doc for hit in hits]
+    else:
+        # 3. 10건 후보 검색
+        # 추천 모드에서는 안전 필수 제약(알레르기/아이/강아지)을 filter_* 범위 필터로 검색 단계에 적용
+        search_filters = {"categories": "Breeds"}
+        hard_filters = profile.get_index_filters()
+        search_filters.update(hard_filters)
+        if hard_filters:
+            print(f"🛡️ [MATCHMAKER] Hard constraints: {hard_filters}")
+
+        retriever = RetrieverRegistry.get_hybrid(version="v3", collection_name="care_guides")
+        raw_results = await retriever.search(
+            search_query, 
+            specialist="Matchmaker", # 필터링용 메타데이터 태그
+            filters=search_filters, 
+            limit=10
+        )
 
-    selector = llm_router.with_structured_output(BreedSelection)
-    selection = await selector.ainvoke(
-        [SystemMessage(content=selection_prompt)],
-        config={"tags": ["router_classification"]}
+        # 4. 결정적 선별: 메모리 품종 카탈로그에서 하드 제약 마스크 + 유연 선호 가중치로 랭킹 (LLM 선별 호출 없음)
+        constraints = profile.get_hard_constraints()
+        if not catalog.constraint_mask(constraints).any():
+            specialist_result = {"source": "matchmaker", "rag_docs": []}
+            if hard_filters:
+                # 카탈로그 전체에서도 제약을 만족하는 품종이 없을 때만 집사가 안내하도록 전달
+                specialist_result.update({
+                    "type": "breed_recommendation",
+                    "specialist_name": "매치메이커 비서",
+                    "persona": persona,
+                    "user_context": context,
+                    "rag_context": "사용자의 필수 조건(알레르기/아이/강아지 동거)을 모두 만족하는 품종을 찾지 못했습니다.",
+                })
+            return Command(update={"specialist_result": specialist_result}, goto="head_butler")
+
+        # 검색 결과가 비어도(마감 시간 초과, 검색 오류, 로컬 백엔드 무결과) 아래에서 카탈로그 랭킹으로 보충
+        if not raw_results:
+            print("🕵️ [MATCHMAKER] Search returned nothing, ranking from catalog")
+        retrieved_uids = [r.get("uid") for r in raw_results]
+        preferences = profile.get_soft_preferences()
+        for stat, weight in text_preferences(f"{query} {intent.keywords}").items():
+            preferences[stat] = preferences.get(stat, 0.0) + weight
+        # 검색 후보 안에서 먼저 고르고, 부족하면 제약을 만족하는 전체 품종에서 보충
+        matches = catalog.rank(constraints, preferences, relevance_uids=retrieved_uids, candidate_uids=retrieved_uids)
+        if len(matches) < 3:
+            picked = {m.doc.get("uid") for m in matches}
+            matches += [m for m in catalog.rank(constraints, preferences, limit=len(catalog))
+                        if m.doc.get("uid") not in picked][:3 - len(matches)]
+
+    # 5. 상위 3건
+    top_results = [dict(m.doc) for m in matches]
+    selection_reasoning = "\n".join(
+        f"- {m.doc.get('name_ko', '')}: {', '.join(m.reasons) if m.reasons else '질문과의 관련도'}" for m in matches
     )
-    
-    # 5. 상위 3건 필터링
-    final_indices = selection.selected_indices[:3]
-    top_results = [raw_results[i] for i in final_indices if i < len(raw_results)]
+    print(f"🕵️ [MATCHMAKER] Selected: {[m.doc.get('name_ko') for m in matches]}")
 
     # 품종을 못 찾은 경우 (Empty Selection)
     if not top_results and intent.category == "LOOKUP":
@@ -130,7 +214,9 @@ async def matchmaker_node(state: AgentState) -> Command:
                 "아래 추천 품종 정보에서 사용자에게 설명할 핵심 특징만 간결하게 추출하세요.\n"
                 "- 품종별 2~3줄, 성격/생활환경 적합성/주의사항 위주\n"
                 "- 총 400자 이내\n\n"
+                "- [선별 근거]의 수치를 자연스러운 문장으로 풀어 각 품종을 고른 이유를 설명\n\n"
                 f"[사용자 질문]\n{query}\n\n"
+                f"[선별 근거]\n{selection_reasoning}\n\n"
                 f"[추천 품종 정보]\n{docs_block}"
             ))
         ], config={"tags": ["router_classification"]})
@@ -145,17 +231,9 @@ async def matchmaker_node(state: AgentState) -> Command:
             clean_r["tags"] = [f"#{t}" for t in traits[:4]] if traits else []
         results.append(clean_r)
 
-    rag_docs = [
-        {
-            "title": r.get("name_ko", ""),
-            "subtitle": r.get("name_en", ""),
-            "source": "TheCatAPI, Wikipedia",
-            "url": r.get("source_url") or r.get("source_urls", [""])[0] if r.get("source_urls") else "",
-        }
-        for r in raw_results
-    ]
-
-    reasoning_text = f"**[{intent.category}]** 모드로 검색했습니다.\n\n[선별 이유]\n{selection.reasoning}"
+    rag_docs = [_breed_source(r) for r in raw_results]
+
+    reasoning_text = f"**[{intent.category}]** 모드로 검색했습니다.\n\n[선별 이유]\n{selection_reasoning}"
 
     specialist_result = {
         "source": "matchmaker",
@@ -0,0 +1,160 @@
+"""
+추측 검색: 라우터 LLM이 분류하는 동안 유력한 전문가 태그로 하이브리드 검색을 미리 시작
+"""
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from src.core.config import RetrievalConfig
+from src.retrieval.registry import RetrieverRegistry
+
+# head_butler 라우팅 경로별로 전문가 노드가 실제 사용하는 검색 태그
+ROUTE_TAGS = {
+    "matchmaker": ("Matchmaker",),
+    "liaison": ("Liaison",),
+    "care": ("Physician", "Peacekeeper"),
+    "general": (),
+}
+
+
+@dataclass
+class _Speculation:
+    task: asyncio.Task
+    started: float
+    finished: Optional[float] = None
+
+
+class SpeculativeRetrieval:
+    """
+    그래프 진입 시점(head_butler 첫 방문)에 원문 질의로 전문가 태그별 하이브리드 검색을 백그라운드로 실행하고,
+    라우팅이 확정되면 선택된 전문가가 완료된(또는 진행 중인) 결과를 가져가며 나머지는 취소합니다.
+    - 예산: 프로세스 전체 동시 추측 검색 수(max_in_flight)를 넘으면 새 추측을 건너뜁니다.
+    - 키: (질의, 태그, limit). 전문가가 같은 질의·태그·limit으로 검색할 때만 재사용되며, 그 외에는 평소처럼 검색합니다.
+    - 지표: saved_ms(전문가가 기다리지 않아도 된 검색 시간), wasted_ms(취소/미사용 추측이 소비한 검색 시간).
+    """
+    def __init__(self, enabled: bool = False, tags: Iterable[str] = (), limit: int = 3, max_in_flight: int = 8,
+                 ttl: float = 60.0, version: str = "v3", collection_name: str = "care_guides"):
+        self.enabled = enabled
+        self.tags = tuple(tags)
+        self.limit = limit
+        self.max_in_flight = max_in_flight
+        self.ttl = ttl
+        self.version = version
+        self.collection_name = collection_name
+        self._entries: Dict[Tuple[str, str, int], _Speculation] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            "launched": 0, "budget_skipped": 0, "consumed": 0, "misses": 0,
+            "cancelled": 0, "unused_completed": 0, "expired": 0, "errors": 0,
+            "saved_ms": 0.0, "wasted_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------ 시작/정리
+
+    def launch(self, query: str) -> int:
+        """원문 질의로 설정된 태그들의 추측 검색을 시작하고, 시작한 검색 수를 반환합니다."""
+        if not self.enabled or not query or not query.strip():
+            return 0
+        self._expire()
+        retriever = RetrieverRegistry.get_hybrid(version=self.version, collection_name=self.collection_name)
+        launched = []
+        for tag in self.tags:
+            key = (query, tag, self.limit)
+            with self._lock:
+                if key in self._entries:
+                    continue
+                if self._in_flight >= self.max_in_flight:
+                    self.stats["budget_skipped"] += 1
+                    continue
+                self._in_flight += 1
+                self.stats["launched"] += 1
+            entry = _Speculation(asyncio.create_task(retriever.search(query, specialist=tag, limit=self.limit)), time.perf_counter())
+            entry.task.add_done_callback(lambda task, entry=entry: self._on_done(entry, task))
+            self._entries[key] = entry
+            launched.append(tag)
+        if launched:
+            print(f"🔮 [SPECULATION]: '{query[:30]}' 추측 검색 {len(launched)}건 시작 ({', '.join(launched)})")
+        return len(launched)
+
+    def _on_done(self, entry: _Speculation, task: asyncio.Task):
+        entry.finished = time.perf_counter()
+        if not task.cancelled() and task.exception() is not None:
+            # 미사용 추측의 실패가 "exception was never retrieved" 경고로 남지 않도록 여기서 확인
+            logging.info(f"[SPECULATION] 추측 검색 실패: {task.exception()}")
+        with self._lock:
+            self._in_flight -= 1
+
+    def _drop(self, key: Tuple[str, str, int], reason: str):
+        """추측을 폐기하고 그동안 소비한 검색 시간을 낭비로 집계합니다."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.task.done():
+            self.stats[reason if reason == "expired" else "unused_completed"] += 1
+        else:
+            entry.task.cancel()
+            self.stats[reason] += 1
+        self.stats["wasted_ms"] += ((entry.finished or time.perf_counter()) - entry.started) * 1000
+
+    def _expire(self):
+        now = time.perf_counter()
+        for key in [key for key, entry in self._entries.items() if now - entry.started > self.ttl]:
+            self._drop(key, "expired")
+
+    def keep_only(self, query: str, tags: Iterable[str] = ()):
+        """질의의 추측 중 tags 외의 것을 취소합니다 (라우팅/세부 분류가 확정된 시점에 호출)."""
+        tags = set(tags)
+        for key in [key for key in self._entries if key[0] == query and key[1] not in tags]:
+            self._drop(key, "cancelled")
+
+    def keep_route(self, query: str, route: str):
+        self.keep_only(query, ROUTE_TAGS.get(route, ()))
+
+    # ------------------------------------------------------------------ 소비
+
+    async def search(self, retriever, query: str, specialist: str = None, limit: int = 3, **kwargs) -> List[Dict[str, Any]]:
+        """
+        같은 (질의, 태그, limit)의 추측이 있으면 그 결과를 사용하고, 없거나 실패했으면 retriever.search로 검색합니다.
+        filters 등 추가 인자가 있으면 추측과 조건이 달라지므로 항상 직접 검색합니다.
+        """
+        entry = None if kwargs else self._entries.pop((query, specialist, limit), None)
+        if entry is None:
+            if self.enabled and not kwargs:
+                self.stats["misses"] += 1
+            return await retriever.search(query, specialist=specialist, limit=limit, **kwargs)
+
+        claimed = time.perf_counter()
+        try:
+            results = await entry.task
+        except Exception as e:
+            self.stats["errors"] += 1
+            logging.warning(f"[SPECULATION] 추측 검색 실패, 직접 검색합니다: {e}")
+            return await retriever.search(query, specialist=specialist, limit=limit)
+
+        # 전문가가 검색을 호출한 시점까지 이미 진행된 검색 시간만큼 지연이 줄어듦
+        self.stats["consumed"] += 1
+        self.stats["saved_ms"] += (min(entry.finished or claimed, claimed) - entry.started) * 1000
+        print(f"🔮 [SPECULATION]: {specialist} 추측 검색 결과 재사용 ({len(results)}건)")
+        return results
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["in_flight"] = self._in_flight
+        stats["saved_ms"] = round(stats["saved_ms"], 1)
+        stats["wasted_ms"] = round(stats["wasted_ms"], 1)
+        wasted = stats["cancelled"] + stats["unused_completed"] + stats["expired"]
+        stats["hit_rate"] = round(stats["consumed"] / stats["launched"], 4) if stats["launched"] else 0.0
+        stats["waste_rate"] = round(wasted / stats["launched"], 4) if stats["launched"] else 0.0
+        return stats
+
+
+SPECULATIVE_RETRIEVAL = SpeculativeRetrieval(
+    enabled=RetrievalConfig.SPECULATIVE_ENABLED,
+    tags=RetrievalConfig.SPECULATIVE_TAGS,
+    limit=RetrievalConfig.SPECULATIVE_LIMIT,
+    max_in_flight=RetrievalConfig.SPECULATIVE_MAX_IN_FLIGHT,
+)
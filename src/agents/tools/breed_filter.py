@@ -0,0 +1,64 @@
+"""
+품종 구조화 필터 Tool
+메모리 품종 카탈로그(BreedCatalog)의 열 저장소에 수치 조건/정렬 질의를 실행하고 카드 DTO를 반환합니다.
+"""
+import logging
+from typing import List, Dict, Any, Tuple
+
+from langchain_core.tools import tool
+
+from src.core.models.cat_card import CatCardRecommendation
+from src.core.models.matchmaker import BreedConstraint, BreedSort
+from src.retrieval.breed_catalog import BreedCatalog
+
+logger = logging.getLogger(__name__)
+
+
+def _as_dict(item) -> Dict[str, Any]:
+    return item.model_dump() if hasattr(item, "model_dump") else dict(item)
+
+
+async def query_breed_docs(constraints: List[Any], sort_by: List[Any] = None,
+                           limit: int = 3) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    BreedConstraint/BreedSort(또는 같은 형태의 dict)로 카탈로그를 질의합니다.
+    반환값: (상위 limit건 품종 문서, 조건을 만족한 전체 품종 수)
+    """
+    catalog = await BreedCatalog.load_shared()
+    return catalog.query(
+        [_as_dict(c) for c in constraints or []],
+        sort=[_as_dict(s) for s in sort_by] if sort_by else None,
+        limit=limit,
+    )
+
+
+def to_cards(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """품종 문서를 UI 카드 DTO(dict)로 변환합니다."""
+    return [CatCardRecommendation.from_breed_doc(doc).model_dump() for doc in docs]
+
+
+@tool
+async def filter_breeds(
+    constraints: List[BreedConstraint],
+    sort_by: List[BreedSort] = None,
+    limit: int = 3,
+) -> dict:
+    """Filter cat breeds by numeric trait conditions (e.g. shedding_level <= 2 and child_friendly >= 4) and sort them.
+    품종 특성 수치 조건으로 고양이 품종을 걸러내고 정렬합니다. 검색 없이 품종 카탈로그에서 바로 계산합니다.
+
+    Args:
+        constraints: 조건 목록. field는 stats 필드(1~5 척도, indoor/lap/hypoallergenic은 0/1) 또는
+            weight_metric(kg)/life_span(년, 범위 중앙값 기준), op는 eq/ne/gte/gt/lte/lt.
+            예: [{"field": "shedding_level", "op": "lte", "value": 2}, {"field": "child_friendly", "op": "gte", "value": 4}]
+        sort_by: 정렬 키 목록 (예: [{"field": "intelligence", "descending": true}]). 생략하면 조건 방향으로 정렬.
+        limit: 반환할 최대 품종 수. 기본값 3.
+
+    Returns:
+        {"total": 조건을 만족한 품종 수, "cards": 상위 limit건의 품종 카드}
+    """
+    try:
+        docs, total = await query_breed_docs(constraints, sort_by, limit)
+    except ValueError as e:
+        logger.warning(f"품종 필터 조건 오류: {e}")
+        return {"error": str(e), "total": 0, "cards": []}
+    return {"total": total, "cards": to_cards(docs)}
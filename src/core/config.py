@@ -1,6 +1,9 @@
 import os
 from dataclasses import dataclass
 from typing import List, Dict, Any, Literal
+from dotenv import load_dotenv
+
+load_dotenv()
 
 @dataclass
 class VersionPolicy:
@@ -88,3 +91,77 @@ class LLMConfig:
     # 요약/추출/일반대화용 (단순 작업)
     BASIC_MODEL = "gpt-4o-mini"
 
+class RouterConfig:
+    # [패스트 패스] 질의 임베딩이 경로별 centroid/예시와 충분히 가까우면 head_butler의 LLM 분류를 생략
+    # (라우터 디렉토리가 없거나 임베더 차원이 다르면 자동으로 LLM 분류만 사용)
+    FAST_PATH_ENABLED = os.getenv("ROUTER_FAST_PATH", "true").lower() == "true"
+    FAST_PATH_PATH = os.getenv("ROUTER_FAST_PATH_DIR", "data/v3/fast_router")
+    # 패스트 패스로 처리한 턴 중 백그라운드에서 LLM으로도 분류해 불일치율을 측정할 비율 (0이면 비활성)
+    SHADOW_RATE = float(os.getenv("ROUTER_SHADOW_RATE", "0.05"))
+
+class RetrievalConfig:
+    # 하이브리드 검색 레그별 마감 시간 (초). 한쪽 인덱스가 느려도 전체 응답이 멈추지 않도록 제한
+    VECTOR_TIMEOUT = float(os.getenv("RETRIEVAL_VECTOR_TIMEOUT", "3.0"))
+    KEYWORD_TIMEOUT = float(os.getenv("RETRIEVAL_KEYWORD_TIMEOUT", "2.0"))
+
+    # 키워드 검색 백엔드: "atlas" ($search keyword_index) 또는 "local" (인프로세스 BM25 인덱스)
+    KEYWORD_BACKEND = os.getenv("RETRIEVAL_KEYWORD_BACKEND", "atlas").lower()
+    BM25_INDEX_PATH = os.getenv("BM25_INDEX_PATH", "data/v3/bm25_index")
+
+    # 벡터 검색 백엔드: "atlas" ($vectorSearch) 또는 "local" (인프로세스 벡터 인덱스, 모드는 인덱스 생성 시 결정)
+    VECTOR_BACKEND = os.getenv("RETRIEVAL_VECTOR_BACKEND", "atlas").lower()
+    VECTOR_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", "data/v3/vector_index")
+    # Atlas vector_index에 deleted 필터 경로를 추가한 뒤(scripts/update_vector_index.py) true로 켜면 툼스톤을 $vectorSearch pre-filter로 제외.
+    # false(기본)면 정의되지 않은 필터 경로로 쿼리가 실패하지 않도록 $vectorSearch 뒤 $match로 제외
+    VECTOR_TOMBSTONE_PREFILTER = os.getenv("VECTOR_TOMBSTONE_PREFILTER", "false").lower() == "true"
+
+    @classmethod
+    def local_index_path(cls, kind: str, version: str = "v3", collection_name: str = None) -> str:
+        """
+        인프로세스 인덱스 디렉토리 (kind: "bm25" / "vector").
+        V3 기본 컬렉션은 BM25_INDEX_PATH / VECTOR_INDEX_PATH, 그 외 (버전, 컬렉션)은 data/<version>/<collection>_<kind>_index
+        """
+        policy = ZipsaConfig.get_policy(version)
+        collection_name = collection_name or policy.collection_name
+        if version == "v3" and collection_name == policy.collection_name:
+            return cls.BM25_INDEX_PATH if kind == "bm25" else cls.VECTOR_INDEX_PATH
+        return os.path.join("data", version, f"{collection_name}_{kind}_index")
+
+    # [추측 검색] head_butler 라우팅과 동시에 원문 질의로 전문가 태그별 하이브리드 검색을 미리 시작 (opt-in)
+    # Matchmaker는 의도 분류 후 재작성한 질의/필터로 검색하므로 기본 태그에서 제외
+    SPECULATIVE_ENABLED = os.getenv("SPECULATIVE_RETRIEVAL", "false").lower() == "true"
+    SPECULATIVE_TAGS = [t.strip() for t in os.getenv("SPECULATIVE_TAGS", "Liaison,Physician,Peacekeeper").split(",") if t.strip()]
+    SPECULATIVE_LIMIT = int(os.getenv("SPECULATIVE_LIMIT", "3"))
+    # 프로세스 전체 동시 추측 검색 수 상한 (초과 시 추측 생략)
+    SPECULATIVE_MAX_IN_FLIGHT = int(os.getenv("SPECULATIVE_MAX_IN_FLIGHT", "8"))
+
+class PipelineConfig:
+    # LLM 배치 분류 스케줄러 (V1/V2/V3 전처리 공통)
+    CLASSIFY_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_SIZE", "5"))
+    CLASSIFY_MAX_IN_FLIGHT = int(os.getenv("CLASSIFY_MAX_IN_FLIGHT", "4"))
+    CLASSIFY_RPM = int(os.getenv("CLASSIFY_RPM", "500"))
+    CLASSIFY_TPM = int(os.getenv("CLASSIFY_TPM", "200000"))
+    CLASSIFY_MAX_RETRIES = int(os.getenv("CLASSIFY_MAX_RETRIES", "4"))
+    # 분류 결과 디스크 캐시 (문서 텍스트 + 모델/프롬프트/분류 체계 해시 키). 빈 값이면 비활성
+    CLASSIFY_CACHE_PATH = os.getenv("CLASSIFY_CACHE_PATH", "data/cache/classifications.sqlite")
+
+    # 근접 중복 제거 (Kiwi 토큰 shingle MinHash + LSH, 분류/임베딩 전 단계)
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+    DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+    DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))
+
+    # MongoDB 적재 (unordered bulk_write 청크 크기 / 동시 진행 배치 수)
+    LOAD_CHUNK_SIZE = int(os.getenv("LOAD_CHUNK_SIZE", "500"))
+    LOAD_MAX_IN_FLIGHT = int(os.getenv("LOAD_MAX_IN_FLIGHT", "4"))
+
+    # 스트리밍 파이프라인 (전처리 → 임베딩 → 적재 큐 연결)
+    STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "200"))
+    STREAM_EMBED_BATCH_SIZE = int(os.getenv("STREAM_EMBED_BATCH_SIZE", "100"))
+    STREAM_EMBED_CONCURRENCY = int(os.getenv("STREAM_EMBED_CONCURRENCY", "2"))
+
+    # 배치 단위 체크포인트 저장 위치 (중단 후 재실행 시 완료된 배치는 건너뜀)
+    CHECKPOINT_ROOT = os.getenv("PIPELINE_CHECKPOINT_ROOT", "data/checkpoints")
+
+    # 증분 적재 매니페스트 (원본별 uid/콘텐츠 해시/처리 버전/툼스톤 기록)
+    INGEST_MANIFEST_PATH = os.getenv("PIPELINE_INGEST_MANIFEST_PATH", "data/v3/ingest_manifest.json")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 
 class CatCardStats(BaseModel):
     """품종 통계의 전체 스펙트럼 (1-5 척도)."""
@@ -31,3 +31,16 @@ class CatCardRecommendation(BaseModel):
     summary: str = Field(..., description="한 줄 캐릭터 요약 (한글)")
     tags: List[str] = Field(..., description="3-4개의 해시태그 (예: ['#활동적', '#영리함'])")
     stats: CatCardStats = Field(..., description="품종에 대한 전체 통계 데이터")
+
+    @classmethod
+    def from_breed_doc(cls, doc: Dict[str, Any]) -> "CatCardRecommendation":
+        """V3 품종 문서(StoredBreedV3 형식)로부터 카드 DTO를 생성합니다."""
+        traits = doc.get("personality_traits") or []
+        return cls(
+            name_ko=doc.get("name_ko", ""),
+            name_en=doc.get("name_en", ""),
+            image_url=doc.get("image_url") or "",
+            summary=doc.get("summary", ""),
+            tags=doc.get("tags") or [f"#{t}" for t in traits[:4]],
+            stats=CatCardStats(**{k: v for k, v in (doc.get("stats") or {}).items() if v is not None}),
+        )
@@ -1,10 +1,24 @@
 from typing import List, Literal
 from pydantic import BaseModel, Field
 
-class BreedSelection(BaseModel):
-    """에이전틱 선별용 구조화된 출력."""
-    selected_indices: List[int] = Field(..., max_items=3, description="후보 목록에서 선택한 품종 인덱스")
-    reasoning: str = Field(..., description="해당 3종을 선택한 이유")
+# 구조화 필터로 질의할 수 있는 품종 필드 (stats 15개 + 범위 문자열 2개)
+BreedField = Literal[
+    "shedding_level", "energy_level", "intelligence", "affection_level", "child_friendly",
+    "indoor", "lap", "hypoallergenic", "adaptability", "dog_friendly", "grooming",
+    "health_issues", "social_needs", "stranger_friendly", "vocalisation",
+    "weight_metric", "life_span",
+]
+
+class BreedConstraint(BaseModel):
+    """품종 stats에 대한 수치 조건 1건."""
+    field: BreedField = Field(..., description="품종 필드 (1~5 척도 stats, indoor/lap/hypoallergenic은 0/1, weight_metric은 kg, life_span은 년)")
+    op: Literal["eq", "ne", "gte", "gt", "lte", "lt"] = Field(..., description="비교 연산자")
+    value: float = Field(..., description="비교 값 (예: '털 덜 빠지는' → shedding_level lte 2)")
+
+class BreedSort(BaseModel):
+    """품종 정렬 키."""
+    field: BreedField
+    descending: bool = Field(default=True, description="True면 값이 큰 순")
 
 class SearchIntent(BaseModel):
     """사용자 질문의 검색 의도 분류"""
@@ -16,3 +30,11 @@ class SearchIntent(BaseModel):
         )
     )
     keywords: str = Field(..., description="검색 엔진에 전달할 핵심 키워드 (예: '메인쿤', '대형묘', '저자극성 고양이')")
+    constraints: List[BreedConstraint] = Field(
+        default_factory=list,
+        description=(
+            "질문이 품종 특성의 수치 조건으로 표현될 때만 추출 (예: '털 덜 빠지고 아이랑 잘 지내는' → "
+            "shedding_level lte 2, child_friendly gte 4). 특정 품종 조회나 막연한 추천이면 빈 리스트"
+        )
+    )
+    sort_by: List[BreedSort] = Field(default_factory=list, description="'가장 ~한' 같은 정렬 요청 (예: '가장 똑똑한' → intelligence 내림차순)")
@@ -1,6 +1,59 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
+# 선호 성향/질의 키워드 → 품종 stats 선호 가중치 (양수: 높을수록 선호, 음수: 낮을수록 선호)
+TRAIT_PREFERENCES = {
+    "애교": {"affection_level": 1.0, "lap": 0.5},
+    "애정": {"affection_level": 1.0},
+    "무릎": {"lap": 1.0},
+    "조용": {"vocalisation": -1.0, "energy_level": -0.3},
+    "얌전": {"energy_level": -0.8},
+    "차분": {"energy_level": -0.8},
+    "활발": {"energy_level": 1.0},
+    "활동적": {"energy_level": 1.0},
+    "똑똑": {"intelligence": 1.0},
+    "지적": {"intelligence": 1.0},
+    "독립": {"social_needs": -1.0},
+    "사교": {"stranger_friendly": 1.0, "social_needs": 0.3},
+    "친화": {"stranger_friendly": 0.8},
+    "털 안": {"shedding_level": -1.0},
+    "털빠짐 적": {"shedding_level": -1.0},
+    "털 빠짐 적": {"shedding_level": -1.0},
+    "관리 쉬": {"grooming": -1.0},
+    "건강": {"health_issues": -1.0},
+    "수다": {"vocalisation": 1.0},
+}
+
+# 생활 패턴 → 품종 stats 선호 가중치
+ACTIVITY_PREFERENCES = {
+    "low": {"energy_level": -1.0, "lap": 0.5},
+    "medium": {"energy_level": 0.3},
+    "high": {"energy_level": 1.0, "intelligence": 0.5},
+}
+HOUSING_PREFERENCES = {
+    "studio": {"adaptability": 0.6, "vocalisation": -0.6, "energy_level": -0.4, "indoor": 0.3},
+    "apartment": {"adaptability": 0.4, "vocalisation": -0.4},
+    "house": {"energy_level": 0.2},
+}
+HOUSING_ALIASES = {"원룸": "studio", "아파트": "apartment", "주택": "house", "단독주택": "house"}
+EXPERIENCE_PREFERENCES = {
+    "beginner": {"grooming": -0.6, "health_issues": -0.6, "adaptability": 0.4},
+    "intermediate": {"grooming": -0.2, "health_issues": -0.2},
+    "expert": {},
+}
+# 집을 오래 비우는 근무 형태를 나타내는 표현
+LONG_ABSENCE_KEYWORDS = ("출근", "직장", "야근", "외출", "바쁨", "장시간")
+
+
+def text_preferences(text: str) -> Dict[str, float]:
+    """자유 텍스트(선호 성향, 질의 키워드)에서 TRAIT_PREFERENCES에 해당하는 stats 가중치를 합산합니다."""
+    weights: Dict[str, float] = {}
+    for keyword, prefs in TRAIT_PREFERENCES.items():
+        if keyword in (text or ""):
+            for stat, weight in prefs.items():
+                weights[stat] = weights.get(stat, 0.0) + weight
+    return weights
+
 class UserProfile(BaseModel):
     """
     타입 안전성 및 유효성 검사를 포함한 표준화된 사용자 프로필 스키마입니다.
@@ -60,6 +113,44 @@ class UserProfile(BaseModel):
             constraints["dog_friendly"] = 4
         
         return constraints
+
+    def get_soft_preferences(self) -> Dict[str, float]:
+        """
+        랭킹에만 사용하는 유연 선호 조건을 품종 stats 가중치로 변환합니다.
+        활동량/주거/경험/근무 형태/선호 성향을 합산하며, 하드 제약과 달리 위반해도 후보에서 제외되지 않습니다.
+
+        Returns:
+            stats 필드별 가중치 (예: {"energy_level": -1.0, "vocalisation": -0.4})
+        """
+        weights: Dict[str, float] = {}
+
+        def add(prefs: Dict[str, float]):
+            for stat, weight in prefs.items():
+                weights[stat] = weights.get(stat, 0.0) + weight
+
+        add(ACTIVITY_PREFERENCES.get(self.activity, {}))
+        add(HOUSING_PREFERENCES.get(HOUSING_ALIASES.get(self.housing, self.housing), {}))
+        add(EXPERIENCE_PREFERENCES.get(self.experience, {}))
+        if self.work_style and any(k in self.work_style for k in LONG_ABSENCE_KEYWORDS):
+            add({"social_needs": -0.6})
+        if self.allergy:
+            add({"shedding_level": -0.5})
+        add(text_preferences(" ".join(self.traits)))
+        return weights
+
+    def get_index_filters(self) -> Dict[str, Dict[str, int]]:
+        """
+        하드 제약 조건을 인덱싱된 filter_* 필드의 범위 필터로 변환합니다.
+        벡터/키워드 검색의 사전 필터로 사용되어, 제약을 위반하는 품종은 후보에 오르지 않습니다.
+
+        Returns:
+            검색 필터 딕셔너리 (예: {"filter_hypoallergenic": {"$gte": 1}, "filter_child_friendly": {"$gte": 4}})
+        """
+        from src.pipelines.v3.schemas import STAT_FILTER_FIELDS
+        return {
+            STAT_FILTER_FIELDS[stat]: {"$gte": minimum}
+            for stat, minimum in self.get_hard_constraints().items()
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "UserProfile":
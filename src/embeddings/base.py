@@ -1,10 +1,18 @@
 from abc import ABC, abstractmethod
 from typing import List
 import numpy as np
+from .profile import EmbeddingProfile
 
 class BaseEmbedder(ABC):
-    def __init__(self, dimension: int):
+    def __init__(self, dimension: int, precision: str = "float32"):
         self.dimension = dimension
+        # 저장 정밀도 (float32 / int8). 벡터 자체는 항상 float32로 반환하며, 산출물/인덱스가 이 값에 따라 양자화합니다.
+        self.precision = precision
+
+    @property
+    def profile(self) -> EmbeddingProfile:
+        """이 임베더가 생성하는 벡터의 차원/저장 정밀도 프로파일."""
+        return EmbeddingProfile(self.dimension, self.precision)
 
     @abstractmethod
     async def embed_query(self, text: str) -> List[float]:
@@ -16,6 +24,13 @@ class BaseEmbedder(ABC):
         """문서 문자열 리스트를 임베딩합니다."""
         pass
 
+    async def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """
+        문서 임베딩을 (N, dimension) float32 배열로 반환합니다.
+        파이프라인/인덱스용 경로로, 하위 클래스는 Python 리스트 변환 없이 직접 배열을 만들도록 재정의할 수 있습니다.
+        """
+        return self.validate_batch(await self.embed_documents(texts))
+
     def validate_and_format(self, vector: List[float]) -> List[float]:
         """
         벡터가 float 리스트인지, 예상 차원과 일치하는지 확인하고,
@@ -25,7 +40,7 @@ class BaseEmbedder(ABC):
             raise ValueError("임베딩 벡터가 비어있거나 null입니다.")
         
         if len(vector) != self.dimension:
-            raise ValueError(f"임베딩 차원이 일치하지 않습니다: 기대치 {self.dimension}, 실제치 {len(vector)}")
+            raise ValueError(f"임베딩 차원이 프로파일({self.profile.name})과 일치하지 않습니다: 기대치 {self.dimension}, 실제치 {len(vector)}")
         
         # MongoDB 호환성을 위해 명시적으로 float으로 캐스팅
         return [float(x) for x in vector]
@@ -37,3 +52,24 @@ class BaseEmbedder(ABC):
         if norm == 0:
             return vector
         return (arr / norm).tolist()
+
+    def validate_batch(self, vectors) -> np.ndarray:
+        """
+        validate_and_format의 배치 버전입니다. (N, dimension) float32 C-연속 배열을 반환하며
+        빈 입력, 차원 불일치, NaN/Inf가 있으면 ValueError를 발생시킵니다.
+        """
+        arr = np.ascontiguousarray(vectors, dtype=np.float32)
+        if arr.ndim != 2 or arr.shape[0] == 0:
+            raise ValueError(f"임베딩 배치가 비어있거나 2차원이 아닙니다: shape={arr.shape}")
+        if arr.shape[1] != self.dimension:
+            raise ValueError(f"임베딩 차원이 프로파일({self.profile.name})과 일치하지 않습니다: 기대치 {self.dimension}, 실제치 {arr.shape[1]}")
+        if not np.isfinite(arr).all():
+            raise ValueError("임베딩 배치에 NaN 또는 Inf 값이 포함되어 있습니다.")
+        return arr
+
+    def normalize_batch(self, vectors) -> np.ndarray:
+        """normalize의 배치 버전: 행 단위 L2 정규화 (노름이 0인 행은 그대로 유지)."""
+        arr = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(arr, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return arr / norms
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import List, Callable, Dict, Any
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    동시에 들어온 단건 인코딩 요청을 모아 한 번의 배치 추론으로 처리하는 워커입니다.
+    - 첫 요청이 들어오면 max_wait_ms 동안 더 모은 뒤, 최대 max_batch_size건씩 encode_fn(texts)을 실행합니다.
+    - 추론은 전용 스레드 풀(executor)에서 돌며, 동시에 진행하는 배치 수는 max_in_flight로 제한합니다.
+      추론이 도는 동안 다음 요청이 큐에 쌓이므로 부하가 높을수록 배치가 자연스럽게 커집니다.
+    - 큐/워커는 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만듭니다.
+    """
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray], executor: Executor,
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0, max_in_flight: int = 1):
+        self.encode_fn = encode_fn
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+        self._loop = None
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        self._tasks = set()
+        self.stats = {"requests": 0, "batches": 0, "max_batch": 0}
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop):
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, text: str) -> np.ndarray:
+        """텍스트 1건을 큐에 넣고 배치 추론 결과 벡터를 기다립니다."""
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _encode(self, batch: List[tuple], slots: asyncio.Semaphore):
+        try:
+            vectors = await asyncio.get_running_loop().run_in_executor(self.executor, self.encode_fn, [text for text, _ in batch])
+        except Exception as e:
+            logging.error(f"[EMBEDDING] 배치 추론 실패 ({len(batch)}건): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+        finally:
+            slots.release()
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.max_in_flight)
+        while True:
+            batch = [await self._queue.get()]
+            # 추론 슬롯을 기다리는 동안에도 요청이 계속 쌓이도록 슬롯을 먼저 확보
+            await slots.acquire()
+            if self.max_wait > 0 and self._queue.qsize() < self.max_batch_size - 1:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # 호출자가 이미 취소한 요청은 추론에서 제외
+            batch = [(text, future) for text, future in batch if not future.cancelled()]
+            if not batch:
+                slots.release()
+                continue
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            task = asyncio.get_running_loop().create_task(self._encode(batch, slots))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["avg_batch"] = round(stats["requests"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
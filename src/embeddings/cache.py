@@ -0,0 +1,229 @@
+import os
+import re
+import time
+import asyncio
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional, Dict
+import numpy as np
+from .base import BaseEmbedder
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query_text(text: str) -> str:
+    """캐시 키용 질의 정규화: 유니코드 NFC, 공백 압축, 소문자화."""
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def document_key(text: str, model_name: str, dimension: int) -> str:
+    """문서 임베딩 저장소 키: 정확한 입력 텍스트(정규화 없음) + 모델 + 차원의 해시."""
+    raw = f"{model_name}|{dimension}|document|{text}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    SQLite 기반 디스크 임베딩 저장소입니다. 벡터는 packed float32 BLOB으로 저장합니다.
+    max_bytes를 넘으면 마지막 접근 시각이 오래된 항목부터 제거합니다.
+    조회 시각(last_access)은 읽을 때마다 커밋하지 않고 모아 두었다가 access_flush_size건마다, 또는 쓰기/제거/종료 시 한 번에 반영합니다.
+    """
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, access_flush_size: int = 256):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.access_flush_size = access_flush_size
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, dim INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        # 제거 시 오래된 순 스캔용
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    def _touch(self, keys) -> None:
+        """조회 시각을 기록해 두고 일정 건수가 모이면 한 번에 커밋합니다 (호출자가 락 보유)."""
+        now = time.time()
+        for key in keys:
+            self._touched[key] = now
+        if len(self._touched) >= self.access_flush_size:
+            self._flush_access()
+
+    def _flush_access(self) -> None:
+        """모아 둔 조회 시각을 반영합니다 (호출자가 락 보유)."""
+        if not self._touched:
+            return
+        self._conn.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?",
+                               [(at, key) for key, at in self._touched.items()])
+        self._conn.commit()
+        self._touched.clear()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._touch((key,))
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """여러 키를 한 번에 조회합니다. 없는 키는 결과에서 빠집니다."""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+            if found:
+                self._touch(found)
+        return found
+
+    def put(self, key: str, vector) -> None:
+        self.put_many({key: vector})
+
+    def put_many(self, vectors: Dict[str, "np.ndarray"]) -> None:
+        now = time.time()
+        rows = []
+        for key, vector in vectors.items():
+            blob = np.asarray(vector, dtype=np.float32).tobytes()
+            rows.append((key, blob, len(blob) // 4, now))
+        with self._lock:
+            # 덮어쓰기 시 용량 이중 계산을 피하기 위해 기존 항목 크기를 먼저 차감
+            old_sizes: Dict[str, int] = {}
+            keys = [row[0] for row in rows]
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                old_sizes.update(self._conn.execute(
+                    f"SELECT key, LENGTH(vector) FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall())
+            for key, blob, _, _ in rows:
+                self._total_bytes += len(blob) - old_sizes.get(key, 0)
+                self._touched.pop(key, None)
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._flush_access()
+            self._conn.commit()
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """용량 상한의 90%까지 오래된 항목을 제거합니다 (호출자가 락 보유)."""
+        target = int(self.max_bytes * 0.9)
+        cursor = self._conn.execute("SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_access ASC")
+        victims = []
+        for key, size in cursor:
+            if self._total_bytes <= target:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+        self._conn.commit()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total_bytes
+
+    def close(self):
+        with self._lock:
+            self._flush_access()
+            self._conn.close()
+
+
+class CachedEmbedder(BaseEmbedder):
+    """
+    임의의 BaseEmbedder 앞에 두는 질의 임베딩 캐시입니다.
+    1차: 메모리 LRU, 2차: SQLite 디스크 저장소. 키는 (제공자, 모델, 정규화된 질의, 차원)의 해시입니다.
+    디스크 조회는 스레드에서 실행하고 저장은 백그라운드로 넘겨, 공유 이벤트 루프가 SQLite I/O에 막히지 않게 합니다.
+    """
+    def __init__(self, inner: BaseEmbedder, provider: str, store: Optional[EmbeddingStore] = None,
+                 max_memory_entries: int = 2048):
+        super().__init__(dimension=inner.dimension, precision=inner.precision)
+        self.inner = inner
+        self.provider = provider
+        self.model_name = getattr(inner, "model_name", inner.__class__.__name__)
+        self.store = store
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes: set = set()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def query_key(self, text: str) -> str:
+        raw = f"{self.provider}|{self.model_name}|{self.dimension}|query|{normalize_query_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    async def embed_query(self, text: str) -> List[float]:
+        key = self.query_key(text)
+
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector.tolist()
+
+        if self.store is not None:
+            vector = await asyncio.to_thread(self.store.get, key)
+            if vector is not None and len(vector) == self.dimension:
+                self.disk_hits += 1
+                self._remember(key, vector)
+                return vector.tolist()
+
+        self.misses += 1
+        result = await self.inner.embed_query(text)
+        vector = np.asarray(result, dtype=np.float32)
+        self._remember(key, vector)
+        if self.store is not None:
+            # 응답을 디스크 쓰기(커밋, 용량 초과 시 제거)와 분리. 메모리 LRU에 이미 있으므로 쓰기 전 재조회도 적중
+            task = asyncio.ensure_future(asyncio.to_thread(self.store.put, key, vector))
+            self._writes.add(task)
+            task.add_done_callback(self._on_write_done)
+        return result
+
+    def _on_write_done(self, task: "asyncio.Future"):
+        self._writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # 캐시 저장 실패는 응답에 영향을 주지 않음 (다음 미스 때 다시 저장)
+            logger.warning(f"질의 임베딩 캐시 저장 실패: {task.exception()}")
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.inner.embed_documents(texts)
+
+    async def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        return await self.inner.embed_documents_array(texts)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / total if total else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self.store.size_bytes if self.store is not None else 0,
+        }
@@ -1,21 +1,80 @@
 import os
+import threading
+from typing import Dict
 from .base import BaseEmbedder
+from .profile import EmbeddingProfile
 
 class EmbeddingFactory:
+    # 프로세스 전역 공유 임베더 (제공자별 1개). 로컬 모델 재로딩/클라이언트 재생성을 방지합니다.
+    _shared: Dict[str, BaseEmbedder] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def resolve_provider(provider: str = None) -> str:
+        """제공자 문자열을 정규화합니다. 지정되지 않은 경우 EMBEDDING_PROVIDER 환경 변수 또는 'local'을 사용합니다."""
+        if provider is None:
+            provider = os.getenv("EMBEDDING_PROVIDER", "local")
+        return provider.lower()
+
     @staticmethod
-    def get_embedder(provider: str = None) -> BaseEmbedder:
+    def get_embedder(provider: str = None, profile: EmbeddingProfile = None) -> BaseEmbedder:
         """
         제공자 문자열에 따라 임베더 인스턴스를 반환합니다.
         지정되지 않았거나 EMBEDDING_PROVIDER 환경 변수가 없는 경우 기본값으로 'local'을 사용합니다.
+        profile을 주면 그 차원/정밀도로 만듭니다 (기본: EMBEDDING_DIMENSIONS / EMBEDDING_PRECISION).
         """
-        if provider is None:
-            provider = os.getenv("EMBEDDING_PROVIDER", "local").lower()
+        provider = EmbeddingFactory.resolve_provider(provider)
             
         if provider == "openai":
             from .openai_embedder import OpenAIEmbedder
-            return OpenAIEmbedder()
+            return OpenAIEmbedder(profile=profile)
         elif provider == "local":
             from .local import LocalEmbedder
-            return LocalEmbedder()
+            embedder = LocalEmbedder()
+            if profile is not None:
+                # 로컬 모델은 차원 축소를 지원하지 않으므로 정밀도만 적용
+                if profile.dimension != embedder.dimension:
+                    raise ValueError(f"로컬 임베더는 {embedder.dimension}차원만 지원합니다: {profile.name}")
+                embedder.precision = profile.precision
+            return embedder
         else:
             raise ValueError(f"지원되지 않는 임베딩 제공자입니다: {provider}")
+
+    @classmethod
+    def get_shared_embedder(cls, provider: str = None, profile: EmbeddingProfile = None) -> BaseEmbedder:
+        """
+        제공자별(profile을 주면 제공자 × 프로파일별)로 프로세스에서 한 번만 생성되는 공유 임베더를 반환합니다.
+        EMBEDDING_CACHE가 활성화되어 있으면 질의 임베딩 캐시(메모리 LRU + SQLite)로 감쌉니다. (캐시 키에 차원 포함)
+        """
+        provider = cls.resolve_provider(provider)
+        key = provider if profile is None else f"{provider}:{profile.name}"
+        with cls._lock:
+            if key not in cls._shared:
+                embedder = cls.get_embedder(provider, profile)
+                if os.getenv("EMBEDDING_CACHE", "true").lower() in ("1", "true", "yes"):
+                    from .cache import CachedEmbedder, EmbeddingStore
+                    store = EmbeddingStore(
+                        os.getenv("EMBEDDING_CACHE_PATH", "data/cache/embeddings.sqlite"),
+                        max_bytes=int(os.getenv("EMBEDDING_CACHE_MAX_MB", "256")) * 1024 * 1024,
+                    )
+                    embedder = CachedEmbedder(embedder, provider, store=store)
+                cls._shared[key] = embedder
+            return cls._shared[key]
+
+    @staticmethod
+    def get_document_store():
+        """
+        문서 임베딩용 콘텐츠 주소 저장소를 반환합니다. (질의 캐시와 별도 파일)
+        파이프라인 임베더가 입력 텍스트 해시로 기존 벡터를 재사용하는 데 사용합니다.
+        """
+        from .cache import EmbeddingStore
+        return EmbeddingStore(
+            os.getenv("EMBEDDING_DOC_STORE_PATH", "data/cache/doc_embeddings.sqlite"),
+            max_bytes=int(os.getenv("EMBEDDING_DOC_STORE_MAX_MB", "2048")) * 1024 * 1024,
+        )
+
+    @classmethod
+    def clear_shared(cls):
+        """공유 임베더를 모두 해제합니다 (테스트/종료 시 사용)."""
+        with cls._lock:
+            cls._shared.clear()
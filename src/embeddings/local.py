@@ -1,34 +1,109 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from .base import BaseEmbedder
+from .batching import MicroBatcher
 import asyncio
 
+# LOCAL_EMBEDDING_BACKEND 값: "torch" (기본), "onnx" (ONNX Runtime fp32), "onnx-int8" (동적 int8 양자화 ONNX)
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
 class LocalEmbedder(BaseEmbedder):
-    def __init__(self, model_name: str = "dragonkue/multilingual-e5-small-ko"):
+    """
+    sentence-transformers 기반 로컬 임베더입니다.
+    - 추론은 전용 스레드 풀(LOCAL_EMBEDDING_WORKERS)에서 실행하고, torch intra-op 스레드 수(LOCAL_EMBEDDING_TORCH_THREADS)를 명시합니다.
+    - embed_query는 MicroBatcher를 거쳐 동시에 들어온 질의를 최대 LOCAL_EMBEDDING_MAX_BATCH건,
+      최대 LOCAL_EMBEDDING_MAX_WAIT_MS 대기로 묶어 한 번에 인코딩합니다.
+    - backend="onnx-int8"이면 모델을 ONNX로 내보내 동적 int8 양자화한 CPU 경로를 사용합니다 (optimum[onnxruntime] 필요).
+    """
+    def __init__(self, model_name: str = "dragonkue/multilingual-e5-small-ko", backend: str = None, device: str = None,
+                 workers: int = None, torch_threads: int = None, max_batch_size: int = None, max_wait_ms: float = None):
         # E5-small-ko 차원은 384입니다.
         super().__init__(dimension=384)
-        self.model = SentenceTransformer(model_name)
-        # MPS 가속 설정 (M2 Pro 등 Mac 실리콘 지원)
+        self.model_name = model_name
+        self.backend = (backend or os.getenv("LOCAL_EMBEDDING_BACKEND", "torch")).lower()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"지원되지 않는 로컬 임베딩 백엔드입니다: {self.backend} (가능: {', '.join(BACKENDS)})")
+
+        self.workers = workers or int(os.getenv("LOCAL_EMBEDDING_WORKERS", "1"))
+        self.torch_threads = torch_threads or int(os.getenv("LOCAL_EMBEDDING_TORCH_THREADS", "0")) or max(1, (os.cpu_count() or 1) // self.workers)
+        self._configure_threads()
+
+        self.device = device or os.getenv("LOCAL_EMBEDDING_DEVICE") or self._default_device()
+        self.model = self._load_model()
+
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="local-embedder")
+        self.batcher = MicroBatcher(
+            self._encode_queries, self.executor,
+            max_batch_size=max_batch_size or int(os.getenv("LOCAL_EMBEDDING_MAX_BATCH", "32")),
+            max_wait_ms=max_wait_ms if max_wait_ms is not None else float(os.getenv("LOCAL_EMBEDDING_MAX_WAIT_MS", "5")),
+            max_in_flight=self.workers,
+        )
+
+    def _configure_threads(self):
+        import torch
+        torch.set_num_threads(self.torch_threads)
         try:
-            self.model.to("mps")
-        except:
-             # MPS를 사용할 수 없는 경우 CPU로 폴백
+            # 프로세스에서 병렬 작업이 시작된 뒤에는 변경할 수 없으므로 실패는 무시
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
             pass
 
-    async def embed_query(self, text: str) -> List[float]:
+    @staticmethod
+    def _default_device() -> str:
+        # Mac 실리콘에서는 MPS, 그 외(리눅스 CPU 서버 등)에서는 CPU
+        import torch
+        return "mps" if getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available() else "cpu"
+
+    def _load_model(self) -> SentenceTransformer:
+        if self.backend == "torch":
+            return SentenceTransformer(self.model_name, device=self.device)
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            raise ImportError(f"{self.backend} 백엔드에는 ONNX Runtime이 필요합니다: pip install \"optimum[onnxruntime]\"")
+        if self.backend == "onnx":
+            return SentenceTransformer(self.model_name, backend="onnx", device="cpu")
+        return self._load_quantized_model()
+
+    def _load_quantized_model(self) -> SentenceTransformer:
+        """
+        ONNX 내보내기 + 동적 int8 양자화 결과를 LOCAL_EMBEDDING_ONNX_DIR에 한 번 만들어 두고 재사용합니다.
+        양자화 설정(LOCAL_EMBEDDING_QUANT_CONFIG)은 CPU 명령어 집합에 맞춰 avx2 / avx512 / avx512_vnni / arm64 중 선택합니다.
+        """
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        config = os.getenv("LOCAL_EMBEDDING_QUANT_CONFIG", "avx2")
+        root = os.getenv("LOCAL_EMBEDDING_ONNX_DIR", "data/models")
+        export_dir = os.path.join(root, re.sub(r"[^\w.-]", "_", self.model_name) + "-onnx")
+        file_name = f"onnx/model_qint8_{config}.onnx"
+
+        if not os.path.exists(os.path.join(export_dir, file_name)):
+            print(f"🔧 [LOCAL EMBEDDER]: ONNX 내보내기 및 int8 양자화 중 ({config}) → {export_dir}")
+            base = SentenceTransformer(self.model_name, backend="onnx", device="cpu")
+            base.save_pretrained(export_dir)
+            export_dynamic_quantized_onnx_model(base, config, export_dir)
+        return SentenceTransformer(export_dir, backend="onnx", device="cpu", model_kwargs={"file_name": file_name})
+
+    def _encode_queries(self, texts: List[str]) -> np.ndarray:
         # E5 모델은 성능 향상을 위해 'query: ' 접두사가 필요한 경우가 많습니다.
-        processed_text = f"query: {text}"
-        # sentence-transformers의 encode는 동기 방식이므로, 비동기 안전성을 위해 스레드 풀에서 실행
-        loop = asyncio.get_event_loop()
-        embedding = await loop.run_in_executor(None, lambda: self.model.encode(processed_text))
+        return self.model.encode([f"query: {text}" for text in texts], convert_to_numpy=True, batch_size=len(texts))
+
+    async def embed_query(self, text: str) -> List[float]:
+        # 동시에 들어온 질의와 묶어 전용 스레드 풀에서 배치 인코딩
+        embedding = await self.batcher.submit(text)
         return self.validate_and_format(self.normalize(embedding.tolist()))
 
     async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return [self.validate_and_format(vector) for vector in (await self.embed_documents_array(texts)).tolist()]
+
+    async def embed_documents_array(self, texts: List[str]) -> np.ndarray:
         processed_texts = [f"passage: {t}" for t in texts]
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(None, lambda: self.model.encode(processed_texts))
-        
-        results = []
-        for emb in embeddings:
-            results.append(self.validate_and_format(self.normalize(emb.tolist())))
-        return results
+        loop = asyncio.get_running_loop()
+        embeddings = await loop.run_in_executor(self.executor, lambda: self.model.encode(processed_texts, convert_to_numpy=True))
+        return self.validate_batch(self.normalize_batch(embeddings))
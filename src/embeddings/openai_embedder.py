@@ -1,30 +1,152 @@
 import os
-from typing import List
-from openai import AsyncOpenAI
+import random
+import base64
+import asyncio
+import logging
+import threading
+from typing import List, Dict, Tuple
+import numpy as np
+from openai import AsyncOpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+from src.utils.rate_limit import RateLimiter, estimate_tokens, truncate_to_tokens
 from .base import BaseEmbedder
+from .profile import EmbeddingProfile
+
+# 일시적 오류로 보고 재시도하는 예외 (429, 5xx, 네트워크/타임아웃)
+_RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+# 모델별 공유 요청 한도 (같은 프로세스의 질의/파이프라인 임베더가 하나의 API 쿼터를 나눠 씀)
+_RATE_LIMITERS: Dict[str, RateLimiter] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_embedding_rate_limiter(model_name: str) -> RateLimiter:
+    with _RATE_LIMITERS_LOCK:
+        if model_name not in _RATE_LIMITERS:
+            _RATE_LIMITERS[model_name] = RateLimiter(
+                int(os.getenv("EMBEDDING_RPM", "3000")), int(os.getenv("EMBEDDING_TPM", "1000000"))
+            )
+        return _RATE_LIMITERS[model_name]
+
 
 class OpenAIEmbedder(BaseEmbedder):
-    def __init__(self, model_name: str = "text-embedding-3-small"):
-        # OpenAI text-embedding-3-small의 차원은 1536입니다.
-        super().__init__(dimension=1536)
+    """
+    OpenAI 임베딩 API 클라이언트입니다. 문서 임베딩은 호출자가 보낸 리스트 크기와 무관하게
+    - 입력을 로컬 토크나이저 기준 요청당 토큰/개수 한도 안으로 묶고 (입력 1건 한도를 넘는 텍스트는 잘라냄)
+    - 요청들을 동시 실행 상한과 모델별 공유 요청 한도(RPM/TPM) 아래에서 실행하며
+    - 429/5xx/네트워크 오류는 지수 백오프 + 지터로 재시도한 뒤
+    결과를 입력 순서대로 반환합니다.
+    """
+    # text-embedding-3-* 입력 1건당 최대 토큰
+    MAX_INPUT_TOKENS = 8191
+    # text-embedding-3-small의 기본 차원
+    NATIVE_DIMENSION = 1536
+
+    def __init__(self, model_name: str = "text-embedding-3-small", max_tokens_per_request: int = None,
+                 max_items_per_request: int = None, max_concurrency: int = None, max_retries: int = None,
+                 rate_limiter: RateLimiter = None, profile: EmbeddingProfile = None):
+        # 차원/정밀도는 EMBEDDING_DIMENSIONS / EMBEDDING_PRECISION (기본 1536-float32)
+        profile = profile or EmbeddingProfile.from_env(self.NATIVE_DIMENSION)
+        if profile.dimension > self.NATIVE_DIMENSION:
+            raise ValueError(f"{model_name}의 최대 차원은 {self.NATIVE_DIMENSION}입니다: {profile.dimension}")
+        super().__init__(dimension=profile.dimension, precision=profile.precision)
         self.model_name = model_name
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.max_tokens_per_request = max_tokens_per_request or int(os.getenv("EMBEDDING_MAX_TOKENS_PER_REQUEST", "100000"))
+        self.max_items_per_request = max_items_per_request or int(os.getenv("EMBEDDING_MAX_ITEMS_PER_REQUEST", "512"))
+        self.max_concurrency = max_concurrency or int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+        self.rate_limiter = rate_limiter or get_embedding_rate_limiter(model_name)
+        self.backoff_base = 1.0
+        self.backoff_max = 30.0
+        self._client = None
+        self._client_loop = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        # AsyncOpenAI의 커넥션 풀은 이벤트 루프에 묶이므로, 공유 인스턴스라도 루프가 바뀌면 클라이언트를 새로 만듭니다.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._client is None or (loop is not None and self._client_loop is not loop):
+            self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            self._client_loop = loop
+        return self._client
+
+    def _prepare(self, text: str) -> Tuple[str, int]:
+        """개행 치환 + 입력 1건 토큰 한도 적용 후 (텍스트, 토큰 수)를 반환합니다."""
+        text = text.replace("\n", " ")
+        tokens = estimate_tokens(text, self.model_name)
+        if tokens > self.MAX_INPUT_TOKENS:
+            text = truncate_to_tokens(text, self.MAX_INPUT_TOKENS, self.model_name)
+            tokens = self.MAX_INPUT_TOKENS
+        return text, tokens
+
+    def pack_requests(self, token_counts: List[int]) -> List[List[int]]:
+        """입력 인덱스를 순서대로 요청당 토큰/개수 한도 안에 들어가도록 묶습니다."""
+        requests, current, current_tokens = [], [], 0
+        for i, tokens in enumerate(token_counts):
+            if current and (len(current) >= self.max_items_per_request or current_tokens + tokens > self.max_tokens_per_request):
+                requests.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            requests.append(current)
+        return requests
+
+    async def _create(self, inputs: List[str], tokens: int, encoding_format: str = "float"):
+        """요청 한도를 지키며 embeddings.create를 호출하고, 일시적 오류는 지수 백오프 + 지터로 재시도합니다."""
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(tokens)
+            try:
+                # 축소 차원은 API가 잘라 재정규화한 벡터를 반환 (text-embedding-3-*의 dimensions 파라미터)
+                extra = {"dimensions": self.dimension} if self.dimension != self.NATIVE_DIMENSION else {}
+                response = await self.client.embeddings.create(input=inputs, model=self.model_name, encoding_format=encoding_format, **extra)
+                usage = getattr(response, "usage", None)
+                if usage is not None and usage.prompt_tokens > tokens:
+                    self.rate_limiter.consume(usage.prompt_tokens - tokens)
+                return response
+            except _RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(self.backoff_max, self.backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+                logging.warning(f"[EMBEDDING] 요청 실패({len(inputs)}건), {delay:.1f}s 후 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(delay)
 
     async def embed_query(self, text: str) -> List[float]:
-        response = await self.client.embeddings.create(
-            input=[text.replace("\n", " ")],
-            model=self.model_name
-        )
+        text, tokens = self._prepare(text)
+        response = await self._create([text], tokens)
         embedding = response.data[0].embedding
         return self.validate_and_format(self.normalize(embedding))
 
     async def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        response = await self.client.embeddings.create(
-            input=[t.replace("\n", " ") for t in texts],
-            model=self.model_name
-        )
-        
-        results = []
-        for item in response.data:
-            results.append(self.validate_and_format(self.normalize(item.embedding)))
-        return results
+        if not texts:
+            return []
+        return [self.validate_and_format(vector) for vector in (await self.embed_documents_array(texts)).tolist()]
+
+    async def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        prepared = [self._prepare(text) for text in texts]
+        requests = self.pack_requests([tokens for _, tokens in prepared])
+        # 채워지지 않은 행이 남으면 validate_batch가 NaN으로 거부하도록 NaN으로 초기화
+        vectors = np.full((len(texts), self.dimension), np.nan, dtype=np.float32)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _run(indices: List[int]):
+            async with semaphore:
+                # base64 응답을 그대로 받아 float32 버퍼로 해석 (JSON float 리스트 파싱/변환 생략)
+                response = await self._create(
+                    [prepared[i][0] for i in indices], sum(prepared[i][1] for i in indices), encoding_format="base64"
+                )
+            # 응답의 index 필드 기준으로 배치하여 입력 순서를 보장 (누락/중복/길이 불일치는 잘못된 벡터가 저장되지 않도록 실패 처리)
+            if len(response.data) != len(indices) or {item.index for item in response.data} != set(range(len(indices))):
+                raise ValueError(f"임베딩 응답 항목이 요청과 일치하지 않습니다: 요청 {len(indices)}건, 응답 {len(response.data)}건")
+            for item in response.data:
+                vector = np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+                if len(vector) != self.dimension:
+                    raise ValueError(f"임베딩 차원이 프로파일({self.profile.name})과 일치하지 않습니다: 기대치 {self.dimension}, 실제치 {len(vector)}")
+                vectors[indices[item.index]] = vector
+
+        await asyncio.gather(*(_run(indices) for indices in requests))
+        return self.validate_batch(self.normalize_batch(vectors))
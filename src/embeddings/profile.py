@@ -0,0 +1,71 @@
+import os
+from dataclasses import dataclass
+from typing import Tuple
+import numpy as np
+
+# 저장 정밀도: float32 (기본) / int8 (행 단위 대칭 스칼라 양자화, 4배 절감)
+PRECISIONS = ("float32", "int8")
+
+
+@dataclass(frozen=True)
+class EmbeddingProfile:
+    """
+    임베딩 차원과 저장 정밀도 조합입니다. 임베더 → 산출물/로더 → 인덱스 설정까지 같은 프로파일을 사용합니다.
+    text-embedding-3-* 모델은 앞쪽 차원만 잘라 재정규화해도 품질이 유지되도록 학습되어 있어 (API dimensions 파라미터와 동일)
+    256~512차원으로 줄여 메모리/지연을 아낄 수 있습니다.
+    """
+    dimension: int = 1536
+    precision: str = "float32"
+
+    def __post_init__(self):
+        if self.precision not in PRECISIONS:
+            raise ValueError(f"지원되지 않는 임베딩 정밀도입니다: {self.precision} (가능: {', '.join(PRECISIONS)})")
+        if self.dimension <= 0:
+            raise ValueError(f"임베딩 차원은 양수여야 합니다: {self.dimension}")
+
+    @property
+    def name(self) -> str:
+        return f"{self.dimension}-{self.precision}"
+
+    @property
+    def bytes_per_vector(self) -> int:
+        # int8은 행별 스케일(float32) 4바이트 포함
+        return self.dimension * 4 if self.precision == "float32" else self.dimension + 4
+
+    @classmethod
+    def parse(cls, value: str) -> "EmbeddingProfile":
+        """"512-int8" / "1536" 형식 문자열을 프로파일로 변환합니다."""
+        dimension, _, precision = value.partition("-")
+        return cls(int(dimension), precision or "float32")
+
+    @classmethod
+    def from_env(cls, default_dimension: int = 1536) -> "EmbeddingProfile":
+        """EMBEDDING_DIMENSIONS / EMBEDDING_PRECISION 환경 변수로 현재 프로파일을 만듭니다."""
+        return cls(
+            int(os.getenv("EMBEDDING_DIMENSIONS") or default_dimension),
+            os.getenv("EMBEDDING_PRECISION", "float32").lower(),
+        )
+
+
+def truncate_dimensions(vectors, dimension: int) -> np.ndarray:
+    """앞쪽 dimension개 차원만 남기고 행 단위로 다시 L2 정규화합니다."""
+    arr = np.asarray(vectors, dtype=np.float32)
+    if arr.shape[1] < dimension:
+        raise ValueError(f"원본 차원({arr.shape[1]})보다 큰 차원({dimension})으로 줄일 수 없습니다.")
+    arr = arr[:, :dimension]
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(arr / norms, dtype=np.float32)
+
+
+def quantize_int8(vectors) -> Tuple[np.ndarray, np.ndarray]:
+    """행 단위 대칭 스칼라 양자화: (int8 행렬, 행별 스케일). 원래 값 ≈ int8 * scale."""
+    arr = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(arr).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(arr / scales[:, None]), -127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def dequantize_int8(quantized, scales) -> np.ndarray:
+    return np.asarray(quantized, dtype=np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
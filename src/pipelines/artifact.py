@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import shutil
+from typing import List, Dict, Any, Iterator
+import numpy as np
+from src.embeddings.profile import PRECISIONS, quantize_int8, dequantize_int8
+
+VECTORS_FILE = "vectors.npy"
+SCALES_FILE = "scales.npy"
+METADATA_FILE = "metadata.jsonl"
+MANIFEST_FILE = "manifest.json"
+
+
+def write_embedding_artifact(directory: str, docs: List[Dict[str, Any]], vectors: np.ndarray, precision: str = "float32", **extra) -> str:
+    """
+    임베더 → 로더/인덱스 간 전달용 컬럼형 산출물을 저장합니다.
+    - metadata.jsonl: 문서 메타데이터 (embedding 제외, 1줄 1문서)
+    - vectors.npy: (N, dimension) float32 C-연속 배열 (i번째 행 = i번째 줄 문서)
+    - manifest.json: 문서 수, 차원, dtype 및 추가 정보(모델 등)
+    precision="int8"이면 vectors.npy를 int8로, 행별 스케일을 scales.npy(float32)로 저장합니다 (약 4배 절감).
+    임시 디렉토리에 기록한 뒤 교체하므로, 중간에 실패해도 기존 산출물이 깨지지 않습니다.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim != 2 or len(vectors) != len(docs):
+        raise ValueError(f"문서 수({len(docs)})와 벡터 행 수가 일치하지 않습니다: shape={vectors.shape}")
+    if precision not in PRECISIONS:
+        raise ValueError(f"지원되지 않는 임베딩 정밀도입니다: {precision}")
+
+    tmp_dir = f"{directory.rstrip(os.sep)}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    if precision == "int8":
+        vectors_q, scales = quantize_int8(vectors)
+        np.save(os.path.join(tmp_dir, VECTORS_FILE), vectors_q)
+        np.save(os.path.join(tmp_dir, SCALES_FILE), scales)
+    else:
+        np.save(os.path.join(tmp_dir, VECTORS_FILE), vectors)
+    with open(os.path.join(tmp_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+        for doc in docs:
+            f.write(json.dumps({k: v for k, v in doc.items() if k != "embedding"}, ensure_ascii=False, default=str))
+            f.write("\n")
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "count": len(docs),
+            "dimension": int(vectors.shape[1]),
+            "dtype": precision,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **extra,
+        }, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+    return directory
+
+
+class EmbeddingArtifact:
+    """
+    write_embedding_artifact로 저장된 산출물을 읽습니다.
+    vectors는 기본적으로 np.load(mmap_mode="r")로 메모리 매핑되어 복사 없이 접근하며,
+    메타데이터는 필요한 시점에 한 줄씩 읽을 수 있습니다.
+    int8 산출물은 vectors(int8)와 scales(행별 float32)를 함께 노출하며, row()/dense()가 float32로 복원합니다.
+    """
+    def __init__(self, directory: str, mmap: bool = True):
+        if not os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+            raise FileNotFoundError(f"임베딩 산출물을 찾을 수 없습니다: {directory}")
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.vectors: np.ndarray = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode="r" if mmap else None)
+        self.dimension = self.manifest["dimension"]
+        self.precision = self.manifest.get("dtype", "float32")
+        self.scales: np.ndarray = np.load(os.path.join(directory, SCALES_FILE)) if self.precision == "int8" else None
+
+    def __len__(self) -> int:
+        return self.manifest["count"]
+
+    def row(self, i: int) -> np.ndarray:
+        """i번째 벡터를 float32로 반환합니다 (int8이면 역양자화)."""
+        if self.scales is None:
+            return np.asarray(self.vectors[i], dtype=np.float32)
+        return self.vectors[i].astype(np.float32) * self.scales[i]
+
+    def dense(self) -> np.ndarray:
+        """전체 벡터를 float32 행렬로 반환합니다 (float32 산출물은 메모리 매핑 그대로)."""
+        if self.scales is None:
+            return self.vectors
+        return dequantize_int8(self.vectors, self.scales)
+
+    def iter_docs(self) -> Iterator[Dict[str, Any]]:
+        """메타데이터를 한 줄씩 읽어 반환합니다 (embedding 미포함)."""
+        with open(os.path.join(self.directory, METADATA_FILE), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def load_docs(self) -> List[Dict[str, Any]]:
+        return list(self.iter_docs())
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """MongoDB 적재용: 메타데이터에 해당 행 벡터를 embedding 리스트로 붙여 한 건씩 반환합니다."""
+        for i, doc in enumerate(self.iter_docs()):
+            doc["embedding"] = self.row(i).tolist()
+            yield doc
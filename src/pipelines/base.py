@@ -21,7 +21,7 @@ class BaseEmbedder(ABC):
         Args:
             input_path (str): 전처리된 데이터 파일의 경로.
         Returns:
-            str: 임베딩된 데이터 파일(pickle)의 경로.
+            str: 임베딩된 데이터 산출물의 경로 (V1/V2: pickle, V3: metadata.jsonl + vectors.npy 디렉토리).
         """
         pass
 
@@ -0,0 +1,116 @@
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Iterable, AsyncIterable, Union, List, Dict, Any, Callable
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from tqdm import tqdm
+
+
+@dataclass
+class BulkWriteReport:
+    """한 번의 적재 실행에 대한 집계 리포트입니다."""
+    total: int = 0
+    matched: int = 0
+    modified: int = 0
+    upserted: int = 0
+    failed: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def docs_per_sec(self) -> float:
+        return self.total / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        report = asdict(self)
+        report["docs_per_sec"] = round(self.docs_per_sec, 1)
+        return report
+
+    def summary(self) -> str:
+        return (f"문서 {self.total}건 / 배치 {self.batches}개: matched {self.matched}, modified {self.modified}, "
+                f"upserted {self.upserted}, failed {self.failed} ({self.seconds:.2f}s, {self.docs_per_sec:.1f} docs/s)")
+
+
+def uid_key(item: Dict[str, Any]) -> Dict[str, Any]:
+    """uid 기준 업서트 키 (uid가 없으면 title로 대체)."""
+    return {"uid": item["uid"]} if item.get("uid") else {"title": item["title"]}
+
+
+async def _aiter(items):
+    """동기/비동기 이터러블을 모두 async for로 순회할 수 있게 합니다 (스트리밍 파이프라인의 큐 소비 지원)."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class BulkUpserter:
+    """
+    문서를 chunk_size 단위 UpdateOne 업서트로 묶어 unordered bulk_write로 적재합니다.
+    동시에 진행 중인 bulk_write는 max_in_flight개로 제한되며, 입력(동기 이터러블 또는 큐 소비자 같은 비동기 이터러블)은 순차 소비합니다.
+    한 배치 안의 개별 쓰기 실패는 나머지 문서 적재를 막지 않고 리포트의 failed/errors로 집계됩니다.
+    """
+    def __init__(self, collection, chunk_size: int = None, max_in_flight: int = None):
+        from src.core.config import PipelineConfig
+        self.collection = collection
+        self.chunk_size = chunk_size or PipelineConfig.LOAD_CHUNK_SIZE
+        self.max_in_flight = max_in_flight or PipelineConfig.LOAD_MAX_IN_FLIGHT
+
+    async def _write_chunk(self, operations: List[UpdateOne], report: BulkWriteReport):
+        try:
+            result = await self.collection.bulk_write(operations, ordered=False)
+            report.matched += result.matched_count
+            report.modified += result.modified_count
+            report.upserted += result.upserted_count
+        except BulkWriteError as e:
+            details = e.details
+            report.matched += details.get("nMatched", 0)
+            report.modified += details.get("nModified", 0)
+            report.upserted += details.get("nUpserted", 0)
+            write_errors = details.get("writeErrors", [])
+            report.failed += len(write_errors)
+            report.errors.extend(err.get("errmsg", "") for err in write_errors[:5])
+        except Exception as e:
+            # 네트워크 오류 등 배치 전체 실패
+            logging.error(f"[BULK] bulk_write 실패 ({len(operations)}건): {e}")
+            report.failed += len(operations)
+            report.errors.append(f"{type(e).__name__}: {e}")
+
+    async def upsert(self, items: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                     key_fn: Callable[[Dict[str, Any]], Dict[str, Any]] = uid_key,
+                     total: int = None, desc: str = "Bulk upsert") -> BulkWriteReport:
+        report = BulkWriteReport()
+        pending = set()
+        start = time.perf_counter()
+        progress = tqdm(total=total, desc=desc, unit="doc")
+
+        async def _submit(operations: List[UpdateOne]):
+            # 진행 중인 배치가 상한에 도달하면 하나가 끝날 때까지 대기 (백프레셔)
+            while len(pending) >= self.max_in_flight:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+            task = asyncio.create_task(self._write_chunk(operations, report))
+            task.add_done_callback(lambda _: progress.update(len(operations)))
+            pending.add(task)
+            report.batches += 1
+
+        operations: List[UpdateOne] = []
+        async for item in _aiter(items):
+            operations.append(UpdateOne(key_fn(item), {"$set": item}, upsert=True))
+            report.total += 1
+            if len(operations) >= self.chunk_size:
+                await _submit(operations)
+                operations = []
+        if operations:
+            await _submit(operations)
+        if pending:
+            await asyncio.wait(pending)
+
+        progress.close()
+        report.seconds = time.perf_counter() - start
+        return report
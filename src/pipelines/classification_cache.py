@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import List, Dict, Any, Callable, Awaitable, Optional
+from src.pipelines.scheduler import fingerprint
+
+
+def classification_key(item_text: str, prompt_version: str) -> str:
+    """분류 결과 키: 문서가 프롬프트에 들어가는 텍스트 + 프롬프트 버전(모델/시스템 프롬프트/분류 체계/응답 스키마)의 해시."""
+    return hashlib.sha256(f"{prompt_version}|{item_text}".encode("utf-8")).hexdigest()
+
+
+class ClassificationCache:
+    """
+    LLM 분류 결과(문서 1건당 구조화 결과 dict)를 SQLite에 JSON으로 저장하는 디스크 캐시입니다.
+    키에 프롬프트 버전이 포함되어 있어 분류 체계(ZipsaConfig의 카테고리/전문가)나 모델이 바뀌면
+    해당 버전의 항목만 자연스럽게 미스가 됩니다.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS classifications ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, prompt_version TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 키를 한 번에 조회합니다. 없는 키는 결과에서 빠집니다."""
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, result FROM classifications WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, result in rows:
+                    found[key] = json.loads(result)
+        return found
+
+    def put_many(self, results: Dict[str, Dict[str, Any]], prompt_version: str) -> None:
+        now = time.time()
+        rows = [(key, json.dumps(result, ensure_ascii=False), prompt_version, now) for key, result in results.items()]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO classifications VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def summary(self) -> str:
+        total = self.stats["hits"] + self.stats["misses"]
+        ratio = self.stats["hits"] / total if total else 0.0
+        return f"분류 캐시 적중 {self.stats['hits']}/{total}건 ({ratio:.1%}), LLM 요청 {self.stats['misses']}건"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_CACHES: Dict[str, ClassificationCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_classification_cache(path: str = None) -> Optional[ClassificationCache]:
+    """경로별 공유 캐시를 반환합니다. PipelineConfig.CLASSIFY_CACHE_PATH가 비어 있으면 None (캐시 비활성)."""
+    from src.core.config import PipelineConfig
+    path = PipelineConfig.CLASSIFY_CACHE_PATH if path is None else path
+    if not path:
+        return None
+    with _CACHES_LOCK:
+        if path not in _CACHES:
+            _CACHES[path] = ClassificationCache(path)
+        return _CACHES[path]
+
+
+def prompt_version(model: str, system_prompt: str, policy, response_format) -> str:
+    """분류 결과를 결정하는 설정 전체의 지문입니다."""
+    return fingerprint(model, system_prompt, list(policy.categories), list(policy.specialists), response_format.model_json_schema())
+
+
+async def classify_with_cache(cache: Optional[ClassificationCache], version: str, items: List[Dict[str, Any]],
+                              item_text_fn: Callable[[Dict[str, Any]], str],
+                              classify_fn: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """
+    캐시에 있는 문서는 저장된 결과를 쓰고 나머지만 classify_fn으로 분류해 입력 순서대로 합칩니다.
+    LLM 결과 수가 요청 수와 다르면 (순서 대응을 믿을 수 없으므로) 저장하지 않고 빈 리스트를 반환합니다.
+    """
+    if cache is None or not items:
+        return await classify_fn(items)
+
+    keys = [classification_key(item_text_fn(item), version) for item in items]
+    cached = cache.get_many(list(set(keys)))
+
+    # 같은 배치 안의 중복 문서는 한 번만 요청
+    pending: Dict[str, Dict[str, Any]] = {}
+    for key, item in zip(keys, items):
+        if key not in cached:
+            pending.setdefault(key, item)
+    cache.stats["hits"] += sum(1 for key in keys if key in cached)
+    cache.stats["misses"] += len(pending)
+
+    if pending:
+        results = await classify_fn(list(pending.values()))
+        if len(results) != len(pending):
+            return []
+        fresh = dict(zip(pending, results))
+        cache.put_many(fresh, version)
+        cached.update(fresh)
+
+    return [cached[key] for key in keys]
+
+
+def pending_items(cache: Optional[ClassificationCache], version: str, items: List[Dict[str, Any]],
+                  item_text_fn: Callable[[Dict[str, Any]], str]) -> List[Dict[str, Any]]:
+    """캐시에 없는 (실제로 LLM에 보낼) 문서만 반환합니다. 요청 한도 추정에 사용합니다."""
+    if cache is None or not items:
+        return items
+    keys = [classification_key(item_text_fn(item), version) for item in items]
+    cached = cache.get_many(list(set(keys)))
+    return [item for key, item in zip(keys, items) if key not in cached]
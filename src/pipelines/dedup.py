@@ -0,0 +1,167 @@
+import math
+import time
+import hashlib
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Any, Callable, Tuple
+import numpy as np
+
+# MinHash 순열용 메르센 소수 (2^61 - 1)와 32비트 해시 마스크
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+@dataclass
+class DedupReport:
+    """근접 중복 제거 단계의 집계 리포트입니다."""
+    input: int = 0
+    unique: int = 0
+    dropped: int = 0
+    clusters: int = 0
+    largest_cluster: int = 0
+    cluster_sizes: Dict[int, int] = field(default_factory=dict)
+    candidate_pairs: int = 0
+    llm_calls_saved: int = 0
+    embedding_inputs_saved: int = 0
+    seconds: float = 0.0
+    examples: List[List[str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (f"원본 {self.input}건 → {self.unique}건 (중복 {self.dropped}건 제거, 클러스터 {self.clusters}개, 최대 {self.largest_cluster}건) | "
+                f"절약: LLM 배치 호출 {self.llm_calls_saved}회, 임베딩 입력 {self.embedding_inputs_saved}건 ({self.seconds:.2f}s)")
+
+
+def default_text(item: Dict[str, Any]) -> str:
+    """원본 문서의 비교 대상 텍스트 (제목 + 본문)."""
+    return f"{item.get('title') or ''} {item.get('text') or item.get('content') or ''}"
+
+
+class NearDuplicateDetector:
+    """
+    Kiwi 토큰 shingle → MinHash 서명 → LSH 밴딩으로 근접 중복 문서를 묶습니다.
+    - num_perm: MinHash 순열(서명 길이), bands: LSH 밴드 수 (밴드당 행 = num_perm / bands)
+    - 같은 버킷에 들어간 후보 쌍만 서명 일치율(추정 자카드)로 검증하므로 문서 수에 거의 선형입니다.
+    - threshold: 추정 자카드 유사도가 이 값 이상이면 같은 클러스터로 병합합니다 (union-find).
+    """
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 3, threshold: float = 0.8,
+                 tokenizer: Callable[[str], str] = None, seed: int = 42):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})의 배수여야 합니다.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self._tokenizer = tokenizer
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def _tokenize(self, text: str) -> List[str]:
+        if self._tokenizer is None:
+            from src.utils.text import tokenize_korean
+            self._tokenizer = tokenize_korean
+        return self._tokenizer(text).split()
+
+    def shingles(self, text: str) -> set:
+        """토큰 k-gram 집합. 토큰이 k개보다 적으면 토큰 자체를 사용합니다."""
+        tokens = self._tokenize(text)
+        if len(tokens) < self.shingle_size:
+            return set(tokens)
+        return {" ".join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+
+    def signature(self, shingles: set) -> np.ndarray:
+        """MinHash 서명 (num_perm,) uint64. 빈 문서는 최댓값으로 채워 서로만 일치합니다."""
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    def cluster(self, texts: List[str]) -> Tuple[List[int], int]:
+        """
+        각 문서의 클러스터 대표 인덱스(가장 앞선 문서)와 검증한 후보 쌍 수를 반환합니다.
+        """
+        signatures = np.stack([self.signature(self.shingles(text)) for text in texts]) if texts else np.empty((0, self.num_perm), dtype=np.uint64)
+        parent = list(range(len(texts)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        checked = set()
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = {}
+            band_slice = signatures[:, band * self.rows:(band + 1) * self.rows]
+            for i, row in enumerate(band_slice):
+                buckets.setdefault(row.tobytes(), []).append(i)
+            for members in buckets.values():
+                for j in members[1:]:
+                    pair = (members[0], j)
+                    if pair in checked or find(pair[0]) == find(j):
+                        continue
+                    checked.add(pair)
+                    if np.mean(signatures[pair[0]] == signatures[j]) >= self.threshold:
+                        # 항상 더 앞선 문서가 루트가 되도록 병합
+                        root_a, root_b = find(pair[0]), find(j)
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        return [find(i) for i in range(len(texts))], len(checked)
+
+    def deduplicate(self, items: List[Dict[str, Any]], text_fn: Callable[[Dict[str, Any]], str] = default_text,
+                    llm_batch_size: int = 1) -> Tuple[List[Dict[str, Any]], DedupReport]:
+        """
+        클러스터마다 가장 앞선 문서 하나만 남기고 (크롤러가 재개 시 뒤에 덧붙인 사본 제거) 입력 순서를 유지해 반환합니다.
+        """
+        started = time.perf_counter()
+        roots, candidate_pairs = self.cluster([text_fn(item) for item in items])
+        kept = [item for i, item in enumerate(items) if roots[i] == i]
+
+        members: Dict[int, List[int]] = {}
+        for i, root in enumerate(roots):
+            members.setdefault(root, []).append(i)
+        duplicated = [group for group in members.values() if len(group) > 1]
+
+        report = DedupReport(
+            input=len(items),
+            unique=len(kept),
+            dropped=len(items) - len(kept),
+            clusters=len(duplicated),
+            largest_cluster=max((len(group) for group in duplicated), default=0),
+            cluster_sizes=dict(sorted(Counter(len(group) for group in duplicated).items())),
+            candidate_pairs=candidate_pairs,
+            llm_calls_saved=math.ceil(len(items) / llm_batch_size) - math.ceil(len(kept) / llm_batch_size),
+            embedding_inputs_saved=len(items) - len(kept),
+            seconds=time.perf_counter() - started,
+            examples=[[(items[i].get("title") or "")[:50] for i in group[:3]] for group in duplicated[:5]],
+        )
+        return kept, report
+
+
+def deduplicate_raw_items(items: List[Dict[str, Any]], uid_fn: Callable[[int], str] = None) -> List[Dict[str, Any]]:
+    """
+    PipelineConfig 설정으로 전처리 입력의 근접 중복을 제거하고 리포트를 출력합니다 (DEDUP_ENABLED=false면 그대로 반환).
+    uid_fn(원본 위치)이 주어지면 제거 전에 uid가 없는 문서에 원본 위치 기반 uid를 부여하므로,
+    중복이 빠져도 뒤 문서들의 uid가 밀리지 않습니다 (uid 기준 업서트가 다른 문서를 덮어쓰지 않음).
+    """
+    from src.core.config import PipelineConfig
+    if uid_fn is not None:
+        items = [item if item.get("uid") else {**item, "uid": uid_fn(i)} for i, item in enumerate(items)]
+    if not PipelineConfig.DEDUP_ENABLED or not items:
+        return items
+    detector = NearDuplicateDetector(
+        num_perm=PipelineConfig.DEDUP_NUM_PERM, bands=PipelineConfig.DEDUP_BANDS, threshold=PipelineConfig.DEDUP_THRESHOLD
+    )
+    kept, report = detector.deduplicate(items, llm_batch_size=PipelineConfig.CLASSIFY_BATCH_SIZE)
+    print(f"🧬 [DEDUP]: {report.summary()}")
+    for example in report.examples:
+        print(f"   - {' | '.join(example)}")
+    return kept
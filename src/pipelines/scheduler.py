@@ -0,0 +1,177 @@
+import os
+import json
+import random
+import shutil
+import asyncio
+import hashlib
+import logging
+from typing import List, Dict, Any, Callable, Awaitable, Optional
+from tqdm import tqdm
+from src.utils.rate_limit import RateLimiter
+
+
+def fingerprint(*parts: Any) -> str:
+    """입력 데이터/설정의 지문을 계산합니다. 체크포인트가 같은 입력에서 만들어졌는지 확인하는 데 사용합니다."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class BatchCheckpoint:
+    """
+    배치 단위 처리 결과를 디렉토리에 저장하는 체크포인트입니다.
+    배치마다 batch_<시작 인덱스>.json 파일 하나를 원자적으로 기록하며,
+    manifest.json의 지문(입력/배치 크기/모델)이 달라지면 이전 체크포인트를 폐기합니다.
+    """
+    def __init__(self, directory: str, fingerprint: str):
+        self.directory = directory
+        self.fingerprint = fingerprint
+        manifest_path = os.path.join(directory, "manifest.json")
+
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                previous = json.load(f).get("fingerprint")
+            if previous != fingerprint:
+                print(f"♻️ [CHECKPOINT]: 입력 또는 설정이 변경되어 기존 체크포인트를 폐기합니다. ({directory})")
+                shutil.rmtree(directory)
+
+        os.makedirs(directory, exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint}, f)
+
+    def _path(self, start_index: int) -> str:
+        return os.path.join(self.directory, f"batch_{start_index:06d}.json")
+
+    def load(self, start_index: int) -> Optional[List[Dict[str, Any]]]:
+        path = self._path(start_index)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, start_index: int, results: List[Dict[str, Any]]):
+        path = self._path(start_index)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class IncompleteRunError(RuntimeError):
+    """재시도 후에도 실패한 배치가 있어 결과가 일부만 만들어졌을 때 발생합니다."""
+
+
+class BatchScheduler:
+    """
+    LLM 배치 작업을 동시에 실행하는 스케줄러입니다.
+    - max_in_flight: 동시에 진행 중인 배치 수 상한
+    - rate_limiter: 요청/토큰 분당 한도 (cost_fn으로 배치별 예상 토큰을 계산)
+    - max_retries: 실패한 배치의 재시도 횟수 (지수 백오프 + 지터)
+    - checkpoint: 완료된 배치를 저장하고, 재실행 시 저장된 배치는 호출 없이 복원
+    """
+    def __init__(self, max_in_flight: int = 4, rate_limiter: RateLimiter = None, max_retries: int = 4,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0, checkpoint: BatchCheckpoint = None):
+        self.max_in_flight = max_in_flight
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.checkpoint = checkpoint
+        self.stats = {"batches": 0, "resumed": 0, "completed": 0, "failed": 0, "retries": 0}
+
+    async def run(self, items: List[Any], batch_size: int,
+                  process_fn: Callable[[List[Any], int], Awaitable[List[Dict[str, Any]]]],
+                  cost_fn: Callable[[List[Any]], int] = None, desc: str = "Batches",
+                  sink: Callable[[int, List[Dict[str, Any]]], Awaitable[None]] = None) -> List[Dict[str, Any]]:
+        """
+        items를 batch_size 단위로 나누어 process_fn(batch, start_index)을 실행하고 결과를 입력 순서대로 이어 붙입니다.
+        재시도 후에도 실패한 배치는 결과에서 빠지며 stats["failed"]로 집계됩니다. (다음 실행 시 해당 배치만 다시 처리)
+        sink가 주어지면 결과를 모으지 않고 배치가 끝나는 대로 sink(start_index, results)에 넘깁니다 (스트리밍 모드).
+        sink 호출은 동시 실행 슬롯 안에서 이루어지므로, 다음 단계가 밀리면 새 배치 시작도 멈춥니다 (백프레셔).
+        """
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        starts = list(range(0, len(items), batch_size))
+        self.stats = {"batches": len(starts), "resumed": 0, "completed": 0, "failed": 0, "retries": 0}
+
+        async def _process_with_retry(batch: List[Any], start: int):
+            for attempt in range(self.max_retries + 1):
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire(cost_fn(batch) if cost_fn else 0)
+                try:
+                    return await process_fn(batch, start)
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        logging.error(f"[SCHEDULER] 배치 {start} 최종 실패 ({attempt + 1}회 시도): {e}")
+                        return None
+                    self.stats["retries"] += 1
+                    delay = min(self.backoff_max, self.backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+                    logging.warning(f"[SCHEDULER] 배치 {start} 실패, {delay:.1f}s 후 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+                    await asyncio.sleep(delay)
+
+        async def _run_batch(start: int):
+            batch = items[start:start + batch_size]
+            async with semaphore:
+                results = self.checkpoint.load(start) if self.checkpoint is not None else None
+                if results is not None:
+                    self.stats["resumed"] += 1
+                else:
+                    results = await _process_with_retry(batch, start)
+                    if results is None:
+                        self.stats["failed"] += 1
+                        return start, None
+                    if self.checkpoint is not None:
+                        self.checkpoint.save(start, results)
+                    self.stats["completed"] += 1
+
+                if sink is not None:
+                    await sink(start, results)
+                    return start, None
+                return start, results
+
+        outputs: Dict[int, List[Dict[str, Any]]] = {}
+        tasks = [asyncio.create_task(_run_batch(start)) for start in starts]
+        try:
+            for task in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc=desc):
+                start, results = await task
+                if results is not None:
+                    outputs[start] = results
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        print(f"📈 [SCHEDULER]: 배치 {self.stats['batches']}개 (신규 {self.stats['completed']}, "
+              f"체크포인트 복원 {self.stats['resumed']}, 재시도 {self.stats['retries']}, 실패 {self.stats['failed']})")
+        if self.stats["failed"]:
+            print("⚠️ [SCHEDULER]: 실패한 배치가 있습니다. 같은 명령을 다시 실행하면 실패한 배치만 재처리합니다.")
+
+        return [doc for start in sorted(outputs) for doc in outputs[start]]
+
+    def raise_if_failed(self, desc: str = "Batches"):
+        """
+        최종 실패한 배치가 있으면 IncompleteRunError를 발생시킵니다.
+        일부만 처리된 결과가 성공처럼 다음 단계로 넘어가지 않도록 출력 파일 저장 전에 호출합니다.
+        (성공한 배치는 체크포인트에 남으므로 재실행 시 실패한 배치만 다시 처리)
+        """
+        if self.stats["failed"]:
+            raise IncompleteRunError(
+                f"{desc}: 배치 {self.stats['batches']}개 중 {self.stats['failed']}개가 재시도 후에도 실패했습니다. "
+                "같은 명령을 다시 실행하면 실패한 배치만 재처리합니다."
+            )
+
+
+def build_classification_scheduler(version: str, input_fingerprint: str, resume: bool = True) -> BatchScheduler:
+    """PipelineConfig 설정으로 전처리 분류용 스케줄러를 생성합니다. resume=False이면 기존 체크포인트를 지우고 새로 시작합니다."""
+    from src.core.config import PipelineConfig
+    directory = os.path.join(PipelineConfig.CHECKPOINT_ROOT, version, "preprocess")
+    if not resume:
+        shutil.rmtree(directory, ignore_errors=True)
+    return BatchScheduler(
+        max_in_flight=PipelineConfig.CLASSIFY_MAX_IN_FLIGHT,
+        rate_limiter=RateLimiter(PipelineConfig.CLASSIFY_RPM, PipelineConfig.CLASSIFY_TPM),
+        max_retries=PipelineConfig.CLASSIFY_MAX_RETRIES,
+        checkpoint=BatchCheckpoint(directory, input_fingerprint),
+    )
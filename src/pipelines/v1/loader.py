@@ -1,10 +1,10 @@
 import os
 import pickle
 import asyncio
-from tqdm import tqdm
 from src.utils.mongodb import MongoDBManager
 from src.core.config import ZipsaConfig
 from src.pipelines.base import BaseLoader
+from src.pipelines.bulk import BulkUpserter, uid_key
 
 class V1Loader(BaseLoader):
     def __init__(self):
@@ -23,15 +23,8 @@ class V1Loader(BaseLoader):
             
         print(f"📊 Loading {len(items)} documents into {self.policy.db_name}.{self.policy.collection_name}...")
         
-        for item in tqdm(items, desc="Loading V1"):
-            # Upsert based on Title as fallback or UID if present
-            # V1 might not have stable UIDs if generated on fly, but preprocessor generates them.
-            key = {"uid": item.get("uid")} if item.get("uid") else {"title": item["title"]}
+        # Upsert based on UID if present, title as fallback, in unordered bulk_write chunks
+        report = await BulkUpserter(self.collection).upsert(items, key_fn=uid_key, total=len(items), desc="Loading V1")
             
-            await self.collection.update_one(
-                key,
-                {"$set": item},
-                upsert=True
-            )
-            
-        print("✨ V1 Loading Complete!")
+        print(f"✨ V1 Loading Complete! {report.summary()}")
+        return report
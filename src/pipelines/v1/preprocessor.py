@@ -3,10 +3,11 @@ import re
 import json
 import asyncio
 from typing import List, Dict, Any
-from tqdm import tqdm
 from src.utils.text import tokenize_korean
-from src.core.config import ZipsaConfig
+from src.core.config import ZipsaConfig, PipelineConfig
 from src.pipelines.base import BasePreprocessor
+from src.pipelines.dedup import deduplicate_raw_items
+from src.pipelines.scheduler import build_classification_scheduler, fingerprint
 from src.pipelines.v1.classifier import V1Classifier
 
 class V1Preprocessor(BasePreprocessor):
@@ -22,7 +23,47 @@ class V1Preprocessor(BasePreprocessor):
         text = re.sub(r'\s+', ' ', text).strip()
         return text
 
-    async def run_async(self) -> str:
+    def _prepare_batch(self, batch: List[Dict[str, Any]], start_index: int) -> List[Dict[str, Any]]:
+        batch_data = []
+        for j, item in enumerate(batch):
+            global_idx = start_index + j
+            title = self.clean_text(item.get("title", ""))
+            text = self.clean_text(item.get("content", "") or item.get("text", ""))
+            uid = item.get("uid") or f"doc_{global_idx}"
+            
+            batch_data.append({
+                "uid": uid,
+                "title": title,
+                "text": text,
+                "original_item": item 
+            })
+        return batch_data
+
+    def _estimate_tokens(self, batch: List[Dict[str, Any]]) -> int:
+        return self.classifier.estimate_tokens(self._prepare_batch(batch, 0))
+
+    async def _process_batch(self, batch: List[Dict[str, Any]], start_index: int) -> List[Dict[str, Any]]:
+        batch_data = self._prepare_batch(batch, start_index)
+        results = await self.classifier.classify_batch(batch_data)
+        if len(results) != len(batch_data):
+            raise RuntimeError(f"Got {len(results)} classifications for {len(batch_data)} items (batch {start_index})")
+        
+        processed_batch = []
+        for doc_prep, meta in zip(batch_data, results):
+            final_doc = doc_prep["original_item"].copy()
+            final_doc.update(meta)
+            
+            final_doc["title"] = doc_prep["title"]
+            final_doc["text"] = doc_prep["text"]
+            final_doc["uid"] = meta.get("uid") or doc_prep["uid"]
+            
+            full_text = f"{final_doc['title']} {final_doc.get('summary', '')} {final_doc['text']}"
+            final_doc["tokenized_text"] = tokenize_korean(full_text)
+            
+            processed_batch.append(final_doc)
+        return processed_batch
+
+    async def run_async(self, resume: bool = True) -> str:
         print("🚀 Starting V1 Preprocessing (Legacy)...")
         raw_path = "data/raw/bemypet_catlab.json" 
         
@@ -32,48 +73,30 @@ class V1Preprocessor(BasePreprocessor):
         with open(raw_path, "r", encoding="utf-8") as f:
             raw_items = json.load(f)
 
+        # Drop near-duplicate crawl pages before paying for classification/embedding.
+        # uids are pinned to the raw position first so dropped duplicates don't shift later uids.
+        raw_items = deduplicate_raw_items(raw_items, uid_fn=lambda i: f"doc_{i}")
+
         print(f"📊 Processing {len(raw_items)} source documents...")
-        processed_items = []
-        batch_size = 5
-        
-        for i in range(0, len(raw_items), batch_size):
-            batch = raw_items[i:i+batch_size]
-            batch_data = []
-            
-            for j, item in enumerate(batch):
-                global_idx = i + j
-                title = self.clean_text(item.get("title", ""))
-                text = self.clean_text(item.get("content", "") or item.get("text", ""))
-                uid = f"doc_{global_idx}"
-                
-                batch_data.append({
-                    "uid": uid,
-                    "title": title,
-                    "text": text,
-                    "original_item": item 
-                })
-            
-            print(f"🤖 Classifying batch {i}/{len(raw_items)}...")
-            results = await self.classifier.classify_batch(batch_data)
-            
-            for doc_prep, meta in zip(batch_data, results):
-                final_doc = doc_prep["original_item"].copy()
-                final_doc.update(meta)
-                
-                final_doc["title"] = doc_prep["title"]
-                final_doc["text"] = doc_prep["text"]
-                final_doc["uid"] = meta.get("uid") or doc_prep["uid"]
-                
-                full_text = f"{final_doc['title']} {final_doc.get('summary', '')} {final_doc['text']}"
-                final_doc["tokenized_text"] = tokenize_korean(full_text)
-                
-                processed_items.append(final_doc)
+        batch_size = PipelineConfig.CLASSIFY_BATCH_SIZE # LLM Batch Size
+
+        # Reuse checkpoints only for identical input / batch size / model / prompt
+        input_fingerprint = fingerprint(raw_items, batch_size, self.classifier.model, self.classifier._get_system_prompt())
+        scheduler = build_classification_scheduler("v1", input_fingerprint, resume=resume)
+        processed_items = await scheduler.run(
+            raw_items, batch_size, self._process_batch,
+            cost_fn=self._estimate_tokens, desc="V1 Preprocessing"
+        )
+        # Don't write a partial file that the embed stage would treat as complete
+        scheduler.raise_if_failed("V1 Preprocessing")
 
         with open(self.output_path, "w", encoding="utf-8") as f:
             json.dump(processed_items, f, ensure_ascii=False, indent=2)
             
+        if self.classifier.cache is not None:
+            print(f"🗃️ {self.classifier.cache.summary()}")
         print(f"✨ Saved {len(processed_items)} items to {self.output_path}")
         return self.output_path
 
-    def run(self) -> str:
-        return asyncio.run(self.run_async())
+    def run(self, resume: bool = True) -> str:
+        return asyncio.run(self.run_async(resume=resume))
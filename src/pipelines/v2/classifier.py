@@ -3,6 +3,8 @@ import logging
 from typing import List, Dict, Any, Type
 from openai import AsyncOpenAI
 from src.core.config import ZipsaConfig
+from src.utils.rate_limit import estimate_tokens
+from src.pipelines.classification_cache import get_classification_cache, prompt_version, classify_with_cache, pending_items
 from src.pipelines.v2.schemas import BatchResultV2
 
 class V2Classifier:
@@ -10,10 +12,16 @@ class V2Classifier:
     LLM-based Classifier for V2 Pipeline (Pro).
     Extracts Category, Specialist, and Metadata.
     """
+    # Estimated response (JSON) tokens per article
+    OUTPUT_TOKENS_PER_ITEM = 350
+
     def __init__(self, model: str = "gpt-4o-mini"):
         self.policy = ZipsaConfig.get_policy("v2")
         self.model = model
         self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Disk cache of results keyed by article text + prompt version (disabled when CLASSIFY_CACHE_PATH is empty)
+        self.cache = get_classification_cache()
+        self.prompt_version = prompt_version(self.model, self._get_system_prompt(), self.policy, BatchResultV2)
 
     def _get_system_prompt(self) -> str:
         return f"""
@@ -23,14 +31,35 @@ class V2Classifier:
         Extract summary, keywords (3-5), potential_questions (2-3), target_audience, and entities in Korean.
         """
 
+    def _build_user_content(self, items: List[Dict[str, Any]]) -> str:
+        """Builds the user message for a batch classification request."""
+        content = "Analyze these articles:\n\n"
+        for item in items:
+            uid_key = 'uid' if 'uid' in item else 'index'
+            content += f"ID: {item.get(uid_key)}\n{self._item_text(item)}\n\n"
+        return content
+
+    def _item_text(self, item: Dict[str, Any]) -> str:
+        """Article text as sent in the prompt (also the classification cache key; the ID line is excluded)."""
+        return f"Title: {item['title']}\nContent: {item.get('text', '')[:2000]}"
+
+    def estimate_tokens(self, items: List[Dict[str, Any]]) -> int:
+        """Estimates input + output tokens of one batch call (for rate limiting). Cached articles are excluded."""
+        items = pending_items(self.cache, self.prompt_version, items, self._item_text)
+        if not items:
+            return 0
+        prompt = self._get_system_prompt() + self._build_user_content(items)
+        return estimate_tokens(prompt, self.model) + self.OUTPUT_TOKENS_PER_ITEM * len(items)
+
     async def classify_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Classifies only uncached articles with the LLM and returns results in input order."""
+        return await classify_with_cache(self.cache, self.prompt_version, items, self._item_text, self._classify_uncached)
+
+    async def _classify_uncached(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not items:
             return []
 
-        user_content = "Analyze these articles:\n\n"
-        for item in items:
-            uid_key = 'uid' if 'uid' in item else 'index'
-            user_content += f"ID: {item.get(uid_key)}\nTitle: {item['title']}\nContent: {item.get('text', '')[:2000]}\n\n"
+        user_content = self._build_user_content(items)
 
         try:
             response = await self.client.beta.chat.completions.parse(
@@ -1,10 +1,10 @@
 import os
 import pickle
 import asyncio
-from tqdm import tqdm
 from src.utils.mongodb import MongoDBManager
 from src.core.config import ZipsaConfig
 from src.pipelines.base import BaseLoader
+from src.pipelines.bulk import BulkUpserter, uid_key
 
 class V2Loader(BaseLoader):
     def __init__(self):
@@ -23,14 +23,8 @@ class V2Loader(BaseLoader):
             
         print(f"📊 Loading {len(items)} documents into {self.policy.db_name}.{self.policy.collection_name}...")
         
-        for item in tqdm(items, desc="Loading V2"):
-            # Upsert based on UID (or title if UID is ephemeral/missing)
-            key = {"uid": item.get("uid")} if item.get("uid") else {"title": item["title"]}
+        # Upsert based on UID (or title if UID is ephemeral/missing), in unordered bulk_write chunks
+        report = await BulkUpserter(self.collection).upsert(items, key_fn=uid_key, total=len(items), desc="Loading V2")
             
-            await self.collection.update_one(
-                key,
-                {"$set": item},
-                upsert=True
-            )
-            
-        print("✨ V2 Loading Complete!")
+        print(f"✨ V2 Loading Complete! {report.summary()}")
+        return report
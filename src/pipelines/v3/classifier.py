@@ -3,6 +3,8 @@ import logging
 from typing import List, Dict, Any
 from openai import AsyncOpenAI
 from src.core.config import ZipsaConfig
+from src.utils.rate_limit import estimate_tokens
+from src.pipelines.classification_cache import get_classification_cache, prompt_version, classify_with_cache, pending_items
 from src.pipelines.v3.schemas import BatchResultV3
 
 class V3Classifier:
@@ -10,10 +12,16 @@ class V3Classifier:
     V3 클린 파이프라인을 위한 새로운 분류기입니다.
     V3 분류 체계에 엄격하게 매핑되며 고정밀 메타데이터를 추출합니다.
     """
+    # 응답(JSON) 토큰 예산 추정치 (문서 1건당)
+    OUTPUT_TOKENS_PER_ITEM = 250
+
     def __init__(self, model: str = "gpt-4o-mini"):
         self.policy = ZipsaConfig.get_policy("v3")
         self.model = model
         self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # 문서 텍스트 + 프롬프트 버전으로 키잉한 분류 결과 디스크 캐시 (CLASSIFY_CACHE_PATH가 비어 있으면 비활성)
+        self.cache = get_classification_cache()
+        self.prompt_version = prompt_version(self.model, self._get_system_prompt(), self.policy, BatchResultV3)
 
     def _get_system_prompt(self) -> str:
         categories = ", ".join(self.policy.categories)
@@ -35,13 +43,34 @@ class V3Classifier:
         5. summary: 전문적인 한국어로 된 정확히 한 문장의 요약을 작성하세요.
         """
 
+    def _build_user_content(self, items: List[Dict[str, Any]]) -> str:
+        """배치 분류 요청의 사용자 메시지를 구성합니다."""
+        content = "V3 데이터베이스 입고를 위해 다음 기사들을 분석하세요:\n\n"
+        for item in items:
+            content += f"{self._item_text(item)}\n\n"
+        return content
+
+    def _item_text(self, item: Dict[str, Any]) -> str:
+        """프롬프트에 들어가는 문서 1건의 텍스트입니다 (분류 캐시 키에도 사용)."""
+        return f"원본 제목: {item['title']}\n본문: {item.get('content', '')[:1500]}"
+
+    def estimate_tokens(self, items: List[Dict[str, Any]]) -> int:
+        """요청 한도 관리를 위해 배치 1회 호출의 입력+출력 토큰 수를 추정합니다 (캐시에 있는 문서는 제외)."""
+        items = pending_items(self.cache, self.prompt_version, items, self._item_text)
+        if not items:
+            return 0
+        prompt = self._get_system_prompt() + self._build_user_content(items)
+        return estimate_tokens(prompt, self.model) + self.OUTPUT_TOKENS_PER_ITEM * len(items)
+
     async def classify_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """캐시에 없는 문서만 LLM으로 분류하고, 결과를 입력 순서대로 반환합니다."""
+        return await classify_with_cache(self.cache, self.prompt_version, items, self._item_text, self._classify_uncached)
+
+    async def _classify_uncached(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not items:
             return []
 
-        user_content = "V3 데이터베이스 입고를 위해 다음 기사들을 분석하세요:\n\n"
-        for item in items:
-            user_content += f"원본 제목: {item['title']}\n본문: {item.get('content', '')[:1500]}\n\n"
+        user_content = self._build_user_content(items)
 
         try:
             response = await self.client.beta.chat.completions.parse(
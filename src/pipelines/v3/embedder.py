@@ -1,56 +1,84 @@
 import os
 import json
-import pickle
-import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+import numpy as np
 from tqdm import tqdm
 from src.embeddings.factory import EmbeddingFactory
+from src.embeddings.cache import document_key
 from src.pipelines.base import BaseEmbedder
+from src.pipelines.artifact import write_embedding_artifact
 
 class V3Embedder(BaseEmbedder):
     def __init__(self):
         self.embedder = EmbeddingFactory.get_embedder("openai")
-        self.output_path = "data/v3/embedded.pkl"
-
-    async def _embed_batch(self, batch: List[Dict[str, Any]], semaphore: asyncio.Semaphore):
-        async with semaphore:
-            texts = []
-            for item in batch:
-                cats = ", ".join(item.get("categories", []))
-                specs = ", ".join(item.get("specialists", []))
-                keywords = ", ".join(item.get("keywords", []))
-                summary = item.get('summary', '')
-                title = item.get('title_refined', '')
-                content = f"[{cats}] [{specs}] 제목: {title} | 키워드: {keywords} | 요약: {summary}"
-                texts.append(content[:8000])
-
-            vectors = await self.embedder.embed_documents(texts)
-            for item, vector in zip(batch, vectors):
-                item["embedding"] = vector
+        # 컬럼형 산출물 디렉토리 (metadata.jsonl + vectors.npy)
+        self.output_path = "data/v3/embedded"
+        # 콘텐츠 주소 저장소: 입력 텍스트+모델+차원이 같으면 이전 실행의 벡터를 재사용
+        self.store = EmbeddingFactory.get_document_store()
+        self.model_name = getattr(self.embedder, "model_name", self.embedder.__class__.__name__)
+
+    @staticmethod
+    def build_embedding_text(item: Dict[str, Any]) -> str:
+        cats = ", ".join(item.get("categories", []))
+        specs = ", ".join(item.get("specialists", []))
+        keywords = ", ".join(item.get("keywords", []))
+        summary = item.get('summary', '')
+        title = item.get('title_refined', '')
+        content = f"[{cats}] [{specs}] 제목: {title} | 키워드: {keywords} | 요약: {summary}"
+        return content[:8000]
+
+    async def embed_items(self, items: List[Dict[str, Any]], chunk_size: int = 1000) -> Tuple[np.ndarray, int, int]:
+        """
+        문서 리스트를 (N, dimension) float32 행렬로 임베딩합니다.
+        요청 묶음(토큰/개수 한도)·동시성·재시도는 임베더가 처리하며, 여기서는 chunk_size 단위로 저장소에 기록합니다.
+        반환값: (벡터 행렬, 저장소에서 재사용한 문서 수, 새로 요청한 입력 수)
+        """
+        # 1. 입력 텍스트 해시로 저장소 조회
+        texts = [self.build_embedding_text(item) for item in items]
+        keys = [document_key(text, self.model_name, self.embedder.dimension) for text in texts]
+        stored = {
+            key: vector for key, vector in self.store.get_many(list(set(keys))).items()
+            if len(vector) == self.embedder.dimension
+        }
+
+        # 2. 새로 생기거나 바뀐 입력만 임베딩 (동일 텍스트는 한 번만 요청)
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in stored:
+                pending.setdefault(key, text)
+        reused = sum(1 for key in keys if key in stored)
+
+        pending_keys = list(pending)
+        for i in range(0, len(pending_keys), chunk_size):
+            keys_chunk = pending_keys[i:i + chunk_size]
+            vectors = await self.embedder.embed_documents_array([pending[k] for k in keys_chunk])
+            # 청크 단위로 즉시 저장하여 중간에 실패해도 완료된 청크는 다음 실행에서 재사용
+            fresh = dict(zip(keys_chunk, vectors))
+            self.store.put_many(fresh)
+            stored.update(fresh)
+
+        vectors = np.empty((len(items), self.embedder.dimension), dtype=np.float32)
+        for i, key in enumerate(keys):
+            vectors[i] = stored[key]
+        return vectors, reused, len(pending)
 
     async def run(self, input_path: str) -> str:
         print(f"🚀 V3 병렬 임베딩 생성 시작: {input_path}에서 읽는 중...")
-        
+
         if not os.path.exists(input_path):
             raise FileNotFoundError(f"입력 파일을 찾을 수 없습니다: {input_path}")
-            
+
         with open(input_path, "r", encoding="utf-8") as f:
             items = json.load(f)
-            
+
         print(f"📊 {len(items)}개 문서에 대한 임베딩 생성 중 (병렬 처리)...")
-        
-        batch_size = 100
-        semaphore = asyncio.Semaphore(5)
-        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
-        
-        tasks = [self._embed_batch(batch, semaphore) for batch in batches]
-        
-        # 병렬 태그 실행 완료 대기
-        await asyncio.gather(*tasks)
-            
-        # Pickle 포맷으로 저장
-        with open(self.output_path, "wb") as f:
-            pickle.dump(items, f)
-            
-        print(f"✨ {len(items)}개의 임베딩된 항목을 {self.output_path}에 저장했습니다. (Pickle 포맷)")
+        vectors, reused, requested = await self.embed_items(items)
+
+        # 문서 순서대로 정렬된 (N, dimension) 행렬을 임베딩 프로파일 정밀도(float32/int8)로 컬럼형 산출물에 저장
+        profile = self.embedder.profile
+        write_embedding_artifact(self.output_path, items, vectors, precision=profile.precision, model=self.model_name, profile=profile.name)
+
+        reuse_ratio = reused / len(items) if items else 0.0
+        print(f"♻️ 재사용률: {reuse_ratio:.1%} ({reused}/{len(items)}), 신규 임베딩 요청 {requested}건")
+        print(f"✨ {len(items)}개의 임베딩된 항목을 {self.output_path}에 저장했습니다. (metadata.jsonl + vectors.npy, {profile.name})")
         return self.output_path
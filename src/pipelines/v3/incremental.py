@@ -0,0 +1,209 @@
+import os
+import re
+import json
+import time
+import hashlib
+from typing import List, Dict, Any
+from src.core.config import PipelineConfig
+from src.pipelines.bulk import BulkUpserter
+from src.pipelines.scheduler import fingerprint
+from src.pipelines.v3.preprocessor import V3Preprocessor
+from src.pipelines.v3.embedder import V3Embedder
+from src.pipelines.v3.loader import V3Loader
+
+
+def source_key(item: Dict[str, Any]) -> str:
+    """원본 문서의 식별자입니다. url이 있으면 url, 없으면 공백을 정규화한 제목을 사용합니다 (page/index는 크롤링 순서라 불안정)."""
+    url = (item.get("url") or "").strip()
+    if url:
+        return url
+    return re.sub(r"\s+", " ", item.get("title") or "").strip()
+
+
+def content_hash(item: Dict[str, Any]) -> str:
+    """분류/임베딩 결과에 영향을 주는 원본 필드(제목 + 본문)의 해시입니다."""
+    digest = hashlib.sha256()
+    digest.update((item.get("title") or "").encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update((item.get("text") or item.get("content") or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class V3IncrementalIngestor:
+    """
+    원본 문서별 콘텐츠 해시와 적재 매니페스트를 비교해 새로 생기거나 바뀐 문서만 분류 → 임베딩 → 적재합니다.
+
+    매니페스트(data/v3/ingest_manifest.json)는 원본 키별 uid, 콘텐츠 해시, 적재 시각, 삭제 여부와
+    적재에 사용한 분류 모델/프롬프트/임베딩 모델 버전을 기록합니다.
+    - 문서별로 기록된 버전이 현재와 다르면 내용이 같아도 다시 처리합니다.
+    - 원본에서 사라진 문서는 지우지 않고 deleted=True로 표시(툼스톤)하며, 모든 검색 경로에서 제외됩니다.
+    - 한 번 부여된 uid는 원본 키에 고정되어 내용이 바뀌어도 같은 문서를 덮어씁니다.
+    """
+    def __init__(self, manifest_path: str = None):
+        self.manifest_path = manifest_path or PipelineConfig.INGEST_MANIFEST_PATH
+        self.preprocessor = V3Preprocessor()
+        self.embedder = V3Embedder()
+        self.loader = V3Loader()
+
+    def pipeline_version(self) -> Dict[str, Any]:
+        """문서 처리 결과를 결정하는 모델/프롬프트 버전입니다."""
+        classifier = self.preprocessor._get_classifier()
+        return {
+            "classifier_model": classifier.model,
+            "prompt": fingerprint(classifier._get_system_prompt()),
+            "embedding_model": self.embedder.model_name,
+            "embedding_dimension": self.embedder.embedder.dimension,
+        }
+
+    def load_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_path):
+            return {"version": None, "documents": {}}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def plan(self, raw_items: List[Dict[str, Any]], manifest: Dict[str, Any], version: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        원본과 매니페스트를 비교해 처리 계획을 만듭니다.
+        반환값: new/changed(uid가 지정된 원본 사본), unchanged/restored/deleted(원본 키), version_changed
+        """
+        documents = manifest.get("documents", {})
+        version_id = fingerprint(version)
+        first_run = not documents
+
+        # 기존 uid와 겹치지 않는 다음 번호부터 신규 uid 부여
+        used = [int(entry["uid"].rsplit("_", 1)[-1]) for entry in documents.values()]
+        next_uid = max(used) + 1 if used else 0
+
+        plan = {"new": [], "changed": [], "unchanged": [], "restored": [], "deleted": [],
+                "version_changed": bool(documents) and manifest.get("version") != version}
+        seen, current = {}, set()
+        for position, raw_item in enumerate(raw_items):
+            key = source_key(raw_item)
+            # 같은 제목의 원본이 여러 개면 등장 순서로 구분
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key = f"{key}#{seen[key]}"
+            current.add(key)
+
+            item_hash = content_hash(raw_item)
+            entry = documents.get(key)
+            if entry is None:
+                # 매니페스트가 없는 첫 실행은 전체 실행과 같은 원본 위치 기반 uid(load_raw_items가 중복 제거 전 부여)를 써서 기존 문서를 덮어씀
+                uid = (raw_item.get("uid") or f"v3_{position:05d}") if first_run else f"v3_{next_uid:05d}"
+                if not first_run:
+                    next_uid += 1
+                plan["new"].append({**raw_item, "uid": uid, "_source_key": key, "_content_hash": item_hash})
+            elif entry.get("version") != version_id or entry["content_hash"] != item_hash:
+                plan["changed"].append({**raw_item, "uid": entry["uid"], "_source_key": key, "_content_hash": item_hash})
+            elif entry.get("deleted"):
+                plan["restored"].append(key)
+            else:
+                plan["unchanged"].append(key)
+
+        plan["deleted"] = [key for key, entry in documents.items() if key not in current and not entry.get("deleted")]
+        return plan
+
+    async def _process(self, pending: List[Dict[str, Any]], resume: bool) -> List[Dict[str, Any]]:
+        """대상 원본만 분류(체크포인트 포함) 후 임베딩하여 적재용 문서를 만듭니다."""
+        scheduler = self.preprocessor.build_scheduler(pending, resume=resume, checkpoint_name=os.path.join("v3", "incremental"))
+        docs = await scheduler.run(
+            pending, PipelineConfig.CLASSIFY_BATCH_SIZE, self.preprocessor._process_batch,
+            cost_fn=self.preprocessor._get_classifier().estimate_tokens, desc="V3 Incremental (classify)"
+        )
+        cache = self.preprocessor._get_classifier().cache
+        if cache is not None:
+            print(f"🗃️ {cache.summary()}")
+        if not docs:
+            return []
+
+        vectors, reused, requested = await self.embedder.embed_items(docs)
+        print(f"♻️ 임베딩 재사용 {reused}건, 신규 요청 {requested}건")
+
+        hashes = {raw["uid"]: raw["_content_hash"] for raw in pending}
+        for doc, vector in zip(docs, vectors):
+            doc["embedding"] = vector.tolist()
+            doc["content_hash"] = hashes[doc["uid"]]
+            doc["deleted"] = False
+        return docs
+
+    async def _set_deleted(self, uids: List[str], deleted: bool) -> int:
+        if not uids:
+            return 0
+        update = {"deleted": deleted}
+        if deleted:
+            update["deleted_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        result = await self.loader.collection.update_many({"uid": {"$in": uids}}, {"$set": update})
+        return result.modified_count
+
+    async def run(self, resume: bool = True, dry_run: bool = False) -> Dict[str, Any]:
+        print("🚀 V3 증분 적재 시작 (원본 해시 ↔ 매니페스트 비교)...")
+        raw_items = self.preprocessor.load_raw_items()
+        manifest = self.load_manifest()
+        version = self.pipeline_version()
+        plan = self.plan(raw_items, manifest, version)
+
+        if plan["version_changed"]:
+            print(f"♻️ 모델/프롬프트 버전이 변경되어 전체 문서를 다시 처리합니다: {manifest.get('version')} → {version}")
+        print(f"📊 원본 {len(raw_items)}건: 신규 {len(plan['new'])}, 변경 {len(plan['changed'])}, "
+              f"변경 없음 {len(plan['unchanged'])}, 복원 {len(plan['restored'])}, 삭제 {len(plan['deleted'])}")
+
+        report = {key: len(plan[key]) for key in ("new", "changed", "unchanged", "restored", "deleted")}
+        report.update({"documents": len(raw_items), "version_changed": plan["version_changed"], "dry_run": dry_run})
+        if dry_run:
+            return report
+
+        started = time.perf_counter()
+        documents = manifest.get("documents", {})
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        version_id = fingerprint(version)
+
+        # 1. 신규/변경 문서만 분류 → 임베딩 → 적재
+        pending = plan["new"] + plan["changed"]
+        docs = await self._process(pending, resume) if pending else []
+        if docs:
+            load_report = await BulkUpserter(self.loader.collection).upsert(
+                docs, key_fn=lambda item: {"uid": item["uid"]}, total=len(docs), desc="V3 Incremental (load)"
+            )
+            report["load"] = load_report.to_dict()
+            print(f"✨ {load_report.summary()}")
+            if load_report.failed:
+                # 어떤 문서가 실패했는지 알 수 없으므로 이번 처리분은 매니페스트에 반영하지 않음 (다음 실행에서 재시도)
+                print("⚠️ 적재 실패가 있어 이번 처리분은 매니페스트에 기록하지 않습니다.")
+                docs = []
+
+        processed = {doc["uid"] for doc in docs}
+        for raw in pending:
+            if raw["uid"] in processed:
+                documents[raw["_source_key"]] = {
+                    "uid": raw["uid"], "content_hash": raw["_content_hash"], "version": version_id,
+                    "ingested_at": now, "deleted": False,
+                }
+        report["processed"] = len(processed)
+        report["failed"] = len(pending) - len(processed)
+
+        # 2. 다시 나타난 원본은 재처리 없이 툼스톤만 해제, 사라진 원본은 툼스톤 처리
+        await self._set_deleted([documents[key]["uid"] for key in plan["restored"]], deleted=False)
+        for key in plan["restored"]:
+            documents[key].update({"deleted": False, "ingested_at": now})
+        await self._set_deleted([documents[key]["uid"] for key in plan["deleted"]], deleted=True)
+        for key in plan["deleted"]:
+            documents[key].update({"deleted": True, "deleted_at": now})
+
+        # 처리에 실패한 문서는 이전 해시/버전이 남아 있으므로 다음 실행에서 다시 처리됨
+        self._save_manifest({
+            "version": version,
+            "updated_at": now,
+            "documents": documents,
+        })
+
+        report["elapsed_s"] = round(time.perf_counter() - started, 2)
+        print(f"✨ V3 증분 적재 완료: 처리 {report['processed']}건, 실패 {report['failed']}건, "
+              f"툼스톤 {report['deleted']}건, 복원 {report['restored']}건 ({report['elapsed_s']}s)")
+        return report
@@ -1,10 +1,10 @@
 import os
-import pickle
 import asyncio
-from tqdm import tqdm
 from src.utils.mongodb import MongoDBManager
 from src.core.config import ZipsaConfig
 from src.pipelines.base import BaseLoader
+from src.pipelines.bulk import BulkUpserter
+from src.pipelines.artifact import EmbeddingArtifact
 
 class V3Loader(BaseLoader):
     def __init__(self):
@@ -16,23 +16,23 @@ class V3Loader(BaseLoader):
     async def run(self, input_path: str):
         print(f"🚀 V3 데이터 로드 시작: {input_path}에서 읽는 중...")
         
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"입력 파일을 찾을 수 없습니다: {input_path}")
-            
-        with open(input_path, "rb") as f:
-            items = pickle.load(f)
+        # 컬럼형 산출물: 벡터는 메모리 매핑, 문서는 한 건씩 읽어 적재 (전체를 메모리에 올리지 않음)
+        artifact = EmbeddingArtifact(input_path)
+        # Atlas 벡터 인덱스(numDimensions)와 차원이 다르면 적재 후 검색이 실패하므로 미리 중단
+        index_dimension = MongoDBManager.get_vector_field()["numDimensions"]
+        if artifact.dimension != index_dimension:
+            raise ValueError(
+                f"임베딩 산출물 차원({artifact.dimension})이 벡터 인덱스 설정({index_dimension})과 다릅니다. "
+                f"EMBEDDING_DIMENSIONS를 맞추거나 임베딩을 다시 생성하세요."
+            )
             
-        print(f"📊 {len(items)}개의 문서를 {self.policy.db_name}.{self.policy.collection_name}에 로드 중...")
+        print(f"📊 {len(artifact)}개의 문서를 {self.policy.db_name}.{self.policy.collection_name}에 로드 중...")
         
         # 인덱스 생성 필요시 매니저를 통하거나 존재 여부 확인 가능
-        # 현재는 업서트로 직접 로드 수행
-        
-        for item in tqdm(items, desc="MongoDB로 로드 중"):
-            # UID 기준으로 업서트 실행
-            await self.collection.update_one(
-                {"uid": item["uid"]},
-                {"$set": item},
-                upsert=True
-            )
+        # UID 기준 업서트를 청크 단위 unordered bulk_write로 적재
+        report = await BulkUpserter(self.collection).upsert(
+            artifact.iter_items(), key_fn=lambda item: {"uid": item["uid"]}, total=len(artifact), desc="MongoDB로 로드 중"
+        )
             
-        print("✨ V3 로드 완료!")
+        print(f"✨ V3 로드 완료! {report.summary()}")
+        return report
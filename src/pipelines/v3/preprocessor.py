@@ -2,10 +2,11 @@ import os
 import re
 import json
 from typing import List, Dict, Any
-from tqdm import tqdm
 from src.utils.text import tokenize_korean
-from src.core.config import ZipsaConfig
+from src.core.config import ZipsaConfig, PipelineConfig
 from src.pipelines.base import BasePreprocessor
+from src.pipelines.dedup import deduplicate_raw_items
+from src.pipelines.scheduler import build_classification_scheduler, fingerprint
 
 class V3Preprocessor(BasePreprocessor):
     def __init__(self):
@@ -23,17 +24,23 @@ class V3Preprocessor(BasePreprocessor):
         text = re.sub(r'\s+', ' ', text).strip()
         return text
 
-    async def _process_batch(self, batch: List[Dict[str, Any]], start_index: int) -> List[Dict[str, Any]]:
+    def _get_classifier(self):
         if self.classifier is None:
             from src.pipelines.v3.classifier import V3Classifier
             self.classifier = V3Classifier()
+        return self.classifier
 
+    async def _process_batch(self, batch: List[Dict[str, Any]], start_index: int) -> List[Dict[str, Any]]:
         # 1. LLM 분류 실행
-        metadata_results = await self.classifier.classify_batch(batch)
+        metadata_results = await self._get_classifier().classify_batch(batch)
+        # 결과 누락(API 오류/개수 불일치)은 스케줄러가 재시도하도록 예외로 전달
+        if len(metadata_results) != len(batch):
+            raise RuntimeError(f"분류 결과 {len(metadata_results)}건 / 입력 {len(batch)}건 (시작 인덱스 {start_index})")
         
         processed_batch = []
         for i, (raw_item, meta) in enumerate(zip(batch, metadata_results)):
-            uid = f"v3_{start_index + i:05d}"
+            # uid는 load_raw_items(원본 위치) 또는 증분 적재(원본 키)가 미리 지정해서 넘김 (없으면 입력 위치 기반)
+            uid = raw_item.get("uid") or f"v3_{start_index + i:05d}"
             
             # 텍스트 클리닝
             clean_content = self.clean_text(raw_item.get("text", ""))
@@ -58,9 +65,7 @@ class V3Preprocessor(BasePreprocessor):
             processed_batch.append(doc)
         return processed_batch
 
-    async def run(self, limit: int = None) -> str:
-        print("🚀 V3 순수 전처리 시작 (Raw -> LLM)...")
-        
+    def load_raw_items(self, limit: int = None) -> List[Dict[str, Any]]:
         raw_path = "data/raw/bemypet_catlab.json"
         if not os.path.exists(raw_path):
             raise FileNotFoundError(f"원본 데이터를 찾을 수 없습니다: {raw_path}")
@@ -70,20 +75,37 @@ class V3Preprocessor(BasePreprocessor):
 
         if limit:
             raw_items = raw_items[:limit]
+        # 크롤러 재개 시 중복 수집된 문서를 분류/임베딩 전에 제거 (uid는 제거 전 원본 위치로 고정)
+        return deduplicate_raw_items(raw_items, uid_fn=lambda i: f"v3_{i:05d}")
+
+    def build_scheduler(self, raw_items: List[Dict[str, Any]], resume: bool = True, checkpoint_name: str = "v3"):
+        """입력/배치 크기/모델/프롬프트가 같을 때만 체크포인트를 재사용하는 분류 스케줄러를 생성합니다."""
+        classifier = self._get_classifier()
+        input_fingerprint = fingerprint(raw_items, PipelineConfig.CLASSIFY_BATCH_SIZE, classifier.model, classifier._get_system_prompt())
+        return build_classification_scheduler(checkpoint_name, input_fingerprint, resume=resume)
+
+    async def run(self, limit: int = None, resume: bool = True) -> str:
+        print("🚀 V3 순수 전처리 시작 (Raw -> LLM)...")
+        
+        raw_items = self.load_raw_items(limit)
 
-        processed_items = []
-        batch_size = 5 # LLM 비용 및 속도 제한 관리
+        batch_size = PipelineConfig.CLASSIFY_BATCH_SIZE # LLM 비용 및 속도 제한 관리
         
-        print(f"📊 {len(raw_items)}개의 문서를 처리 중 (배치 크기: {batch_size})...")
+        print(f"📊 {len(raw_items)}개의 문서를 처리 중 (배치 크기: {batch_size}, 동시 배치: {PipelineConfig.CLASSIFY_MAX_IN_FLIGHT})...")
 
-        for i in tqdm(range(0, len(raw_items), batch_size), desc="V3 Preprocessing"):
-            batch = raw_items[i : i + batch_size]
-            processed_batch = await self._process_batch(batch, i)
-            processed_items.extend(processed_batch)
+        scheduler = self.build_scheduler(raw_items, resume=resume)
+        processed_items = await scheduler.run(
+            raw_items, batch_size, self._process_batch,
+            cost_fn=self._get_classifier().estimate_tokens, desc="V3 Preprocessing"
+        )
+        # 일부 배치가 빠진 결과를 다음 단계(임베딩)가 전체로 착각하지 않도록 저장하지 않고 실패 처리
+        scheduler.raise_if_failed("V3 Preprocessing")
 
         os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
         with open(self.output_path, "w", encoding="utf-8") as f:
             json.dump(processed_items, f, ensure_ascii=False, indent=2)
             
+        if self._get_classifier().cache is not None:
+            print(f"🗃️ {self._get_classifier().cache.summary()}")
         print(f"✨ {len(processed_items)}개의 항목을 {self.output_path}에 저장했습니다.")
         return self.output_path
@@ -45,6 +45,25 @@ class BreedStats(BaseModel):
     stranger_friendly: Optional[int] = 0
     vocalisation: Optional[int] = 0
 
+# stats 필드 -> 벡터/키워드 인덱스에 선언된 filter_* 필드 매핑
+STAT_FILTER_FIELDS = {
+    "shedding_level": "filter_shedding",
+    "energy_level": "filter_energy",
+    "intelligence": "filter_intelligence",
+    "affection_level": "filter_affection",
+    "child_friendly": "filter_child_friendly",
+    "indoor": "filter_indoor",
+    "lap": "filter_lap",
+    "hypoallergenic": "filter_hypoallergenic",
+    "adaptability": "filter_adaptability",
+    "dog_friendly": "filter_dog_friendly",
+    "grooming": "filter_grooming",
+    "health_issues": "filter_health_issues",
+    "social_needs": "filter_social_needs",
+    "stranger_friendly": "filter_stranger_friendly",
+    "vocalisation": "filter_vocalisation",
+}
+
 class StoredBreedV3(BaseModel):
     """V3 품종 컬렉션용 스키마입니다."""
     uid: str = Field(description="고유 ID (예: breed_abys)")
@@ -0,0 +1,236 @@
+import time
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Any
+from src.core.config import PipelineConfig
+from src.pipelines.bulk import BulkUpserter
+from src.pipelines.v3.preprocessor import V3Preprocessor
+from src.pipelines.v3.embedder import V3Embedder
+from src.pipelines.v3.loader import V3Loader
+
+# 단계 종료를 알리는 큐 마커
+_DONE = object()
+
+
+@dataclass
+class StageMetrics:
+    """단계별 처리량과 출력 큐 깊이 지표입니다."""
+    name: str
+    items: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    queue_max_depth: int = 0
+    queue_depth_sum: int = 0
+    queue_samples: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at or time.perf_counter()
+        return end - self.started_at if self.started_at else 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+    def sample_queue(self, depth: int):
+        self.queue_max_depth = max(self.queue_max_depth, depth)
+        self.queue_depth_sum += depth
+        self.queue_samples += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        report = asdict(self)
+        report.update({
+            "elapsed_s": round(self.elapsed, 2),
+            "docs_per_sec": round(self.throughput, 1),
+            "queue_avg_depth": round(self.queue_depth_sum / self.queue_samples, 1) if self.queue_samples else 0.0,
+        })
+        for key in ("started_at", "finished_at", "queue_depth_sum", "queue_samples"):
+            report.pop(key)
+        return report
+
+
+class V3StreamingPipeline:
+    """
+    전처리 → 임베딩 → 적재를 파일 경유 없이 asyncio 큐로 연결한 스트리밍 모드입니다.
+    분류된 문서는 즉시 임베딩 배치로, 임베딩된 문서는 즉시 bulk upsert로 흘러갑니다.
+
+    각 큐는 queue_size 문서로 제한되어 다음 단계가 밀리면 앞 단계가 멈춥니다 (백프레셔).
+    따라서 메모리 사용량은 말뭉치 크기가 아니라 큐 크기 + 단계별 동시 배치 수에 비례합니다.
+    분류 결과는 배치 단위 체크포인트에 기록되므로 중단 후 재실행 시 LLM 호출 없이 복원됩니다.
+    """
+    def __init__(self, queue_size: int = None, embed_batch_size: int = None, embed_concurrency: int = None,
+                 monitor_interval: float = 5.0):
+        self.queue_size = queue_size or PipelineConfig.STREAM_QUEUE_SIZE
+        self.embed_batch_size = embed_batch_size or PipelineConfig.STREAM_EMBED_BATCH_SIZE
+        self.embed_concurrency = embed_concurrency or PipelineConfig.STREAM_EMBED_CONCURRENCY
+        self.monitor_interval = monitor_interval
+
+        self.preprocessor = V3Preprocessor()
+        self.embedder = V3Embedder()
+        self.loader = V3Loader()
+
+        self.metrics = {name: StageMetrics(name) for name in ("classify", "embed", "load")}
+        self.reused = 0
+        self.classify_stats: Dict[str, int] = {}
+
+    async def _classify_stage(self, raw_items: List[Dict[str, Any]], out_queue: asyncio.Queue, resume: bool):
+        metrics = self.metrics["classify"]
+        metrics.started_at = time.perf_counter()
+        scheduler = self.preprocessor.build_scheduler(raw_items, resume=resume)
+
+        async def _sink(start: int, docs: List[Dict[str, Any]]):
+            metrics.batches += 1
+            for doc in docs:
+                await out_queue.put(doc)
+                metrics.items += 1
+
+        try:
+            await scheduler.run(
+                raw_items, PipelineConfig.CLASSIFY_BATCH_SIZE, self.preprocessor._process_batch,
+                cost_fn=self.preprocessor._get_classifier().estimate_tokens, desc="V3 Stream (classify)", sink=_sink
+            )
+        finally:
+            # 최종 실패한 분류 배치는 스트림에서 빠지므로 리포트에 기록 (run_stream.py가 0이 아닌 코드로 종료)
+            self.classify_stats = dict(scheduler.stats)
+            metrics.finished_at = time.perf_counter()
+            await out_queue.put(_DONE)
+
+    async def _embed_stage(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        metrics = self.metrics["embed"]
+        metrics.started_at = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+        tasks = set()
+        failures: List[BaseException] = []
+        stage = asyncio.current_task()
+
+        def _on_done(task: asyncio.Task):
+            tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                # 배치 하나라도 실패하면 문서가 빠진 채 성공으로 끝나지 않도록 단계 전체를 즉시 중단
+                failures.append(task.exception())
+                stage.cancel()
+
+        async def _embed_and_forward(batch: List[Dict[str, Any]]):
+            try:
+                started = time.perf_counter()
+                vectors, reused, _ = await self.embedder.embed_items(batch)
+                metrics.busy_seconds += time.perf_counter() - started
+                self.reused += reused
+                for doc, vector in zip(batch, vectors):
+                    doc["embedding"] = vector.tolist()
+                    await out_queue.put(doc)
+                metrics.items += len(batch)
+                metrics.batches += 1
+            finally:
+                semaphore.release()
+
+        done = False
+        try:
+            while not done:
+                # 배치가 찰 때까지 모으되, 앞 단계가 느리면 모인 만큼 바로 보냄
+                batch = []
+                item = await in_queue.get()
+                while item is not _DONE:
+                    batch.append(item)
+                    if len(batch) >= self.embed_batch_size or in_queue.empty():
+                        break
+                    item = in_queue.get_nowait()
+                done = item is _DONE
+                if batch:
+                    await semaphore.acquire()
+                    task = asyncio.create_task(_embed_and_forward(batch))
+                    tasks.add(task)
+                    task.add_done_callback(_on_done)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            # 실패한 배치 때문에 중단된 경우 원래 예외로 run()의 실패 경로(나머지 단계 취소)를 탐
+            if failures:
+                raise failures[0]
+            raise
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            metrics.finished_at = time.perf_counter()
+            if not failures:
+                await out_queue.put(_DONE)
+
+    async def _load_stage(self, in_queue: asyncio.Queue):
+        metrics = self.metrics["load"]
+        metrics.started_at = time.perf_counter()
+
+        async def _drain():
+            while True:
+                item = await in_queue.get()
+                if item is _DONE:
+                    return
+                metrics.items += 1
+                yield item
+
+        # 스트리밍 모드에서는 임베딩 배치 크기 단위로 바로 적재
+        upserter = BulkUpserter(self.loader.collection, chunk_size=self.embed_batch_size)
+        report = await upserter.upsert(_drain(), key_fn=lambda item: {"uid": item["uid"]}, desc="V3 Stream (load)")
+        metrics.batches = report.batches
+        metrics.busy_seconds = report.seconds
+        metrics.finished_at = time.perf_counter()
+        return report
+
+    async def _monitor(self, queues: Dict[str, asyncio.Queue]):
+        """출력 큐 깊이를 주기적으로 샘플링하고 단계별 처리량을 출력합니다."""
+        while True:
+            await asyncio.sleep(self.monitor_interval)
+            for stage, queue in queues.items():
+                self.metrics[stage].sample_queue(queue.qsize())
+            print("📡 [STREAM]: " + " | ".join(
+                f"{m.name} {m.items}건 ({m.throughput:.1f}/s)" for m in self.metrics.values()
+            ) + " | 큐 " + ", ".join(f"{stage}→{queue.qsize()}/{queue.maxsize}" for stage, queue in queues.items()))
+
+    async def run(self, limit: int = None, resume: bool = True) -> Dict[str, Any]:
+        print(f"🚀 V3 스트리밍 파이프라인 시작 (큐 {self.queue_size}건, 임베딩 배치 {self.embed_batch_size}건)...")
+        raw_items = self.preprocessor.load_raw_items(limit)
+        started = time.perf_counter()
+
+        classified: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        embedded: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        monitor = asyncio.create_task(self._monitor({"classify": classified, "embed": embedded}))
+        stages = [
+            asyncio.create_task(self._classify_stage(raw_items, classified, resume)),
+            asyncio.create_task(self._embed_stage(classified, embedded)),
+            asyncio.create_task(self._load_stage(embedded)),
+        ]
+        try:
+            _, _, load_report = await asyncio.gather(*stages)
+        except Exception:
+            # 한 단계가 실패하면 나머지 단계도 중단 (큐에서 영원히 대기하지 않도록)
+            for task in stages:
+                task.cancel()
+            raise
+        finally:
+            monitor.cancel()
+
+        elapsed = time.perf_counter() - started
+        embedded_count = self.metrics["embed"].items
+        report = {
+            "documents": len(raw_items),
+            "elapsed_s": round(elapsed, 2),
+            "docs_per_sec": round(load_report.total / elapsed, 1) if elapsed else 0.0,
+            "embedding_reuse_ratio": round(self.reused / embedded_count, 4) if embedded_count else 0.0,
+            "stages": {name: m.to_dict() for name, m in self.metrics.items()},
+            "classify": self.classify_stats,
+            "failed_batches": self.classify_stats.get("failed", 0),
+            "load": load_report.to_dict(),
+        }
+        print(f"✨ V3 스트리밍 완료: {load_report.summary()}")
+        if report["failed_batches"]:
+            print(f"⚠️ 분류 배치 {report['failed_batches']}개가 실패해 적재된 문서가 원본({len(raw_items)}건)보다 적습니다. "
+                  "같은 명령을 다시 실행하면 실패한 배치만 재처리합니다.")
+        cache = self.preprocessor._get_classifier().cache
+        if cache is not None:
+            report["classification_cache"] = dict(cache.stats)
+            print(f"🗃️ {cache.summary()}")
+        for m in self.metrics.values():
+            stats = m.to_dict()
+            print(f"   - {m.name:<8} {m.items}건, {stats['docs_per_sec']}/s, 출력 큐 최대 {m.queue_max_depth} / 평균 {stats['queue_avg_depth']}")
+        return report
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import random
+import asyncio
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from src.embeddings.cache import normalize_query_text
+from src.embeddings.profile import truncate_dimensions
+
+DEFAULT_GOLDEN_PATH = "data/v3/golden_dataset.json"
+DEFAULT_K_VALUES = (1, 3, 5, 10)
+LATENCY_PERCENTILES = (50, 95, 99)
+
+# 키워드 정답 판정 시 확인하는 문서 필드 (노트북 평가 로직과 동일)
+RELEVANCE_FIELDS = ("name_ko", "title_refined", "text")
+
+
+def load_golden_dataset(path: str = DEFAULT_GOLDEN_PATH, sample_size: int = None, seed: int = None) -> List[Dict[str, Any]]:
+    """골든 데이터셋을 로드합니다. sample_size가 주어지면 seed 기준으로 재현 가능한 표본을 추출합니다."""
+    with open(path, "r", encoding="utf-8") as f:
+        dataset = [item for item in json.load(f) if item.get("query")]
+    if sample_size and sample_size < len(dataset):
+        dataset = random.Random(seed).sample(dataset, sample_size)
+    return dataset
+
+
+def default_query_vectors_path(dataset_path: str = DEFAULT_GOLDEN_PATH) -> str:
+    """골든 데이터셋 옆에 두는 질의 벡터 파일 경로 (예: golden_dataset.query_vectors.npz)."""
+    return os.path.splitext(dataset_path)[0] + ".query_vectors.npz"
+
+
+def find_relevant_ranks(results: List[Dict[str, Any]], item: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    """
+    정답 문서의 순위(1부터, 없으면 None)를 두 기준으로 반환합니다.
+    - source: uid가 source_doc_id와 일치하는 원본 문서의 순위 (recall@k 기준)
+    - keyword: 원본 문서이거나 expected_keyword가 이름/제목/본문에 포함된 첫 문서의 순위 (hit_rate@k/MRR 기준, 노트북 평가와 동일)
+    """
+    doc_id = item.get("source_doc_id")
+    target = (item.get("expected_keyword") or item.get("target") or "").lower()
+    ranks = {"source": None, "keyword": None}
+    for rank, doc in enumerate(results, start=1):
+        is_source = bool(doc_id) and doc.get("uid") == doc_id
+        if is_source and ranks["source"] is None:
+            ranks["source"] = rank
+        if ranks["keyword"] is None:
+            content = " ".join(str(doc.get(field) or "") for field in RELEVANCE_FIELDS).lower()
+            if is_source or (target and target in content):
+                ranks["keyword"] = rank
+    return ranks
+
+
+class RecordedRetriever:
+    """
+    녹화된 검색 결과를 재생하는 리트리버입니다. (DB/API 없이 오프라인 벤치마크용)
+    fixture는 {"retriever": 이름, "results": {"<specialist>\\t<query>": [{"uid", "title_refined", ...}, ...]}} 형식입니다.
+    """
+    def __init__(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        self.name = payload.get("retriever", os.path.splitext(os.path.basename(path))[0])
+        self.results: Dict[str, List[Dict[str, Any]]] = payload["results"]
+
+    @staticmethod
+    def key(query: str, specialist: str = None) -> str:
+        return f"{specialist or ''}\t{query}"
+
+    async def search(self, query: str, specialist: str = None, limit: int = 3, filters: dict = None, **kwargs):
+        return self.results.get(self.key(query, specialist), [])[:limit]
+
+    @classmethod
+    async def record(cls, retriever, dataset: List[Dict[str, Any]], path: str, name: str,
+                     limit: int = max(DEFAULT_K_VALUES), concurrency: int = 8):
+        """실제 리트리버의 결과를 판정에 필요한 필드만 남겨 fixture 파일로 저장합니다."""
+        semaphore = asyncio.Semaphore(concurrency)
+        keep = ("uid", "score", "score_type") + RELEVANCE_FIELDS
+
+        async def _one(item):
+            async with semaphore:
+                docs = await retriever.search(item["query"], specialist=item.get("specialist"), limit=limit)
+            return cls.key(item["query"], item.get("specialist")), [
+                {k: doc[k] for k in keep if k in doc} for doc in docs
+            ]
+
+        pairs = await asyncio.gather(*(_one(item) for item in dataset))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"retriever": name, "limit": limit, "results": dict(pairs)}, f, ensure_ascii=False)
+        return len(pairs)
+
+
+class RecordedQueryEmbedder:
+    """
+    미리 계산해 둔 질의 벡터를 재생하는 질의 임베더입니다. (임베딩 API/로컬 모델 없이 vector/hybrid 오프라인 벤치마크용)
+    리트리버가 쓰는 embed_query/dimension만 제공하며 문서 임베딩은 하지 않으므로 BaseEmbedder를 상속하지 않습니다.
+    파일은 queries(정규화된 질의), vectors(float32 행렬), model_name을 담은 npz이며 record()로 만듭니다.
+    녹화된 질의에 없는 문자열은 ValueError를 발생시킵니다 (네트워크로 폴백하지 않음).
+    """
+    def __init__(self, queries: List[str], vectors: np.ndarray, model_name: str, precision: str = "float32"):
+        self.dimension = int(vectors.shape[1])
+        self.precision = precision
+        self.model_name = model_name
+        self.vectors = vectors
+        self._rows = {query: row for row, query in enumerate(queries)}
+
+    @classmethod
+    def load(cls, path: str) -> "RecordedQueryEmbedder":
+        with np.load(path, allow_pickle=False) as payload:
+            return cls(payload["queries"].tolist(), payload["vectors"].astype(np.float32), str(payload["model_name"]))
+
+    def with_profile(self, profile) -> "RecordedQueryEmbedder":
+        """
+        녹화된 벡터를 프로파일 차원으로 줄인 사본을 반환합니다 (앞쪽 차원 + 재정규화, VectorIndex.with_profile과 동일).
+        text-embedding-3-*의 API dimensions 파라미터와 같은 결과이므로 프로파일 비교도 오프라인으로 할 수 있습니다.
+        """
+        vectors = self.vectors
+        if profile.dimension != self.dimension:
+            vectors = truncate_dimensions(vectors, profile.dimension)
+        queries = sorted(self._rows, key=self._rows.get)
+        return RecordedQueryEmbedder(queries, vectors, self.model_name, profile.precision)
+
+    async def embed_query(self, text: str) -> List[float]:
+        row = self._rows.get(normalize_query_text(text))
+        if row is None:
+            raise ValueError(f"녹화된 질의 벡터가 없습니다 (--query-vectors record로 다시 녹화 필요): {text[:50]}")
+        return self.vectors[row].tolist()
+
+    @staticmethod
+    async def record(embedder, dataset: List[Dict[str, Any]], path: str, concurrency: int = 8) -> int:
+        """데이터셋 질의를 실제 임베더로 임베딩해 npz 파일로 저장합니다. 반환값: 저장한 질의 수"""
+        # 키는 정규화된 질의, 임베딩은 실제 검색과 같도록 원문 질의로 계산
+        originals: Dict[str, str] = {}
+        for item in dataset:
+            originals.setdefault(normalize_query_text(item["query"]), item["query"])
+        queries = sorted(originals)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(query):
+            async with semaphore:
+                return await embedder.embed_query(originals[query])
+
+        vectors = np.asarray(await asyncio.gather(*(_one(query) for query in queries)), dtype=np.float32)
+        model_name = getattr(embedder, "model_name", embedder.__class__.__name__)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # np.savez는 확장자가 없으면 .npz를 붙이므로 파일 객체로 저장해 경로를 그대로 유지
+        with open(path, "wb") as f:
+            np.savez(f, queries=np.array(queries), vectors=vectors, model_name=np.array(model_name))
+        return len(queries)
+
+
+def _summarize(records: List[Dict[str, Any]], k_values, wall_time: float = None) -> Dict[str, Any]:
+    """쿼리별 기록을 품질(recall@k/hit@k/MRR)과 지연(p50/p95/p99) 지표로 집계합니다."""
+    total = len(records)
+    if total == 0:
+        return {"queries": 0}
+    latencies = np.array([r["latency_ms"] for r in records], dtype=np.float64)
+
+    summary: Dict[str, Any] = {"queries": total}
+    for k in k_values:
+        # 골든셋은 쿼리당 원본 문서가 1건이므로 recall@k = 상위 k건 안에 원본 문서가 포함된 쿼리 비율
+        summary[f"recall@{k}"] = round(sum(1 for r in records if r["source_rank"] and r["source_rank"] <= k) / total, 4)
+        summary[f"hit_rate@{k}"] = round(sum(1 for r in records if r["rank"] and r["rank"] <= k) / total, 4)
+    summary["mrr"] = round(sum(1.0 / r["rank"] for r in records if r["rank"]) / total, 4)
+    summary["errors"] = sum(1 for r in records if r.get("error"))
+    summary["partial"] = sum(1 for r in records if r.get("partial"))
+    summary["latency_ms"] = {
+        f"p{p}": round(float(np.percentile(latencies, p)), 2) for p in LATENCY_PERCENTILES
+    }
+    summary["latency_ms"]["mean"] = round(float(latencies.mean()), 2)
+    if wall_time:
+        summary["throughput_qps"] = round(total / wall_time, 2)
+    return summary
+
+
+async def run_benchmark(retriever, dataset: List[Dict[str, Any]], name: str, k_values=DEFAULT_K_VALUES,
+                        concurrency: int = 8, use_specialist: bool = True) -> Dict[str, Any]:
+    """
+    골든 데이터셋을 리트리버에 동시 실행(최대 concurrency건)하고 전체/전문가별 지표를 반환합니다.
+    개별 쿼리 실패는 결과 0건으로 기록되며 errors로 집계됩니다.
+    """
+    k_values = sorted(set(k_values))
+    limit = max(k_values)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(item):
+        specialist = item.get("specialist") if use_specialist else None
+        async with semaphore:
+            start = time.perf_counter()
+            error = None
+            try:
+                results = await retriever.search(item["query"], specialist=specialist, limit=limit)
+            except Exception as e:
+                results, error = [], f"{type(e).__name__}: {e}"
+            latency_ms = (time.perf_counter() - start) * 1000
+        ranks = find_relevant_ranks(results, item)
+        return {
+            "query": item["query"],
+            "specialist": item.get("specialist") or "Unknown",
+            "rank": ranks["keyword"],
+            "source_rank": ranks["source"],
+            "latency_ms": latency_ms,
+            "partial": bool(getattr(results, "partial", False)),
+            "error": error,
+        }
+
+    wall_start = time.perf_counter()
+    records = await asyncio.gather(*(_one(item) for item in dataset))
+    wall_time = time.perf_counter() - wall_start
+
+    by_specialist = defaultdict(list)
+    for record in records:
+        by_specialist[record["specialist"]].append(record)
+
+    return {
+        "retriever": name,
+        "concurrency": concurrency,
+        "k_values": k_values,
+        "wall_time_s": round(wall_time, 3),
+        "overall": _summarize(records, k_values, wall_time),
+        "per_specialist": {
+            specialist: _summarize(items, k_values) for specialist, items in sorted(by_specialist.items())
+        },
+        "misses": [
+            {"query": r["query"], "specialist": r["specialist"], "error": r["error"]}
+            for r in records if r["rank"] is None
+        ],
+    }
@@ -0,0 +1,175 @@
+import os
+import json
+import threading
+from collections import Counter
+from typing import List, Dict, Any
+import numpy as np
+from src.retrieval.filters import matches_filters, ACTIVE_FILTER
+
+# 검색 결과로 돌려줄 때 제외하는 대용량 필드
+_EXCLUDED_FIELDS = ("embedding", "tokenized_text")
+
+
+class BM25Index:
+    """
+    tokenized_text(Kiwi 형태소 분석 결과)를 대상으로 하는 인프로세스 BM25 역색인입니다.
+    포스팅은 CSR 형태의 NumPy 배열(indptr / doc_ids / tfs)로 저장하며, 점수 계산은 용어 단위로 벡터화됩니다.
+
+    디스크 포맷 (디렉토리):
+        postings.npz  - indptr, doc_ids, tfs, doc_len, idf
+        vocab.json    - 용어 리스트 (인덱스 = 용어 id)
+        docs.json     - 검색 결과로 반환할 문서 (embedding / tokenized_text 제외)
+        meta.json     - k1, b, avgdl, 문서 수
+    """
+    _loaded: Dict[str, "BM25Index"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, vocab: Dict[str, int], indptr: np.ndarray, doc_ids: np.ndarray, tfs: np.ndarray,
+                 doc_len: np.ndarray, idf: np.ndarray, docs: List[Dict[str, Any]], k1: float = 1.2, b: float = 0.75):
+        self.vocab = vocab
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.idf = idf
+        self.docs = docs
+        self.k1 = k1
+        self.b = b
+        self.avgdl = float(doc_len.mean()) if len(doc_len) else 0.0
+        # 문서 길이 정규화 항은 질의와 무관하므로 미리 계산
+        self._norm = (k1 * (1 - b + b * doc_len / self.avgdl)).astype(np.float32) if self.avgdl else np.zeros_like(doc_len)
+
+    @classmethod
+    def build(cls, docs: List[Dict[str, Any]], k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        """tokenized_text가 포함된 문서 리스트로부터 인덱스를 생성합니다."""
+        vocab: Dict[str, int] = {}
+        term_postings: List[List[tuple]] = []
+        doc_len = np.zeros(len(docs), dtype=np.float32)
+        stored_docs = []
+
+        for doc_id, doc in enumerate(docs):
+            tokens = (doc.get("tokenized_text") or "").split()
+            doc_len[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_id = vocab.setdefault(term, len(vocab))
+                if term_id == len(term_postings):
+                    term_postings.append([])
+                term_postings[term_id].append((doc_id, tf))
+
+            stored = {k: v for k, v in doc.items() if k not in _EXCLUDED_FIELDS}
+            # 하이브리드 RRF 결합 키로 사용할 식별자 보장
+            stored.setdefault("_id", stored.get("uid", str(doc_id)))
+            stored["_id"] = str(stored["_id"])
+            stored_docs.append(stored)
+
+        indptr = np.zeros(len(term_postings) + 1, dtype=np.int64)
+        for term_id, postings in enumerate(term_postings):
+            indptr[term_id + 1] = indptr[term_id] + len(postings)
+        doc_ids = np.empty(indptr[-1], dtype=np.int32)
+        tfs = np.empty(indptr[-1], dtype=np.float32)
+        for term_id, postings in enumerate(term_postings):
+            start, end = indptr[term_id], indptr[term_id + 1]
+            doc_ids[start:end] = [p[0] for p in postings]
+            tfs[start:end] = [p[1] for p in postings]
+
+        # Lucene BM25 IDF
+        n_docs = len(docs)
+        df = np.diff(indptr).astype(np.float32)
+        idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        return cls(vocab, indptr, doc_ids, tfs, doc_len, idf, stored_docs, k1=k1, b=b)
+
+    @classmethod
+    def from_json(cls, path: str, **kwargs) -> "BM25Index":
+        """전처리 결과 JSON(예: data/v3/processed.json)으로부터 인덱스를 생성합니다."""
+        with open(path, "r", encoding="utf-8") as f:
+            docs = json.load(f)
+        return cls.build(docs, **kwargs)
+
+    @classmethod
+    async def from_collection(cls, collection, query: dict = None, **kwargs) -> "BM25Index":
+        """MongoDB 컬렉션 문서로부터 인덱스를 생성합니다 (임베딩 필드는 가져오지 않음)."""
+        docs = await collection.find(query or ACTIVE_FILTER, {"embedding": 0}).to_list(None)
+        return cls.build(docs, **kwargs)
+
+    def save(self, path: str):
+        """인덱스를 디렉토리 포맷으로 저장합니다."""
+        os.makedirs(path, exist_ok=True)
+        np.savez(
+            os.path.join(path, "postings.npz"),
+            indptr=self.indptr, doc_ids=self.doc_ids, tfs=self.tfs, doc_len=self.doc_len, idf=self.idf
+        )
+        terms = [None] * len(self.vocab)
+        for term, term_id in self.vocab.items():
+            terms[term_id] = term
+        with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(terms, f, ensure_ascii=False)
+        with open(os.path.join(path, "docs.json"), "w", encoding="utf-8") as f:
+            json.dump(self.docs, f, ensure_ascii=False, default=str)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"k1": self.k1, "b": self.b, "avgdl": self.avgdl, "num_docs": len(self.docs)}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """save()로 저장한 인덱스를 로드합니다."""
+        if not os.path.exists(os.path.join(path, "postings.npz")):
+            raise FileNotFoundError(
+                f"BM25 인덱스를 찾을 수 없습니다: {path} (scripts/build_bm25_index.py로 먼저 생성하세요)"
+            )
+        with np.load(os.path.join(path, "postings.npz")) as arrays:
+            indptr, doc_ids, tfs = arrays["indptr"], arrays["doc_ids"], arrays["tfs"]
+            doc_len, idf = arrays["doc_len"], arrays["idf"]
+        with open(os.path.join(path, "vocab.json"), "r", encoding="utf-8") as f:
+            vocab = {term: i for i, term in enumerate(json.load(f))}
+        with open(os.path.join(path, "docs.json"), "r", encoding="utf-8") as f:
+            docs = json.load(f)
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(vocab, indptr, doc_ids, tfs, doc_len, idf, docs, k1=meta["k1"], b=meta["b"])
+
+    @classmethod
+    def load_shared(cls, path: str) -> "BM25Index":
+        """경로별로 프로세스에서 한 번만 로드되는 공유 인덱스를 반환합니다."""
+        with cls._lock:
+            if path not in cls._loaded:
+                cls._loaded[path] = cls.load(path)
+            return cls._loaded[path]
+
+    def score(self, query_tokens: List[str]) -> np.ndarray:
+        """질의 토큰에 대한 전체 문서 BM25 점수 벡터를 계산합니다."""
+        scores = np.zeros(len(self.docs), dtype=np.float32)
+        for term, qtf in Counter(query_tokens).items():
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            ids = self.doc_ids[start:end]
+            tf = self.tfs[start:end]
+            # 한 용어의 포스팅 내 문서 id는 중복이 없으므로 팬시 인덱싱 누적이 안전함
+            scores[ids] += qtf * self.idf[term_id] * tf * (self.k1 + 1) / (tf + self._norm[ids])
+        return scores
+
+    def search(self, query_tokens: List[str], specialist: str = None, filters: dict = None,
+               limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        BM25 상위 문서를 반환합니다. specialist/filters는 Atlas 검색과 동일한 의미로 적용됩니다.
+        필터는 점수가 있는 후보에만 평가하므로 전체 문서를 순회하지 않습니다.
+        """
+        scores = self.score(query_tokens)
+        candidates = np.flatnonzero(scores)
+        if len(candidates) == 0:
+            return []
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        results = []
+        for doc_id in ordered:
+            doc = self.docs[doc_id]
+            if not matches_filters(doc, specialist, filters):
+                continue
+            result = dict(doc)
+            result["score"] = float(scores[doc_id])
+            result["score_type"] = "keyword"
+            results.append(result)
+            if len(results) >= limit:
+                break
+        return results
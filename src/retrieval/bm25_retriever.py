@@ -1,28 +1,49 @@
 from langsmith import traceable
-from src.core.config import ZipsaConfig
+from src.core.config import ZipsaConfig, RetrievalConfig
 from src.utils.mongodb import MongoDBManager
 from src.utils.text import tokenize_korean
+from src.retrieval.bm25_index import BM25Index
+from src.retrieval.filters import TOMBSTONE_CLAUSE
+from src.retrieval.projection import resolve_fields, build_projection, project_doc
 
 class BM25Retriever:
-    def __init__(self, version="v2", collection_name=None):
+    def __init__(self, version="v2", collection_name=None, backend: str = None, index_path: str = None,
+                 fields: list = None, include_vectors: bool = False):
+        self.version = version
         self.policy = ZipsaConfig.get_policy(version)
-        if version == "v1":
-            self.db = MongoDBManager.get_v1_db()
-        elif version == "v3":
-            self.db = MongoDBManager.get_v3_db()
-        else:
-            self.db = MongoDBManager.get_v2_db()
         
         self.collection_name = collection_name or self.policy.collection_name
-        self.collection = self.db[self.collection_name]
+
+        # "atlas": Atlas $search, "local": 인프로세스 BM25 인덱스 (CI/폐쇄망용)
+        self.backend = (backend or RetrievalConfig.KEYWORD_BACKEND).lower()
+        self.local_index = BM25Index.load_shared(index_path or RetrievalConfig.local_index_path("bm25", version, self.collection_name)) if self.backend == "local" else None
+
+        # 반환 필드 집합 (기본: 컬렉션별 선언 필드). embedding은 include_vectors=True일 때만 포함 (Atlas 백엔드 한정)
+        self.fields = resolve_fields(self.collection_name, fields)
+        self.include_vectors = include_vectors
+
+    @property
+    def collection(self):
+        # 공유 클라이언트 레지스트리에서 현재 이벤트 루프에 맞는 컬렉션을 조회
+        return MongoDBManager.get_db(self.version)[self.collection_name]
 
     @traceable(name="BM25 Search")
-    async def search(self, query: str, specialist: str = None, limit: int = 3, filters: dict = None):
-        """메타데이터 필터링을 포함한 Atlas 검색 (BM25)을 처리합니다."""
+    async def search(self, query: str, specialist: str = None, limit: int = 3, filters: dict = None,
+                     fields: list = None, include_vectors: bool = None):
+        """메타데이터 필터링을 포함한 Atlas 검색 (BM25)을 처리합니다. fields/include_vectors로 호출 단위 프로젝션을 지정할 수 있습니다."""
         print(f"🔍 [BM25 RETRIEVER]: '{query}' 검색 중 (전문가: {specialist}, 필터: {filters})...")
         
+        fields = self.fields if fields is None else fields
+        include_vectors = self.include_vectors if include_vectors is None else include_vectors
+
         try:
             tokenized_query = tokenize_korean(query)
+
+            if self.local_index is not None:
+                results = self.local_index.search(tokenized_query.split(), specialist, filters, limit)
+                results = [project_doc(doc, fields) for doc in results]
+                print(f"✅ [BM25 RETRIEVER]: {len(results)}건의 결과를 찾았습니다. (local)")
+                return results
             
             if specialist or filters:
                 must_clauses = [{"text": {"query": tokenized_query, "path": "tokenized_text"}}]
@@ -44,19 +65,24 @@ class BM25Retriever:
                     "index": "keyword_index",
                     "compound": {
                         "must": must_clauses,
-                        "filter": filter_clauses if filter_clauses else [{"wildcard": {"path": "*", "query": "*"}}]
+                        "filter": filter_clauses if filter_clauses else [{"wildcard": {"path": "*", "query": "*"}}],
+                        "mustNot": [TOMBSTONE_CLAUSE]
                     }
                 }
             else:
                 search_query = {
                     "index": "keyword_index",
-                    "text": {"query": tokenized_query, "path": "tokenized_text"}
+                    "compound": {
+                        "must": [{"text": {"query": tokenized_query, "path": "tokenized_text"}}],
+                        "mustNot": [TOMBSTONE_CLAUSE]
+                    }
                 }
 
             results = await self.collection.aggregate([
                 { "$search": search_query },
                 { "$limit": limit },
-                { "$set": { "score_type": "keyword" } }
+                { "$set": { "score_type": "keyword", "score": { "$meta": "searchScore" } } },
+                { "$project": build_projection(fields, include_vectors) }
             ]).to_list(None)
             
             print(f"✅ [BM25 RETRIEVER]: {len(results)}건의 결과를 찾았습니다.")
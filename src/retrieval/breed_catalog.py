@@ -0,0 +1,233 @@
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from src.retrieval.filters import ACTIVE_FILTER
+from src.pipelines.v3.schemas import STAT_FILTER_FIELDS
+from src.retrieval.breed_names import BreedNameIndex
+
+# 품종 stats 필드 (행렬 열 순서 = STAT_FILTER_FIELDS 선언 순서)
+STAT_FIELDS = tuple(STAT_FILTER_FIELDS)
+# "3 - 5" 형식 범위 문자열 stats (열 값 = 범위 중앙값, 미상이면 NaN)
+RANGE_FIELDS = ("weight_metric", "life_span")
+QUERY_FIELDS = STAT_FIELDS + RANGE_FIELDS
+
+# 구조화 질의 비교 연산자
+QUERY_OPS = {
+    "eq": np.equal, "ne": np.not_equal,
+    "gte": np.greater_equal, "gt": np.greater,
+    "lte": np.less_equal, "lt": np.less,
+}
+OP_SYMBOLS = {"eq": "=", "ne": "≠", "gte": "≥", "gt": ">", "lte": "≤", "lt": "<"}
+
+# 선별 근거 문장에 쓰는 stats 한글 이름
+STAT_LABELS = {
+    "shedding_level": "털 빠짐",
+    "energy_level": "활동량",
+    "intelligence": "지능",
+    "affection_level": "애정도",
+    "child_friendly": "아이 친화",
+    "indoor": "실내 적합",
+    "lap": "무릎냥이 성향",
+    "hypoallergenic": "저자극성",
+    "adaptability": "적응력",
+    "dog_friendly": "강아지 친화",
+    "grooming": "그루밍 필요도",
+    "health_issues": "건강 이슈",
+    "social_needs": "교감 욕구",
+    "stranger_friendly": "낯선 사람 친화",
+    "vocalisation": "울음 빈도",
+    "weight_metric": "체중(kg)",
+    "life_span": "수명(년)",
+}
+
+# 질의 검색 결과 순위에 주는 가산점 가중치 (RRF 형태: weight / (k + rank))
+RELEVANCE_WEIGHT = 2.0
+RELEVANCE_K = 5
+
+
+@dataclass
+class BreedMatch:
+    """품종 랭킹 결과 1건. reasons는 점수에 가장 크게 기여한 stats 설명입니다."""
+    doc: Dict[str, Any]
+    score: float
+    reasons: List[str] = field(default_factory=list)
+
+
+class BreedCatalog:
+    """
+    V3 품종 문서(categories=Breeds, 약 70건)를 메모리에 한 번 올린 카탈로그입니다.
+    stats 15개를 (품종 수, 15) float32 행렬로 보관하고(결측 NaN), 열별 최댓값으로 0~1 정규화한 행렬을 함께 둡니다.
+    rank()는 하드 제약 마스크 + 유연 선호 가중치 내적으로 전 품종을 한 번에 점수화하므로 LLM 없이 결정적으로 선별합니다.
+    query()는 stats 15개 + weight_metric/life_span(범위 중앙값) 열에 대한 비교 조건·정렬 질의를 처리합니다 (구조화 필터 도구).
+    """
+    _shared: Optional["BreedCatalog"] = None
+    _lock = threading.Lock()
+
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+        self.uids = [doc.get("uid") for doc in docs]
+        self._row_by_uid = {uid: i for i, uid in enumerate(self.uids)}
+        self.stats = np.array(
+            [[np.nan if (doc.get("stats") or {}).get(stat) is None else doc["stats"][stat] for stat in STAT_FIELDS] for doc in docs],
+            dtype=np.float32,
+        ).reshape(len(docs), len(STAT_FIELDS))
+        # 이진 stats(indoor/lap/hypoallergenic)와 1~5 척도를 같은 0~1 범위로 맞춤
+        self.scale = np.maximum(np.nan_to_num(np.nanmax(self.stats, axis=0), nan=1.0), 1.0) if len(docs) else np.ones(len(STAT_FIELDS), dtype=np.float32)
+        self.normalized = np.nan_to_num(self.stats / self.scale, nan=0.5)
+
+        # 구조화 질의용 열 저장소: stats 열은 행렬의 뷰, 범위 문자열은 중앙값 열
+        self.columns: Dict[str, np.ndarray] = {stat: self.stats[:, j] for j, stat in enumerate(STAT_FIELDS)}
+        for name in RANGE_FIELDS:
+            self.columns[name] = np.array([self._parse_range((doc.get("stats") or {}).get(name)) for doc in docs], dtype=np.float32)
+        self._names: Optional[BreedNameIndex] = None
+
+    @staticmethod
+    def _parse_range(value) -> float:
+        """"3 - 5" → 4.0, "12" → 12.0, "미상"/None → NaN"""
+        numbers = [float(n) for n in re.findall(r"\d+(?:\.\d+)?", str(value or ""))]
+        return sum(numbers[:2]) / len(numbers[:2]) if numbers else np.nan
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    # ------------------------------------------------------------------ 생성
+
+    @classmethod
+    async def from_collection(cls, collection) -> "BreedCatalog":
+        docs = await collection.find(
+            {"categories": "Breeds", **ACTIVE_FILTER}, {"embedding": 0, "tokenized_text": 0}
+        ).to_list(None)
+        for doc in docs:
+            doc["_id"] = str(doc["_id"])
+        return cls(docs)
+
+    @classmethod
+    async def load_shared(cls) -> "BreedCatalog":
+        """V3 컬렉션의 품종 문서로 프로세스에서 한 번만 생성되는 공유 카탈로그를 반환합니다."""
+        if cls._shared is None:
+            from src.core.config import ZipsaConfig
+            from src.utils.mongodb import MongoDBManager
+            policy = ZipsaConfig.get_policy("v3")
+            catalog = await cls.from_collection(MongoDBManager.get_v3_db()[policy.collection_name])
+            with cls._lock:
+                if cls._shared is None:
+                    cls._shared = catalog
+                    print(f"🐱 [BREED CATALOG]: 품종 {len(catalog)}건 로드 완료")
+        return cls._shared
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._shared = None
+
+    # ------------------------------------------------------------------ 조회/점수화
+
+    @property
+    def names(self) -> BreedNameIndex:
+        """품종명/별칭/로마자 표기 조회 색인 (처음 사용할 때 생성)"""
+        if self._names is None:
+            self._names = BreedNameIndex(self.docs)
+        return self._names
+
+    def mentioned(self, text: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """텍스트에 나온 품종을 이름 색인으로 찾아 반환합니다 (정확 일치는 등장 순서, 없으면 오타 허용 후보)."""
+        return [hit.doc for hit in self.names.find(text, limit=limit)]
+
+    def rows(self, uids: List[str]) -> List[int]:
+        """uid 목록을 카탈로그 행 번호로 변환합니다 (카탈로그에 없는 uid는 제외)."""
+        return [self._row_by_uid[uid] for uid in uids if uid in self._row_by_uid]
+
+    def constraint_mask(self, constraints: Dict[str, float]) -> np.ndarray:
+        """UserProfile.get_hard_constraints() 형식({stat: 최솟값})을 만족하는 품종 마스크. 결측 stats는 불만족으로 처리합니다."""
+        mask = np.ones(len(self.docs), dtype=bool)
+        for stat, minimum in (constraints or {}).items():
+            column = self.stats[:, STAT_FIELDS.index(stat)]
+            mask &= ~np.isnan(column) & (column >= minimum)
+        return mask
+
+    def query(self, constraints: List[Dict[str, Any]] = None, sort: List[Dict[str, Any]] = None,
+              limit: int = 3) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        열 저장소에 대한 구조화 질의입니다. 반환값: (상위 limit건 문서, 조건을 만족한 전체 품종 수)
+        - constraints: [{"field": "shedding_level", "op": "lte", "value": 2}, ...] (결측 값은 항상 불만족)
+        - sort: [{"field": "child_friendly", "descending": True}, ...]. 생략하면 조건 방향(lte→오름차순, gte→내림차순)으로 정렬
+        """
+        mask = np.ones(len(self.docs), dtype=bool)
+        for c in constraints or []:
+            if c["field"] not in self.columns:
+                raise ValueError(f"지원되지 않는 품종 필드입니다: {c['field']} (가능: {', '.join(QUERY_FIELDS)})")
+            if c["op"] not in QUERY_OPS:
+                raise ValueError(f"지원되지 않는 비교 연산자입니다: {c['op']}")
+            column = self.columns[c["field"]]
+            mask &= ~np.isnan(column) & QUERY_OPS[c["op"]](column, c["value"])
+
+        if sort is None:
+            sort = [{"field": c["field"], "descending": c["op"] in ("gte", "gt")}
+                    for c in constraints or [] if c["op"] in ("gte", "gt", "lte", "lt")]
+        ids = np.flatnonzero(mask)
+        if sort and len(ids):
+            # np.lexsort는 마지막 키가 1순위이므로 역순으로 전달. 결측 값은 방향과 무관하게 뒤로 보냄
+            keys = []
+            for s in reversed(sort):
+                column = self.columns[s["field"]][ids]
+                keys.append(np.where(np.isnan(column), np.inf, -column if s.get("descending", True) else column))
+            ids = ids[np.lexsort(keys)]
+        return [self.docs[row] for row in ids[:limit]], int(mask.sum())
+
+    def describe(self, doc: Dict[str, Any], fields: List[str]) -> str:
+        """품종의 지정 필드 값을 "털 빠짐 2/5, 체중(kg) 4" 형태로 요약합니다."""
+        row = self._row_by_uid.get(doc.get("uid"))
+        parts = []
+        for name in dict.fromkeys(fields):
+            value = self.columns[name][row] if row is not None else np.nan
+            if np.isnan(value):
+                parts.append(f"{STAT_LABELS[name]} 미상")
+            elif name in STAT_FIELDS:
+                parts.append(f"{STAT_LABELS[name]} {int(value)}/{int(self.scale[STAT_FIELDS.index(name)])}")
+            else:
+                parts.append(f"{STAT_LABELS[name]} {value:g}")
+        return ", ".join(parts)
+
+    def weight_vector(self, preferences: Dict[str, float]) -> np.ndarray:
+        weights = np.zeros(len(STAT_FIELDS), dtype=np.float32)
+        for stat, weight in (preferences or {}).items():
+            if stat in STAT_FIELDS:
+                weights[STAT_FIELDS.index(stat)] = weight
+        return weights
+
+    def _reasons(self, row: int, weights: np.ndarray, contributions: np.ndarray, top: int = 2) -> List[str]:
+        reasons = []
+        for j in np.argsort(-contributions)[:top]:
+            if contributions[j] <= 0:
+                break
+            stat = STAT_FIELDS[j]
+            value = self.stats[row, j]
+            direction = "높음" if weights[j] > 0 else "낮음"
+            reasons.append(f"{STAT_LABELS[stat]} {direction} ({int(value)}/{int(self.scale[j])})")
+        return reasons
+
+    def rank(self, constraints: Dict[str, float] = None, preferences: Dict[str, float] = None,
+             relevance_uids: List[str] = None, candidate_uids: List[str] = None, limit: int = 3) -> List[BreedMatch]:
+        """
+        하드 제약을 만족하는 품종을 점수 내림차순으로 반환합니다.
+        - 선호 점수: Σ weight × (정규화 stat − 0.5) → 양수 가중치는 높은 값, 음수 가중치는 낮은 값을 선호
+        - relevance_uids: 질의 검색 결과 순서. 순위별 RRF 가산점으로 질의 의도(예: '대형묘')를 반영
+        - candidate_uids: 주어지면 이 품종들만 후보로 사용
+        """
+        mask = self.constraint_mask(constraints)
+        if candidate_uids is not None:
+            allowed = np.zeros(len(self.docs), dtype=bool)
+            allowed[self.rows(candidate_uids)] = True
+            mask &= allowed
+
+        weights = self.weight_vector(preferences)
+        contributions = (self.normalized - 0.5) * weights
+        scores = contributions.sum(axis=1)
+        for rank, row in enumerate(self.rows(relevance_uids or [])):
+            scores[row] += RELEVANCE_WEIGHT / (RELEVANCE_K + rank)
+
+        ids = np.flatnonzero(mask)
+        top = ids[np.argsort(-scores[ids], kind="stable")[:limit]]
+        return [BreedMatch(self.docs[row], float(scores[row]), self._reasons(row, weights, contributions[row])) for row in top]
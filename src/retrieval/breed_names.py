@@ -0,0 +1,263 @@
+import os
+import re
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+
+# 품종 별칭 사전 (표준 한글명 → 별칭 리스트, 토크나이저 유의어와 공유)
+SYNONYMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "core", "tokenizer", "synonyms.json")
+
+# 별칭 끝에 붙는 일반 명사 (떼어낸 형태도 키로 등록)
+GENERIC_SUFFIXES = ("고양이", "냥이", "냥", "캣", "cat")
+# 한 글자 품종명(예: 샴) 뒤에 올 수 있는 조사 — 이 외의 글자가 이어지면 다른 단어의 일부로 봄
+PARTICLES = set("은는이가을를의와과도랑로에")
+# 두 글자 이하 한글 키 뒤에 와도 되는 여러 글자 조사/어미 (예: '버만처럼'은 허용, '버만큼'은 '버만'으로 보지 않음)
+LONG_PARTICLES = ("이랑", "하고", "에게", "한테", "에서", "처럼", "보다", "만큼", "까지", "이나", "이야", "이에요", "예요")
+# 짧은 키 경계 검사 대상 길이 (한 글자는 표준명만 등록)
+SHORT_KEY_LENGTH = 2
+
+# 오타 허용 매칭: 로마자 표기 기준 문자 2-gram의 Dice 계수 하한 (로마자 4자 이하의 짧은 키는 더 엄격하게)
+FUZZY_THRESHOLD = 0.7
+SHORT_KEY_THRESHOLD = 0.8
+NGRAM = 2
+# 오타 허용 결과는 1위 점수와 이 차이 안의 후보만 반환
+FUZZY_MARGIN = 0.15
+
+# 국립국어원 로마자 표기법 (음운 변화 미적용, 음절 단위 변환)
+_INITIALS = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+_MEDIALS = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we", "wi", "yu", "eu", "ui", "i"]
+_FINALS = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l", "p", "l", "m", "p", "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t"]
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣 ]+")
+
+
+def romanize(text: str) -> str:
+    """한글 음절을 로마자로 바꿉니다 (그 외 문자는 유지). 예: '래그돌' → 'raegeudol'"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_INITIALS[code // 588] + _MEDIALS[(code % 588) // 28] + _FINALS[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def normalize(text: str) -> str:
+    """소문자화 + 공백/기호 제거 (예: 'Chantilly-Tiffany' → 'chantillytiffany')"""
+    return _NON_WORD.sub("", (text or "").lower()).replace(" ", "")
+
+
+# 일반 명사의 로마자 표기 (예: '길고양이' → 'gilgoyangi'도 일반 명사가 붙은 키로 봄)
+_GENERIC_SUFFIXES_ALL = GENERIC_SUFFIXES + tuple(romanize(s) for s in GENERIC_SUFFIXES if romanize(s) != s)
+
+
+def _strip_generic(word: str) -> str:
+    """단어 끝의 조사를 떼고 남은 형태가 일반 명사로 끝나면 일반 명사까지 뗍니다. 예: '고양이가' → '', '샴고양이는' → '샴'"""
+    for stem in ((word[:-1], word) if len(word) > 1 and word[-1] in PARTICLES else (word,)):
+        for suffix in GENERIC_SUFFIXES:
+            if stem.endswith(suffix):
+                return stem[:-len(suffix)]
+    return word
+
+
+def _ngrams(text: str) -> set:
+    padded = f"#{text}#"
+    return {padded[i:i + NGRAM] for i in range(max(1, len(padded) - NGRAM + 1))}
+
+
+@dataclass
+class NameHit:
+    """이름 색인 조회 결과 1건 (alias: 일치한 키, exact: 트라이 정확 일치 여부)"""
+    doc: Dict[str, Any]
+    alias: str
+    score: float
+    exact: bool
+
+
+class BreedNameIndex:
+    """
+    품종명 직접 조회 색인입니다. name_ko/name_en, synonyms.json 별칭, 일반 명사를 뗀 형태, 한글 키의 로마자 표기를 키로 등록하고
+    - 트라이: 질문 텍스트를 한 번 훑으며 가장 긴 키부터 정확 일치 (공백 무시, 위치 순)
+    - 문자 2-gram 역색인: 정확 일치가 없을 때 로마자 표기 기준 Dice 계수로 오타를 허용 (예: '벵골' → 벵갈, '엑죠틱' → 엑조틱)
+    로 품종 문서를 찾습니다. 검색·LLM 호출 없이 마이크로초 단위로 끝납니다.
+    """
+    def __init__(self, docs: List[Dict[str, Any]], synonyms: Dict[str, List[str]] = None):
+        self.docs = docs
+        self._trie: Dict[str, Any] = {}
+        self._keys: Dict[str, set] = defaultdict(set)       # 키 → 품종 행
+        self._short_keys: set = set()                          # 두 글자 이하 한글 키 (경계 검사 대상)
+        self._fuzzy_keys: List[Tuple[str, str, int]] = []       # (로마자 표기 키, 원래 키, n-gram 수)
+        self._grams: Dict[str, List[int]] = defaultdict(list)  # n-gram → _fuzzy_keys 인덱스
+
+        for row, doc in enumerate(docs):
+            for name in (doc.get("name_ko"), doc.get("name_en")):
+                self._add(name, row, canonical=True)
+
+        # 별칭 그룹은 표준명 또는 별칭 중 하나가 이미 등록된 품종명과 일치할 때만 연결
+        for standard, aliases in (synonyms if synonyms is not None else self.load_synonyms()).items():
+            if not isinstance(aliases, list):
+                continue
+            rows = set()
+            for name in [standard] + aliases:
+                rows |= self._keys.get(normalize(name), set())
+            for row in rows:
+                self._add(standard, row, canonical=True)
+                for alias in aliases:
+                    self._add(alias, row)
+
+        # 일반 명사가 붙은 키('샴고양이', 로마자 표기 'gilgoyangi' 포함)는 '고양이'만으로도 점수가 올라가므로 오타 허용 대상에서 제외
+        for key in self._keys:
+            fuzzy = romanize(key)
+            if len(fuzzy) < NGRAM or key.endswith(_GENERIC_SUFFIXES_ALL):
+                continue
+            grams = _ngrams(fuzzy)
+            for gram in grams:
+                self._grams[gram].append(len(self._fuzzy_keys))
+            self._fuzzy_keys.append((fuzzy, key, len(grams)))
+
+    @staticmethod
+    def load_synonyms(path: str = SYNONYMS_PATH) -> Dict[str, List[str]]:
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ------------------------------------------------------------------ 등록
+
+    def _add(self, name: Optional[str], row: int, canonical: bool = False):
+        key = normalize(name)
+        variants = {key}
+        for suffix in GENERIC_SUFFIXES:
+            if key.endswith(suffix) and len(key) > len(suffix):
+                variants.add(key[:-len(suffix)])
+        for variant in variants:
+            hangul = bool(re.search(r"[가-힣]", variant))
+            # 한 글자 키는 품종 표준명(예: 샴)만 허용, 로마자/영문 키는 4자 이상
+            if len(variant) < (1 if hangul else 4) or (len(variant) == 1 and not canonical):
+                continue
+            if hangul and len(variant) <= SHORT_KEY_LENGTH:
+                self._short_keys.add(variant)
+            self._insert(variant, row)
+            if hangul and len(romanize(variant)) >= 4:
+                self._insert(romanize(variant), row)
+
+    def _insert(self, key: str, row: int):
+        node = self._trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node.setdefault("$", set()).add(row)
+        self._keys[key].add(row)
+
+    # ------------------------------------------------------------------ 조회
+
+    def _scan(self, text: str) -> List[Tuple[int, str, set]]:
+        """가장 왼쪽·가장 긴 키 우선으로 겹치지 않는 정확 일치를 (위치, 키, 행)으로 반환합니다. 공백은 키 중간에서 건너뜁니다."""
+        text = _NON_WORD.sub(" ", (text or "").lower())
+        found, i = [], 0
+        while i < len(text):
+            node, j, key, best = self._trie, i, "", None
+            while j < len(text):
+                if text[j] == " ":
+                    if not key:
+                        break
+                    j += 1
+                    continue
+                node = node.get(text[j])
+                if node is None:
+                    break
+                key += text[j]
+                j += 1
+                if "$" in node and (key not in self._short_keys or self._at_boundary(text, j)):
+                    best = (j, key, node["$"])
+            if best:
+                found.append((i, best[1], best[2]))
+                i = best[0]
+            else:
+                i += 1
+        return found
+
+    @staticmethod
+    def _at_boundary(text: str, j: int) -> bool:
+        """짧은 키가 text[:j]에서 끝날 때 뒤가 단어 경계(끝/공백/조사/일반 명사)인지 확인합니다."""
+        rest = text[j:]
+        return (not rest or rest[0] == " " or rest.startswith(LONG_PARTICLES + GENERIC_SUFFIXES)
+                or (rest[0] in PARTICLES and (len(rest) == 1 or rest[1] == " ")))
+
+    def _starts_with_key(self, word: str) -> bool:
+        """word가 등록된 키로 시작하고 그 뒤에 글자가 더 있는지 확인합니다."""
+        node = self._trie
+        for i, ch in enumerate(word[:-1]):
+            node = node.get(ch)
+            if node is None:
+                return False
+            if "$" in node:
+                return True
+        return False
+
+    def _fuzzy(self, text: str) -> List[Tuple[float, str, set]]:
+        """단어(및 끝 조사를 뗀 형태, 인접 두 단어 결합)를 n-gram Dice 계수로 키와 비교합니다."""
+        words = []
+        for word in _NON_WORD.sub(" ", (text or "").lower()).split():
+            word = _strip_generic(word)
+            if word:
+                words.append(word)
+        candidates = set(words) | {a + b for a, b in zip(words, words[1:])}
+        # 끝 음절이 조사일 때만 뗀 형태를 후보로 추가 ('버만큼'의 '큼'은 조사가 아니므로 '버만'으로 보지 않음)
+        for word in words:
+            if re.fullmatch(r"[가-힣]{3,}", word):
+                if word[-1] in PARTICLES:
+                    candidates.add(word[:-1])
+                if word.endswith(LONG_PARTICLES):
+                    candidates |= {word[:-len(p)] for p in LONG_PARTICLES if word.endswith(p)}
+
+        best: Dict[str, float] = {}
+        for candidate in candidates:
+            # 키로 시작하지만 경계 검사에서 떨어진 단어('버만큼')는 다른 단어로 보고 오타 허용에서도 제외
+            if self._starts_with_key(candidate):
+                continue
+            fuzzy = romanize(candidate)
+            if len(fuzzy) < NGRAM:
+                continue
+            grams = _ngrams(fuzzy)
+            overlap: Dict[int, int] = defaultdict(int)
+            for gram in grams:
+                for idx in self._grams.get(gram, ()):
+                    overlap[idx] += 1
+            for idx, shared in overlap.items():
+                key_fuzzy, key, size = self._fuzzy_keys[idx]
+                score = 2 * shared / (len(grams) + size)
+                threshold = SHORT_KEY_THRESHOLD if len(key_fuzzy) <= 4 else FUZZY_THRESHOLD
+                if score >= threshold and score > best.get(key, 0.0):
+                    best[key] = score
+        return sorted(((score, key, self._keys[key]) for key, score in best.items()), key=lambda x: -x[0])
+
+    def find(self, text: str, limit: int = 3, fuzzy: bool = True) -> List[NameHit]:
+        """
+        텍스트에 나온 품종을 찾습니다. 정확 일치는 등장 순서로, 정확 일치가 없으면 오타 허용 후보를 점수 순으로 반환합니다.
+        """
+        hits, seen = [], set()
+        for _, key, rows in self._scan(text):
+            for row in sorted(rows):
+                if row not in seen:
+                    seen.add(row)
+                    hits.append(NameHit(self.docs[row], key, 1.0, True))
+        if not hits and fuzzy:
+            scored = self._fuzzy(text)
+            for score, key, rows in scored:
+                if score < scored[0][0] - FUZZY_MARGIN:
+                    break
+                for row in sorted(rows):
+                    if row not in seen:
+                        seen.add(row)
+                        hits.append(NameHit(self.docs[row], key, round(score, 4), False))
+        return hits[:limit]
+
+    def resolve(self, name: str) -> Optional[Dict[str, Any]]:
+        """품종명/별칭 하나를 품종 문서로 해석합니다 (오타 허용, 없으면 None)."""
+        hits = self.find(name, limit=1)
+        return hits[0].doc if hits else None
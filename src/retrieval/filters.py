@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Tuple
+
+# 증분 적재에서 원본이 사라진 문서는 삭제 대신 deleted=True로 표시(툼스톤)되며, 모든 검색 경로에서 제외합니다.
+ACTIVE_FILTER = {"deleted": {"$ne": True}}
+# Atlas $search용 동일 조건 (compound.mustNot 절)
+TOMBSTONE_CLAUSE = {"equals": {"path": "deleted", "value": True}}
+
+def vector_tombstone_filter(version: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Atlas $vectorSearch의 툼스톤 제외 조건을 (pre-filter 조건, $vectorSearch 뒤에 붙일 스테이지)로 반환합니다.
+    증분 적재는 V3만 쓰며, deleted 필터 경로가 인덱스에 반영된 경우(VECTOR_TOMBSTONE_PREFILTER=true)에만 pre-filter를 사용합니다.
+    """
+    from src.core.config import RetrievalConfig
+    if version != "v3":
+        return {}, []
+    if RetrievalConfig.VECTOR_TOMBSTONE_PREFILTER:
+        return dict(ACTIVE_FILTER), []
+    return {}, [{"$match": dict(ACTIVE_FILTER)}]
+
+def _field_matches(value: Any, condition: Any) -> bool:
+    """
+    단일 필드 조건을 MongoDB 필터와 동일한 의미로 평가합니다.
+    배열 필드는 원소 중 하나라도 조건을 만족하면 일치로 판단합니다 (예: categories: "Breeds").
+    """
+    if isinstance(value, (list, tuple)):
+        return any(_field_matches(v, condition) for v in value)
+
+    if isinstance(condition, dict):
+        for op, operand in condition.items():
+            if op == "$eq" and value != operand:
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$nin" and value in operand:
+                return False
+            if op in ("$gte", "$gt", "$lte", "$lt"):
+                if value is None:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$lte" and not value <= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+        return True
+
+    return value == condition
+
+
+def matches_filters(doc: Dict[str, Any], specialist: str = None, filters: dict = None) -> bool:
+    """
+    인프로세스 인덱스에서 Atlas 검색과 같은 specialist/filters 의미를 적용합니다.
+    - specialist: 문서의 specialists 배열에 포함되어야 함
+    - filters: {필드: 값} 또는 {필드: {"$gte"/"$lte"/"$eq"/...: 값}}
+    툼스톤(deleted=True) 문서는 항상 제외합니다.
+    """
+    if doc.get("deleted") is True:
+        return False
+    if specialist and not _field_matches(doc.get("specialists"), specialist):
+        return False
+    if filters:
+        for key, condition in filters.items():
+            if not _field_matches(doc.get(key), condition):
+                return False
+    return True
@@ -1,51 +1,127 @@
+import asyncio
 from langsmith import traceable
-from src.core.config import ZipsaConfig
+from src.core.config import ZipsaConfig, RetrievalConfig
 from src.utils.mongodb import MongoDBManager
 from src.embeddings.factory import EmbeddingFactory
 from src.utils.text import tokenize_korean
+from src.retrieval.bm25_index import BM25Index
+from src.retrieval.vector_index import VectorIndex
+from src.retrieval.filters import TOMBSTONE_CLAUSE, vector_tombstone_filter
+from src.retrieval.projection import resolve_fields, build_projection, project_doc
+
+class HybridSearchResult(list):
+    """
+    RRF 결합 결과 리스트입니다.
+    마감 시간을 넘긴 레그가 있으면 partial=True로 표시되며, timed_out_legs에 해당 레그가 기록됩니다.
+    """
+    def __init__(self, docs=(), timed_out_legs=()):
+        super().__init__(docs)
+        self.timed_out_legs = list(timed_out_legs)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.timed_out_legs)
+
 
 class HybridRetriever:
-    def __init__(self, version="v2", collection_name=None):
+    def __init__(self, version="v2", collection_name=None, vector_timeout: float = None, keyword_timeout: float = None,
+                 embedder=None, provider: str = None, keyword_backend: str = None, vector_backend: str = None,
+                 keyword_index_path: str = None, vector_index_path: str = None,
+                 fields: list = None, include_vectors: bool = False):
+        self.version = version
         self.policy = ZipsaConfig.get_policy(version)
-        if version == "v1":
-            self.db = MongoDBManager.get_v1_db()
-        elif version == "v3":
-            self.db = MongoDBManager.get_v3_db()
-        else:
-            self.db = MongoDBManager.get_v2_db()
         
         # 정책에 있는 컬렉션을 기본값으로 사용 (명시적으로 주어지지 않은 경우)
         self.collection_name = collection_name or self.policy.collection_name
-        self.collection = self.db[self.collection_name]
-        self.embedder = EmbeddingFactory.get_embedder()
+        # 임베더는 프로세스 전역 공유 인스턴스를 사용 (모델/클라이언트 재생성 방지)
+        self.embedder = embedder or EmbeddingFactory.get_shared_embedder(provider)
+
+        # 레그별 마감 시간 (초). None이면 RetrievalConfig 기본값 사용
+        self.vector_timeout = vector_timeout if vector_timeout is not None else RetrievalConfig.VECTOR_TIMEOUT
+        self.keyword_timeout = keyword_timeout if keyword_timeout is not None else RetrievalConfig.KEYWORD_TIMEOUT
+
+        # 키워드 레그 백엔드: "atlas" 또는 "local" (인프로세스 BM25 인덱스, 기본 경로는 (버전, 컬렉션)별)
+        self.keyword_backend = (keyword_backend or RetrievalConfig.KEYWORD_BACKEND).lower()
+        self.local_keyword_index = BM25Index.load_shared(
+            keyword_index_path or RetrievalConfig.local_index_path("bm25", version, self.collection_name)
+        ) if self.keyword_backend == "local" else None
+
+        # 벡터 레그 백엔드: "atlas" 또는 "local" (인프로세스 벡터 인덱스, 기본 경로는 (버전, 컬렉션)별)
+        self.vector_backend = (vector_backend or RetrievalConfig.VECTOR_BACKEND).lower()
+        self.local_vector_index = VectorIndex.load_shared(
+            vector_index_path or RetrievalConfig.local_index_path("vector", version, self.collection_name)
+        ) if self.vector_backend == "local" else None
+
+        # 반환 필드 집합 (기본: 컬렉션별 선언 필드). embedding은 include_vectors=True일 때만 포함
+        self.fields = resolve_fields(self.collection_name, fields)
+        self.include_vectors = include_vectors
+
+    @property
+    def collection(self):
+        # 공유 클라이언트 레지스트리에서 현재 이벤트 루프에 맞는 컬렉션을 조회
+        return MongoDBManager.get_db(self.version)[self.collection_name]
 
     @traceable(name="Hybrid Search")
-    async def search(self, query: str, specialist: str = None, limit: int = 3, filters: dict = None):
+    async def search(self, query: str, specialist: str = None, limit: int = 3, filters: dict = None,
+                     fields: list = None, include_vectors: bool = None):
         """
         RRF (Reciprocal Rank Fusion)를 사용하여 하이브리드 검색을 수행합니다.
+        fields/include_vectors를 주면 이번 호출에 한해 리트리버 기본 프로젝션을 덮어씁니다 (예: 리랭커용 벡터).
         """
         print(f"🔍 [RETRIEVER]: '{query}' 검색 중 (전문가: {specialist}, 필터: {filters})...")
         
         # 1. 입력 전처리
         if specialist == "General":
             specialist = None
+        fields = self.fields if fields is None else fields
+        include_vectors = self.include_vectors if include_vectors is None else include_vectors
             
-        # 2. 개별 검색 실행 (벡터 및 키워드)
-        vector_results = await self._run_vector_search(query, specialist, filters, limit)
-        keyword_results = await self._run_keyword_search(query, specialist, filters, limit)
+        # 2. 개별 검색 동시 실행 (벡터 및 키워드, 레그별 마감 시간 적용)
+        (vector_results, vector_timed_out), (keyword_results, keyword_timed_out) = await asyncio.gather(
+            self._run_with_deadline(self._run_vector_search(query, specialist, filters, limit, fields, include_vectors), self.vector_timeout, "vector"),
+            self._run_with_deadline(self._run_keyword_search(query, specialist, filters, limit, fields, include_vectors), self.keyword_timeout, "keyword"),
+        )
+        timed_out_legs = [leg for leg, timed_out in (("vector", vector_timed_out), ("keyword", keyword_timed_out)) if timed_out]
 
-        # 3. RRF를 사용한 결합 및 랭킹
-        merged = self._rank_and_merge(vector_results, keyword_results, limit)
+        # 3. RRF를 사용한 결합 및 랭킹 (마감을 넘긴 레그는 빈 결과로 취급)
+        merged = self._rank_and_merge(vector_results, keyword_results, limit, timed_out_legs)
         
-        print(f"✅ [RETRIEVER]: {len(merged)}건의 결과를 찾았습니다.")
+        if merged.partial:
+            print(f"⚠️ [RETRIEVER]: {', '.join(merged.timed_out_legs)} 검색 마감 초과 - 부분 결과 {len(merged)}건을 반환합니다.")
+        else:
+            print(f"✅ [RETRIEVER]: {len(merged)}건의 결과를 찾았습니다.")
         return merged
 
-    async def _run_vector_search(self, query: str, specialist: str, filters: dict, limit: int):
+    async def _run_with_deadline(self, coro, timeout: float, leg: str):
+        """
+        단일 검색 레그를 마감 시간 내에 실행합니다.
+        Returns:
+            (결과 리스트, 마감 초과 여부) 튜플. 초과 시 레그는 취소되고 빈 리스트를 반환합니다.
+        """
+        if not timeout or timeout <= 0:
+            return await coro, False
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout), False
+        except asyncio.TimeoutError:
+            print(f"⏱️ [RETRIEVER]: {leg} 검색이 {timeout}초 마감을 초과했습니다.")
+            return [], True
+
+    async def _run_vector_search(self, query: str, specialist: str, filters: dict, limit: int,
+                                 fields: list = None, include_vectors: bool = False):
         """Atlas 벡터 검색 로직을 처리합니다."""
         query_vector = await self.embedder.embed_query(query)
+
+        if self.local_vector_index is not None:
+            try:
+                results = self.local_vector_index.search(query_vector, specialist, filters, limit * 2, include_vectors=include_vectors)
+                return [project_doc(doc, fields, include_vectors) for doc in results]
+            except Exception as e:
+                print(f"벡터 검색 오류: {e}")
+                return []
         
         # 메타데이터 필터 구성
-        combined_filter = {}
+        # 툼스톤(deleted) 문서 제외: 인덱스에 deleted 필터 경로가 반영됐으면 pre-filter, 아니면 $vectorSearch 뒤 $match
+        combined_filter, tombstone_stages = vector_tombstone_filter(self.version)
         if specialist:
             combined_filter["specialists"] = specialist
         if filters:
@@ -66,16 +142,23 @@ class HybridRetriever:
         try:
             return await self.collection.aggregate([
                 vector_search_stage,
-                { "$set": { "score_type": "vector" } }
+                *tombstone_stages,
+                { "$set": { "score_type": "vector", "score": { "$meta": "vectorSearchScore" } } },
+                { "$project": build_projection(fields, include_vectors) }
             ]).to_list(None)
         except Exception as e:
             print(f"벡터 검색 오류: {e}")
             return []
 
-    async def _run_keyword_search(self, query: str, specialist: str, filters: dict, limit: int):
+    async def _run_keyword_search(self, query: str, specialist: str, filters: dict, limit: int,
+                                  fields: list = None, include_vectors: bool = False):
         """메타데이터 필터링을 포함한 Atlas 검색 (BM25)을 처리합니다."""
         try:
             tokenized_query = tokenize_korean(query)
+
+            if self.local_keyword_index is not None:
+                results = self.local_keyword_index.search(tokenized_query.split(), specialist, filters, limit * 2)
+                return [project_doc(doc, fields, include_vectors) for doc in results]
             
             if specialist or filters:
                 must_clauses = [{"text": {"query": tokenized_query, "path": "tokenized_text"}}]
@@ -97,51 +180,64 @@ class HybridRetriever:
                     "index": "keyword_index",
                     "compound": {
                         "must": must_clauses,
-                        "filter": filter_clauses if filter_clauses else [{"wildcard": {"path": "*", "query": "*"}}]
+                        "filter": filter_clauses if filter_clauses else [{"wildcard": {"path": "*", "query": "*"}}],
+                        "mustNot": [TOMBSTONE_CLAUSE]
                     }
                 }
             else:
                 search_query = {
                     "index": "keyword_index",
-                    "text": {"query": tokenized_query, "path": "tokenized_text"}
+                    "compound": {
+                        "must": [{"text": {"query": tokenized_query, "path": "tokenized_text"}}],
+                        "mustNot": [TOMBSTONE_CLAUSE]
+                    }
                 }
 
             return await self.collection.aggregate([
                 { "$search": search_query },
                 { "$limit": limit * 2 },
-                { "$set": { "score_type": "keyword" } }
+                { "$set": { "score_type": "keyword", "score": { "$meta": "searchScore" } } },
+                { "$project": build_projection(fields, include_vectors) }
             ]).to_list(None)
         except Exception as e:
             print(f"키워드 검색 실패: {e}")
             return []
 
-    def _rank_and_merge(self, vector_results, keyword_results, limit):
-        """RRF (Reciprocal Rank Fusion)를 적용하고 결과를 병합합니다."""
+    def _rank_and_merge(self, vector_results, keyword_results, limit, timed_out_legs=()):
+        """
+        RRF (Reciprocal Rank Fusion)를 적용하고 결과를 병합합니다.
+        timed_out_legs가 주어지면 남은 레그의 결과만으로 결합하고 부분 결과로 표시합니다.
+        """
         scores = {}
         for rank, doc in enumerate(vector_results):
-            doc_id = str(doc.get("_id"))
+            doc_id = self._doc_key(doc)
             scores[doc_id] = scores.get(doc_id, 0) + 1 / (rank + 60)
 
         for rank, doc in enumerate(keyword_results):
-            doc_id = str(doc.get("_id"))
+            doc_id = self._doc_key(doc)
             scores[doc_id] = scores.get(doc_id, 0) + 1 / (rank + 60)
         
         all_docs = vector_results + keyword_results
         if not all_docs:
-            return []
+            return HybridSearchResult([], timed_out_legs)
 
-        all_docs_sorted = sorted(all_docs, key=lambda x: scores.get(str(x.get("_id")), 0), reverse=True)
+        all_docs_sorted = sorted(all_docs, key=lambda x: scores.get(self._doc_key(x), 0), reverse=True)
         
         merged = []
         seen = set()
         for doc in all_docs_sorted:
-            doc_id = str(doc.get("_id"))
+            doc_id = self._doc_key(doc)
             if doc_id not in seen:
                 doc["final_score"] = scores[doc_id]
                 merged.append(doc)
                 seen.add(doc_id)
         
-        return merged[:limit]
+        return HybridSearchResult(merged[:limit], timed_out_legs)
+
+    @staticmethod
+    def _doc_key(doc) -> str:
+        """RRF 결합 키. 백엔드마다 _id 표현이 다를 수 있으므로 uid를 우선 사용합니다."""
+        return str(doc.get("uid") or doc.get("_id"))
 
 # 사용 예시
 # retriever = HybridRetriever(collection_name="breeds")
@@ -0,0 +1,57 @@
+from typing import List, Dict, Any, Optional
+
+# 아티클 문서에서 에이전트/UI가 실제로 읽는 필드
+ARTICLE_FIELDS = [
+    "uid", "title", "title_refined", "text", "summary", "keywords", "intent_tags",
+    "categories", "specialists", "specialist_tag", "source", "source_url", "source_urls", "original_url",
+]
+
+# 품종 문서에서 매치메이커/품종 카드가 읽는 필드
+BREED_FIELDS = [
+    "uid", "title_refined", "name_ko", "name_en", "summary", "text", "personality_traits", "physical_traits",
+    "stats", "image_url", "tags", "categories", "specialists", "source", "source_url", "source_urls",
+]
+
+# 컬렉션별 기본 반환 필드. V3는 아티클과 품종을 care_guides 단일 컬렉션에 저장합니다.
+DEFAULT_FIELDS: Dict[str, List[str]] = {
+    "care_guides": list(dict.fromkeys(ARTICLE_FIELDS + BREED_FIELDS)),
+    "breeds": BREED_FIELDS,
+}
+
+# 명시적으로 요청하지 않으면 절대 반환하지 않는 대용량 필드
+HEAVY_FIELDS = ("embedding", "tokenized_text")
+
+# 검색 단계에서 덧붙이는 필드 (프로젝션 이후에도 유지)
+SCORE_FIELDS = ("score", "score_type")
+
+
+def resolve_fields(collection_name: str, fields: Optional[List[str]] = None) -> Optional[List[str]]:
+    """명시된 필드 집합 또는 컬렉션 기본값을 반환합니다. 둘 다 없으면 None (대용량 필드만 제외)."""
+    if fields is not None:
+        return list(fields)
+    return DEFAULT_FIELDS.get(collection_name)
+
+
+def build_projection(fields: Optional[List[str]], include_vectors: bool = False) -> Dict[str, int]:
+    """
+    집계 파이프라인용 $project 명세를 생성합니다.
+    fields가 없으면 embedding/tokenized_text만 제외하고, include_vectors=True이면 embedding을 포함합니다.
+    """
+    if fields is None:
+        return {field: 0 for field in HEAVY_FIELDS if not (include_vectors and field == "embedding")}
+    projection = {field: 1 for field in fields}
+    for field in SCORE_FIELDS:
+        projection[field] = 1
+    if include_vectors:
+        projection["embedding"] = 1
+    return projection
+
+
+def project_doc(doc: Dict[str, Any], fields: Optional[List[str]], include_vectors: bool = False) -> Dict[str, Any]:
+    """인프로세스 백엔드 결과에 동일한 프로젝션을 적용합니다."""
+    if fields is None:
+        return {k: v for k, v in doc.items() if k not in HEAVY_FIELDS or (include_vectors and k == "embedding")}
+    keep = set(fields) | set(SCORE_FIELDS) | {"_id"}
+    if include_vectors:
+        keep.add("embedding")
+    return {k: v for k, v in doc.items() if k in keep}
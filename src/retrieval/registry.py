@@ -0,0 +1,60 @@
+import threading
+from typing import Dict, Tuple, Any
+from src.embeddings.factory import EmbeddingFactory
+
+class RetrieverRegistry:
+    """
+    리트리버 인스턴스를 프로세스 단위로 한 번만 생성해 공유하는 레지스트리입니다.
+    (종류, 버전, 컬렉션, 임베딩 제공자, 로컬 인덱스 경로) 조합을 키로 사용하며, 에이전트 노드는 요청마다 생성하는 대신 여기서 조회합니다.
+    로컬 인덱스 경로를 생략하면 (버전, 컬렉션)별 기본 경로(RetrievalConfig.local_index_path)를 사용합니다.
+    """
+    _instances: Dict[Tuple[str, ...], Any] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, kind: str = "hybrid", version: str = "v3", collection_name: str = None, provider: str = None,
+            keyword_index_path: str = None, vector_index_path: str = None):
+        from src.core.config import ZipsaConfig, RetrievalConfig
+        provider = EmbeddingFactory.resolve_provider(provider)
+        collection_name = collection_name or ZipsaConfig.get_policy(version).collection_name
+        keyword_index_path = keyword_index_path or RetrievalConfig.local_index_path("bm25", version, collection_name)
+        vector_index_path = vector_index_path or RetrievalConfig.local_index_path("vector", version, collection_name)
+        key = (kind, version, collection_name, provider, keyword_index_path, vector_index_path)
+
+        with cls._lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls._build(kind, version, collection_name, provider, keyword_index_path, vector_index_path)
+            return cls._instances[key]
+
+    @classmethod
+    def get_hybrid(cls, version: str = "v3", collection_name: str = None, provider: str = None,
+                   keyword_index_path: str = None, vector_index_path: str = None):
+        return cls.get("hybrid", version, collection_name, provider, keyword_index_path, vector_index_path)
+
+    @staticmethod
+    def _build(kind: str, version: str, collection_name: str, provider: str, keyword_index_path: str, vector_index_path: str):
+        if kind == "hybrid":
+            from src.retrieval.hybrid_search import HybridRetriever
+            return HybridRetriever(version=version, collection_name=collection_name, provider=provider,
+                                   keyword_index_path=keyword_index_path, vector_index_path=vector_index_path)
+        elif kind == "vector":
+            from src.retrieval.vector_retriever import VectorRetriever
+            return VectorRetriever(version=version, collection_name=collection_name, provider=provider, index_path=vector_index_path)
+        elif kind == "bm25":
+            from src.retrieval.bm25_retriever import BM25Retriever
+            return BM25Retriever(version=version, collection_name=collection_name, index_path=keyword_index_path)
+        raise ValueError(f"지원되지 않는 리트리버 종류입니다: {kind}")
+
+    @classmethod
+    def warm_up(cls, version: str = "v3", collection_name: str = None, provider: str = None):
+        """서비스 시작 시 호출하여 임베딩 모델 로딩 등 초기화 비용을 첫 요청 전에 지불합니다."""
+        retriever = cls.get_hybrid(version, collection_name, provider)
+        print(f"🔥 [RETRIEVER REGISTRY]: {version}/{retriever.collection_name} 리트리버 준비 완료 (임베딩: {EmbeddingFactory.resolve_provider(provider)})")
+        return retriever
+
+    @classmethod
+    def clear(cls):
+        """공유 리트리버와 임베더를 모두 해제합니다."""
+        with cls._lock:
+            cls._instances.clear()
+        EmbeddingFactory.clear_shared()
@@ -0,0 +1,327 @@
+import os
+import json
+import threading
+from typing import List, Dict, Any
+import numpy as np
+from src.retrieval.filters import matches_filters, ACTIVE_FILTER
+from src.embeddings.profile import EmbeddingProfile, truncate_dimensions, quantize_int8, dequantize_int8
+
+# 배열 필드 (원소 포함 여부로 필터링)
+LIST_FILTER_FIELDS = ("categories", "specialists")
+
+
+def _numeric_filter_fields() -> List[str]:
+    """MongoDBManager.get_v3_index_config에 선언된 filter_* 필드 목록을 그대로 사용합니다."""
+    from src.utils.mongodb import MongoDBManager
+    fields = MongoDBManager.get_v3_index_config()["definition"]["fields"]
+    return [f["path"] for f in fields if f["type"] == "filter" and f["path"].startswith("filter_")]
+
+
+class VectorIndex:
+    """
+    V3Embedder가 생성한 임베딩을 대상으로 하는 인프로세스 벡터 인덱스입니다.
+    말뭉치가 작으면 Atlas 왕복보다 로컬 내적 계산이 훨씬 빠르므로 Atlas $vectorSearch의 대안으로 사용합니다.
+
+    모드:
+        exact - 전수 내적 (소규모 말뭉치, 정확도 100%)
+        ivf   - k-means 역파일 인덱스, nprobe개 클러스터만 탐색 (대규모 말뭉치)
+        hnsw  - hnswlib 그래프 인덱스 (선택 의존성)
+
+    categories / specialists / filter_* 조건은 후보 탐색 전에 마스크로 적용됩니다 (pre-filtering).
+    scales가 주어지면 vectors는 행 단위 int8 양자화 행렬이며, 점수는 (int8 @ query) * scale로 계산합니다.
+    """
+    _loaded: Dict[str, "VectorIndex"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, vectors: np.ndarray, docs: List[Dict[str, Any]], mode: str = "exact",
+                 nlist: int = None, nprobe: int = 8, numeric_fields: List[str] = None, scales: np.ndarray = None):
+        self.vectors = vectors
+        self.scales = scales
+        self.docs = docs
+        self.dimension = vectors.shape[1] if len(vectors) else 0
+        self.precision = "int8" if scales is not None else "float32"
+        self.mode = mode
+        self.nprobe = nprobe
+        self.numeric_fields = numeric_fields if numeric_fields is not None else _numeric_filter_fields()
+
+        # 필터 컬럼: 숫자 필드는 float 배열(결측 NaN), 배열 필드는 값별 불리언 마스크를 지연 생성
+        self._numeric_columns = {
+            field: np.array([np.nan if d.get(field) is None else d.get(field) for d in docs], dtype=np.float32)
+            for field in self.numeric_fields
+        }
+        self._list_masks: Dict[str, Dict[str, np.ndarray]] = {field: {} for field in LIST_FILTER_FIELDS}
+        # 툼스톤(deleted=True) 문서는 산출물/저장된 인덱스에 남아 있어도 항상 제외 (Atlas 검색·BM25Index와 동일)
+        self._active = np.array([d.get("deleted") is not True for d in docs], dtype=bool)
+
+        self._ivf_centroids = None
+        self._ivf_indptr = None
+        self._ivf_ids = None
+        self._hnsw = None
+        if mode == "ivf":
+            self._build_ivf(nlist or max(1, int(np.sqrt(len(docs)))))
+        elif mode == "hnsw":
+            self._build_hnsw()
+        elif mode != "exact":
+            raise ValueError(f"지원되지 않는 벡터 인덱스 모드입니다: {mode}")
+
+    # ------------------------------------------------------------------ 생성/저장
+
+    @staticmethod
+    def _split_docs(items: List[Dict[str, Any]]):
+        vectors = np.asarray([item["embedding"] for item in items], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        docs = []
+        for i, item in enumerate(items):
+            doc = {k: v for k, v in item.items() if k not in ("embedding", "tokenized_text")}
+            doc.setdefault("_id", doc.get("uid", str(i)))
+            doc["_id"] = str(doc["_id"])
+            docs.append(doc)
+        return vectors / norms, docs
+
+    @classmethod
+    def build(cls, items: List[Dict[str, Any]], mode: str = "auto", **kwargs) -> "VectorIndex":
+        """embedding 필드가 있는 문서 리스트로부터 인덱스를 생성합니다. mode="auto"는 규모에 따라 exact/ivf를 선택합니다."""
+        items = [item for item in items if item.get("embedding")]
+        vectors, docs = cls._split_docs(items)
+        if mode == "auto":
+            mode = "exact" if len(docs) < 20000 else "ivf"
+        return cls(vectors, docs, mode=mode, **kwargs)
+
+    @classmethod
+    def from_artifact(cls, path: str, mode: str = "auto", **kwargs) -> "VectorIndex":
+        """
+        V3Embedder 출력(컬럼형 산출물 디렉토리)으로부터 인덱스를 생성합니다.
+        벡터는 메모리 매핑으로 읽고, 이미 L2 정규화되어 있으면 복사 없이 그대로 사용합니다.
+        """
+        from src.pipelines.artifact import EmbeddingArtifact
+        artifact = EmbeddingArtifact(path)
+        vectors = artifact.vectors
+        if artifact.precision == "int8":
+            # 정규화된 벡터를 양자화한 산출물이므로 int8 행렬과 스케일을 그대로 사용
+            kwargs.setdefault("scales", artifact.scales)
+        else:
+            norms = np.linalg.norm(vectors, axis=1)
+            if not np.allclose(norms, 1.0, atol=1e-3):
+                norms[norms == 0] = 1.0
+                vectors = vectors / norms[:, None]
+
+        docs = []
+        for i, doc in enumerate(artifact.iter_docs()):
+            doc.pop("tokenized_text", None)
+            doc["_id"] = str(doc.get("_id", doc.get("uid", str(i))))
+            docs.append(doc)
+        if mode == "auto":
+            mode = "exact" if len(docs) < 20000 else "ivf"
+        return cls(vectors, docs, mode=mode, **kwargs)
+
+    @classmethod
+    async def from_collection(cls, collection, query: dict = None, **kwargs) -> "VectorIndex":
+        """MongoDB 컬렉션 문서로부터 인덱스를 생성합니다."""
+        items = await collection.find(query or {"embedding": {"$exists": True}, **ACTIVE_FILTER}, {"tokenized_text": 0}).to_list(None)
+        return cls.build(items, **kwargs)
+
+    @property
+    def profile(self) -> EmbeddingProfile:
+        return EmbeddingProfile(self.dimension, self.precision)
+
+    @property
+    def memory_bytes(self) -> int:
+        """벡터 행렬(+ int8 스케일)이 차지하는 바이트 수 (필터 컬럼/ANN 구조 제외)."""
+        return int(self.vectors.nbytes + (self.scales.nbytes if self.scales is not None else 0))
+
+    def with_profile(self, profile: EmbeddingProfile) -> "VectorIndex":
+        """
+        같은 문서에 대해 차원 축소(앞쪽 차원 + 재정규화) / int8 양자화를 적용한 새 인덱스를 만듭니다.
+        질의도 같은 차원으로 임베딩해야 하며 (EmbeddingFactory.get_shared_embedder(profile=...)), 원본보다 큰 차원·정밀도로는 만들 수 없습니다.
+        """
+        vectors = self._rows()
+        if profile.dimension != self.dimension:
+            vectors = truncate_dimensions(vectors, profile.dimension)
+        scales = None
+        if profile.precision == "int8":
+            vectors, scales = quantize_int8(vectors)
+        elif self.precision == "int8":
+            raise ValueError("int8 인덱스로부터 float32 프로파일을 만들 수 없습니다.")
+        index = VectorIndex(vectors, self.docs, mode="exact", nprobe=self.nprobe, numeric_fields=self.numeric_fields, scales=scales)
+        index.mode = self.mode
+        if self.mode == "ivf":
+            index._build_ivf(len(self._ivf_centroids))
+        elif self.mode == "hnsw":
+            index._build_hnsw()
+        return index
+
+    def save(self, path: str):
+        """vectors.npy(float32 또는 int8 + scales.npy) + docs.json + meta.json (+ ivf.npz / hnsw.bin) 디렉토리로 저장합니다."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), np.ascontiguousarray(self.vectors))
+        if self.scales is not None:
+            np.save(os.path.join(path, "scales.npy"), np.ascontiguousarray(self.scales, dtype=np.float32))
+        with open(os.path.join(path, "docs.json"), "w", encoding="utf-8") as f:
+            json.dump(self.docs, f, ensure_ascii=False, default=str)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"mode": self.mode, "nprobe": self.nprobe, "dimension": self.dimension, "precision": self.precision,
+                       "num_docs": len(self.docs), "numeric_fields": self.numeric_fields}, f)
+        if self.mode == "ivf":
+            np.savez(os.path.join(path, "ivf.npz"), centroids=self._ivf_centroids,
+                     indptr=self._ivf_indptr, ids=self._ivf_ids)
+        elif self.mode == "hnsw":
+            self._hnsw.save_index(os.path.join(path, "hnsw.bin"))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "VectorIndex":
+        """save()로 저장한 인덱스를 로드합니다. 벡터는 기본적으로 메모리 매핑됩니다."""
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(
+                f"벡터 인덱스를 찾을 수 없습니다: {path} (scripts/build_vector_index.py로 먼저 생성하세요)"
+            )
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r" if mmap else None)
+        scales = np.load(os.path.join(path, "scales.npy")) if meta.get("precision") == "int8" else None
+        with open(os.path.join(path, "docs.json"), "r", encoding="utf-8") as f:
+            docs = json.load(f)
+
+        # 저장된 보조 구조를 재사용하기 위해 exact로 생성 후 교체
+        index = cls(vectors, docs, mode="exact", nprobe=meta["nprobe"], numeric_fields=meta["numeric_fields"], scales=scales)
+        index.mode = meta["mode"]
+        if index.mode == "ivf":
+            with np.load(os.path.join(path, "ivf.npz")) as arrays:
+                index._ivf_centroids = arrays["centroids"]
+                index._ivf_indptr = arrays["indptr"]
+                index._ivf_ids = arrays["ids"]
+        elif index.mode == "hnsw":
+            hnswlib = cls._import_hnswlib()
+            index._hnsw = hnswlib.Index(space="ip", dim=index.dimension)
+            index._hnsw.load_index(os.path.join(path, "hnsw.bin"), max_elements=len(docs))
+        return index
+
+    @classmethod
+    def load_shared(cls, path: str) -> "VectorIndex":
+        """경로별로 프로세스에서 한 번만 로드되는 공유 인덱스를 반환합니다."""
+        with cls._lock:
+            if path not in cls._loaded:
+                cls._loaded[path] = cls.load(path)
+            return cls._loaded[path]
+
+    # ------------------------------------------------------------------ ANN 구조
+
+    def _rows(self, ids=None) -> np.ndarray:
+        """ids 행(기본 전체)을 float32로 반환합니다 (int8이면 역양자화)."""
+        vectors = self.vectors if ids is None else self.vectors[ids]
+        if self.scales is None:
+            return np.asarray(vectors, dtype=np.float32)
+        return dequantize_int8(vectors, self.scales if ids is None else self.scales[ids])
+
+    def _build_ivf(self, nlist: int, iterations: int = 10, seed: int = 42):
+        """구면 k-means로 클러스터를 만들고 클러스터별 문서 id 리스트(CSR)를 구성합니다."""
+        vectors = self._rows()
+        n = len(vectors)
+        nlist = min(nlist, n)
+        rng = np.random.default_rng(seed)
+        centroids = np.array(vectors[rng.choice(n, nlist, replace=False)], dtype=np.float32)
+        for _ in range(iterations):
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = vectors[assign == c]
+                if len(members):
+                    center = members.mean(axis=0)
+                    centroids[c] = center / (np.linalg.norm(center) or 1.0)
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=nlist)
+        self._ivf_centroids = centroids
+        self._ivf_indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._ivf_ids = order.astype(np.int32)
+
+    @staticmethod
+    def _import_hnswlib():
+        try:
+            import hnswlib
+        except ImportError:
+            raise ImportError("hnsw 모드에는 hnswlib 패키지가 필요합니다: pip install hnswlib")
+        return hnswlib
+
+    def _build_hnsw(self, m: int = 16, ef_construction: int = 200):
+        hnswlib = self._import_hnswlib()
+        self._hnsw = hnswlib.Index(space="ip", dim=self.dimension)
+        self._hnsw.init_index(max_elements=len(self.vectors), ef_construction=ef_construction, M=m)
+        self._hnsw.add_items(self._rows(), np.arange(len(self.vectors)))
+
+    # ------------------------------------------------------------------ 검색
+
+    def _list_mask(self, field: str, value: str) -> np.ndarray:
+        masks = self._list_masks[field]
+        if value not in masks:
+            masks[value] = np.array([value in (d.get(field) or []) for d in self.docs], dtype=bool)
+        return masks[value]
+
+    def prefilter_mask(self, specialist: str = None, filters: dict = None) -> np.ndarray:
+        """specialist/filters 조건을 만족하는 문서의 불리언 마스크를 계산합니다 (툼스톤 문서는 항상 제외)."""
+        mask = self._active.copy()
+        if specialist:
+            mask &= self._list_mask("specialists", specialist)
+        for field, condition in (filters or {}).items():
+            if field in self._numeric_columns:
+                column = self._numeric_columns[field]
+                ops = condition if isinstance(condition, dict) else {"$eq": condition}
+                for op, operand in ops.items():
+                    if op == "$eq": mask &= column == operand
+                    elif op == "$ne": mask &= column != operand
+                    elif op == "$gte": mask &= column >= operand
+                    elif op == "$gt": mask &= column > operand
+                    elif op == "$lte": mask &= column <= operand
+                    elif op == "$lt": mask &= column < operand
+                    elif op == "$in": mask &= np.isin(column, operand)
+                    else: raise ValueError(f"지원되지 않는 필터 연산자입니다: {op}")
+            elif field in LIST_FILTER_FIELDS and not isinstance(condition, dict):
+                mask &= self._list_mask(field, condition)
+            else:
+                # 그 외 필드는 문서 단위로 평가 (Atlas 필터와 동일한 의미)
+                mask &= np.array([matches_filters(d, None, {field: condition}) for d in self.docs], dtype=bool)
+        return mask
+
+    def _candidate_ids(self, query: np.ndarray, mask: np.ndarray, limit: int) -> np.ndarray:
+        allowed = np.flatnonzero(mask)
+        if self.mode == "ivf":
+            probe = np.argsort(-(self._ivf_centroids @ query))[:self.nprobe]
+            ids = np.concatenate([self._ivf_ids[self._ivf_indptr[c]:self._ivf_indptr[c + 1]] for c in probe])
+            ids = ids[mask[ids]]
+            # 필터가 강해서 탐색 클러스터 내 후보가 부족하면 전수 탐색으로 보완
+            return ids if len(ids) >= limit else allowed
+        if self.mode == "hnsw":
+            k = min(max(limit * 4, 50), len(allowed))
+            if k == 0:
+                return allowed
+            self._hnsw.set_ef(max(k, 64))
+            labels, _ = self._hnsw.knn_query(query, k=k, filter=lambda i: bool(mask[i]))
+            return labels[0].astype(np.int64)
+        return allowed
+
+    def search(self, query_vector: List[float], specialist: str = None, filters: dict = None,
+               limit: int = 3, include_vectors: bool = False) -> List[Dict[str, Any]]:
+        """코사인 유사도 상위 문서를 반환합니다. include_vectors=True이면 정규화된 벡터를 embedding으로 붙입니다."""
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape[0] != self.dimension:
+            raise ValueError(f"질의 벡터 차원이 인덱스와 다릅니다: 인덱스 {self.dimension}, 질의 {query.shape[0]}")
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        mask = self.prefilter_mask(specialist, filters)
+        ids = self._candidate_ids(query, mask, limit)
+        if len(ids) == 0:
+            return []
+        scores = self.vectors[ids] @ query
+        if self.scales is not None:
+            scores = scores * self.scales[ids]
+        top = np.argsort(-scores, kind="stable")[:limit]
+
+        results = []
+        for pos in top:
+            result = dict(self.docs[ids[pos]])
+            result["score"] = float(scores[pos])
+            result["score_type"] = "vector"
+            if include_vectors:
+                result["embedding"] = self._rows([ids[pos]])[0].tolist()
+            results.append(result)
+        return results
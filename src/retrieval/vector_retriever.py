@@ -1,32 +1,54 @@
 from langsmith import traceable
-from src.core.config import ZipsaConfig
+from src.core.config import ZipsaConfig, RetrievalConfig
 from src.utils.mongodb import MongoDBManager
 from src.embeddings.factory import EmbeddingFactory
+from src.retrieval.vector_index import VectorIndex
+from src.retrieval.filters import vector_tombstone_filter
+from src.retrieval.projection import resolve_fields, build_projection, project_doc
 
 class VectorRetriever:
-    def __init__(self, version="v2", collection_name=None):
+    def __init__(self, version="v2", collection_name=None, embedder=None, provider: str = None,
+                 backend: str = None, index_path: str = None, fields: list = None, include_vectors: bool = False):
+        self.version = version
         self.policy = ZipsaConfig.get_policy(version)
-        if version == "v1":
-            self.db = MongoDBManager.get_v1_db()
-        elif version == "v3":
-            self.db = MongoDBManager.get_v3_db()
-        else:
-            self.db = MongoDBManager.get_v2_db()
         
         self.collection_name = collection_name or self.policy.collection_name
-        self.collection = self.db[self.collection_name]
-        self.embedder = EmbeddingFactory.get_embedder()
+        self.embedder = embedder or EmbeddingFactory.get_shared_embedder(provider)
+
+        # "atlas": Atlas $vectorSearch, "local": 인프로세스 벡터 인덱스
+        self.backend = (backend or RetrievalConfig.VECTOR_BACKEND).lower()
+        self.local_index = VectorIndex.load_shared(index_path or RetrievalConfig.local_index_path("vector", version, self.collection_name)) if self.backend == "local" else None
+
+        # 반환 필드 집합 (기본: 컬렉션별 선언 필드). embedding은 include_vectors=True일 때만 포함
+        self.fields = resolve_fields(self.collection_name, fields)
+        self.include_vectors = include_vectors
+
+    @property
+    def collection(self):
+        # 공유 클라이언트 레지스트리에서 현재 이벤트 루프에 맞는 컬렉션을 조회
+        return MongoDBManager.get_db(self.version)[self.collection_name]
 
     @traceable(name="Vector Search")
-    async def search(self, query: str, specialist: str = None, limit: int = 3, filters: dict = None):
-        """Atlas 벡터 검색 로직을 처리합니다."""
+    async def search(self, query: str, specialist: str = None, limit: int = 3, filters: dict = None,
+                     fields: list = None, include_vectors: bool = None):
+        """Atlas 벡터 검색 로직을 처리합니다. fields/include_vectors로 호출 단위 프로젝션을 지정할 수 있습니다."""
         print(f"🔍 [VECTOR RETRIEVER]: '{query}' 검색 중 (전문가: {specialist}, 필터: {filters})...")
         
+        fields = self.fields if fields is None else fields
+        include_vectors = self.include_vectors if include_vectors is None else include_vectors
+
         try:
             query_vector = await self.embedder.embed_query(query)
+
+            if self.local_index is not None:
+                results = self.local_index.search(query_vector, specialist, filters, limit, include_vectors=include_vectors)
+                results = [project_doc(doc, fields, include_vectors) for doc in results]
+                print(f"✅ [VECTOR RETRIEVER]: {len(results)}건의 결과를 찾았습니다. (local/{self.local_index.mode})")
+                return results
             
             # 메타데이터 필터 구성
-            combined_filter = {}
+            # 툼스톤(deleted) 문서 제외: 인덱스에 deleted 필터 경로가 반영됐으면 pre-filter, 아니면 $vectorSearch 뒤 $match
+            combined_filter, tombstone_stages = vector_tombstone_filter(self.version)
             if specialist:
                 combined_filter["specialists"] = specialist
             if filters:
@@ -46,7 +68,9 @@ class VectorRetriever:
 
             results = await self.collection.aggregate([
                 vector_search_stage,
-                { "$set": { "score_type": "vector" } }
+                *tombstone_stages,
+                { "$set": { "score_type": "vector", "score": { "$meta": "vectorSearchScore" } } },
+                { "$project": build_projection(fields, include_vectors) }
             ]).to_list(None)
             
             print(f"✅ [VECTOR RETRIEVER]: {len(results)}건의 결과를 찾았습니다.")
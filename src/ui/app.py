@@ -3,6 +3,7 @@ import os
 import sys
 import asyncio
 import uuid
+import atexit
 import logging
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
@@ -49,6 +50,24 @@ from src.ui.renderers.cat_card import render_cat_cards
 from src.core.models.cat_card import CatCardRecommendation
 from src.ui.renderers.rag_doc import render_rag_documents
 from src.ui.renderers.reasoning import render_streaming_reasoning
+from src.utils import event_loop
+from src.utils.mongodb import MongoDBManager
+
+
+@st.cache_resource(show_spinner=False)
+def _start_services():
+    """프로세스당 한 번: 공유 이벤트 루프에서 MongoDB 클라이언트를 미리 연결하고, 종료 시 정리를 등록합니다."""
+    try:
+        event_loop.run(MongoDBManager.warm_up(), timeout=30)
+    except Exception as e:
+        # 워밍업 실패는 첫 질의에서 다시 연결을 시도하므로 앱 시작을 막지 않음
+        logger.warning(f"MongoDB 워밍업 실패: {e}")
+    atexit.register(event_loop.shutdown)
+    atexit.register(MongoDBManager.close_all)
+    return True
+
+
+_start_services()
 
 # --------------- 세션 초기화 ---------------
 _defaults = {
@@ -5,7 +5,7 @@ import streamlit as st
 from typing import AsyncGenerator, Dict, Any
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
-import asyncio
+from src.utils import event_loop
 
 # Jinja2 설정 (components 디렉토리 참조)
 template_dir = Path(__file__).parent.parent / "components"
@@ -22,9 +22,11 @@ def render_streaming_reasoning(stream_generator: AsyncGenerator[Dict[str, Any],
     
     template = env.get_template("reasoning_view.html")
     
-    async def _consume_stream():
+    # 스트림은 프로세스 공유 루프에서 생산하고 렌더링은 스크립트 스레드에서 수행
+    # (턴마다 asyncio.run으로 새 루프를 만들면 루프에 묶인 MongoDB/OpenAI 클라이언트가 매번 다시 생성됨)
+    def _consume_stream():
         nonlocal reasoning_text, response_text, metadata
-        async for event in stream_generator:
+        for event in event_loop.iterate(stream_generator):
             event_type = event.get("type")
             content = event.get("content", "")
             
@@ -52,4 +54,4 @@ def render_streaming_reasoning(stream_generator: AsyncGenerator[Dict[str, Any],
                 return None, {}
         return response_text, metadata
 
-    return asyncio.run(_consume_stream())
+    return _consume_stream()
@@ -0,0 +1,72 @@
+"""
+프로세스 수명 동안 유지되는 공유 이벤트 루프 (백그라운드 데몬 스레드)
+
+Streamlit은 턴마다 스크립트를 새 스레드에서 다시 실행하므로 asyncio.run을 쓰면 턴마다 루프가 새로 생기고,
+루프에 묶인 Motor/OpenAI 클라이언트도 턴마다 다시 만들어집니다 (TLS 핸드셰이크 반복).
+코루틴을 이 루프에 제출하면 클라이언트와 커넥션 풀이 턴 사이에 유지됩니다.
+"""
+import queue
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+_END = object()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """공유 루프를 반환합니다 (처음 호출 시 데몬 스레드에서 시작)."""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="zipsa-event-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run(coro: Awaitable[Any], timeout: float = None) -> Any:
+    """코루틴을 공유 루프에서 실행하고 결과를 기다립니다 (호출 스레드는 블로킹)."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+def iterate(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """
+    비동기 제너레이터를 공유 루프에서 소비하면서 호출 스레드에 동기 이터레이터로 넘겨줍니다.
+    Streamlit 렌더링(st.*)은 스크립트 스레드에서 해야 하므로, 이벤트 생산만 공유 루프에서 실행합니다.
+    호출자가 중간에 멈추면 남은 소비 작업을 취소합니다.
+    """
+    # 루프 쪽 put이 블로킹되지 않도록 크기 제한 없는 큐 사용
+    items: "queue.Queue" = queue.Queue()
+
+    async def _pump():
+        try:
+            async for item in agen:
+                items.put(item)
+        except Exception as e:
+            items.put(e)
+        finally:
+            items.put(_END)
+
+    future = asyncio.run_coroutine_threadsafe(_pump(), get_loop())
+    try:
+        while True:
+            item = items.get()
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        if not future.done():
+            future.cancel()
+
+
+def shutdown():
+    """공유 루프를 멈춥니다 (프로세스 종료 시)."""
+    global _loop
+    with _lock:
+        loop, _loop = _loop, None
+    if loop is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(loop.stop)
@@ -1,62 +1,242 @@
 import os
+import asyncio
+import threading
 import certifi
+from typing import Dict, Tuple, Any
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 from dotenv import load_dotenv
+from src.embeddings.profile import EmbeddingProfile
 
 load_dotenv()
 
+# 커넥션 풀 크기 설정 (프로세스 내 모든 리트리버가 공유)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    커넥션 풀 이벤트를 집계하는 리스너입니다.
+    checkout 시점에 사용 중인 커넥션이 maxPoolSize에 도달해 있으면 대기(wait)로 집계합니다.
+    """
+    def __init__(self, max_pool_size: int):
+        self.max_pool_size = max_pool_size
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.checkout_failures = 0
+        self.waits = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.in_use = 0
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event): pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            if self.in_use >= self.max_pool_size:
+                self.waits += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(0, self.in_use - 1)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checkout_failures": self.checkout_failures,
+                "waits": self.waits,
+                "in_use": self.in_use,
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+            }
+
+
+# 프로세스 전역 클라이언트 레지스트리: (URI, 이벤트 루프 id) -> (클라이언트, 루프, 풀 통계)
+# Motor 클라이언트는 생성된 이벤트 루프에 묶이므로 루프별로 분리해 보관합니다.
+_CLIENTS: Dict[Tuple[str, int], Tuple[AsyncIOMotorClient, Any, PoolStats]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _current_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
 
 class MongoDBManager:
     """
     MongoDB 연결을 중앙에서 관리하는 매니저 클래스입니다.
     V1 (레거시), V2 (프로), V3 클러스터를 모두 지원합니다.
+    클라이언트는 URI와 이벤트 루프 단위로 공유되므로, 호출할 때마다 TLS 핸드셰이크가 반복되지 않습니다.
     """
-    
+
+    @staticmethod
+    def get_client(uri: str) -> AsyncIOMotorClient:
+        """URI와 현재 이벤트 루프에 대응하는 공유 클라이언트를 반환합니다 (없으면 생성)."""
+        loop = _current_loop()
+        key = (uri, id(loop))
+        with _CLIENTS_LOCK:
+            MongoDBManager._prune_closed_loops()
+            entry = _CLIENTS.get(key)
+            if entry is None or entry[1] is not loop:
+                stats = PoolStats(MONGO_MAX_POOL_SIZE)
+                client = AsyncIOMotorClient(
+                    uri,
+                    tlsCAFile=certifi.where(),
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    event_listeners=[stats],
+                )
+                entry = (client, loop, stats)
+                _CLIENTS[key] = entry
+            return entry[0]
+
+    @staticmethod
+    def _prune_closed_loops():
+        """종료된 이벤트 루프에 묶인 클라이언트를 정리합니다 (호출자가 락 보유)."""
+        for key, (client, loop, _) in list(_CLIENTS.items()):
+            if loop is not None and loop.is_closed():
+                client.close()
+                del _CLIENTS[key]
+
+    @staticmethod
+    def _get_uri(version: str) -> str:
+        if version == "v1":
+            uri = os.getenv("MONGO_V1_URI") or os.getenv("MONGO_URI")
+            if not uri:
+                raise ValueError(".env 파일에서 MONGO_V1_URI 또는 MONGO_URI를 찾을 수 없습니다.")
+        elif version == "v2":
+            uri = os.getenv("MONGO_V2_URI")
+            if not uri:
+                raise ValueError(".env 파일에서 MONGO_V2_URI를 찾을 수 없습니다.")
+        else:
+            # V3 URI가 명시적으로 설정되지 않은 경우 V2 URI를 사용 (동일 클러스터로 가정)
+            uri = os.getenv("MONGO_V3_URI") or os.getenv("MONGO_V2_URI")
+            if not uri:
+                raise ValueError(".env 파일에서 MONGO_V3_URI 또는 MONGO_V2_URI를 찾을 수 없습니다.")
+        return uri
+
+    @staticmethod
+    def get_db(version: str):
+        from src.core.config import ZipsaConfig
+        client = MongoDBManager.get_client(MongoDBManager._get_uri(version))
+        return client[ZipsaConfig.get_policy(version).db_name]
+
     @staticmethod
     def get_v1_client():
-        uri = os.getenv("MONGO_V1_URI") or os.getenv("MONGO_URI")
-        if not uri:
-            raise ValueError(".env 파일에서 MONGO_V1_URI 또는 MONGO_URI를 찾을 수 없습니다.")
-        return AsyncIOMotorClient(uri, tlsCAFile=certifi.where())
+        return MongoDBManager.get_client(MongoDBManager._get_uri("v1"))
 
     @staticmethod
     def get_v2_client():
-        uri = os.getenv("MONGO_V2_URI")
-        if not uri:
-            raise ValueError(".env 파일에서 MONGO_V2_URI를 찾을 수 없습니다.")
-        return AsyncIOMotorClient(uri, tlsCAFile=certifi.where())
+        return MongoDBManager.get_client(MongoDBManager._get_uri("v2"))
+
+    @staticmethod
+    def get_v3_client():
+        return MongoDBManager.get_client(MongoDBManager._get_uri("v3"))
 
     @staticmethod
     def get_v1_db():
-        from src.core.config import ZipsaConfig
-        client = MongoDBManager.get_v1_client()
-        return client[ZipsaConfig.get_policy("v1").db_name]
+        return MongoDBManager.get_db("v1")
 
     @staticmethod
     def get_v2_db():
-        from src.core.config import ZipsaConfig
-        client = MongoDBManager.get_v2_client()
-        return client[ZipsaConfig.get_policy("v2").db_name]
+        return MongoDBManager.get_db("v2")
+
+    @staticmethod
+    def get_v3_db():
+        return MongoDBManager.get_db("v3")
+
+    @staticmethod
+    async def warm_up(versions=("v3",)):
+        """
+        서비스 시작 시 호출하여 클라이언트를 미리 생성하고 토폴로지 탐색 및 TLS 연결을 끝내 둡니다.
+        minPoolSize만큼의 커넥션은 드라이버가 백그라운드에서 채웁니다.
+        """
+        for version in versions:
+            client = MongoDBManager.get_client(MongoDBManager._get_uri(version))
+            await client.admin.command("ping")
+            print(f"🔌 [MONGODB]: {version} 클러스터 연결 준비 완료 (pool {MONGO_MIN_POOL_SIZE}~{MONGO_MAX_POOL_SIZE})")
+
+    @staticmethod
+    def close_all():
+        """레지스트리의 모든 클라이언트를 닫습니다 (프로세스/루프 종료 시 호출)."""
+        with _CLIENTS_LOCK:
+            for client, _, _ in _CLIENTS.values():
+                client.close()
+            _CLIENTS.clear()
+
+    @staticmethod
+    def get_pool_stats() -> Dict[str, Dict[str, int]]:
+        """URI(호스트 부분)별 커넥션 풀 카운터를 합산해 반환합니다."""
+        totals: Dict[str, Dict[str, int]] = {}
+        with _CLIENTS_LOCK:
+            for (uri, _), (_, _, stats) in _CLIENTS.items():
+                # 자격 증명이 로그에 노출되지 않도록 호스트 부분만 키로 사용
+                host = uri.split("@")[-1].split("/")[0].split("?")[0]
+                bucket = totals.setdefault(host, {})
+                for name, value in stats.snapshot().items():
+                    bucket[name] = bucket.get(name, 0) + value
+        return totals
+
+    @staticmethod
+    def get_vector_field(profile: EmbeddingProfile = None) -> Dict[str, Any]:
+        """
+        임베딩 프로파일(EMBEDDING_DIMENSIONS / EMBEDDING_PRECISION)에 맞춘 벡터 필드 정의입니다.
+        int8 프로파일은 문서에는 float 벡터를 저장하고 Atlas 스칼라 양자화로 인덱스 메모리를 줄입니다.
+        """
+        profile = profile or EmbeddingProfile.from_env()
+        field = {"numDimensions": profile.dimension, "path": "embedding", "similarity": "cosine", "type": "vector"}
+        if profile.precision == "int8":
+            field["quantization"] = "scalar"
+        return field
 
     @staticmethod
-    def get_v1_index_config():
+    def get_v1_index_config(profile: EmbeddingProfile = None):
         return {
             "name": "vector_index",
             "definition": {
                 "fields": [
-                    {"numDimensions": 1536, "path": "embedding", "similarity": "cosine", "type": "vector"},
+                    MongoDBManager.get_vector_field(profile),
                     {"path": "category", "type": "filter"}
                 ]
             }
         }
 
     @staticmethod
-    def get_v2_index_config():
+    def get_v2_index_config(profile: EmbeddingProfile = None):
         return {
             "name": "vector_index",
             "definition": {
                 "fields": [
-                    {"numDimensions": 1536, "path": "embedding", "similarity": "cosine", "type": "vector"},
+                    MongoDBManager.get_vector_field(profile),
                     {"path": "categories", "type": "filter"},
                     {"path": "specialists", "type": "filter"}
                 ]
@@ -64,30 +244,16 @@ class MongoDBManager:
         }
 
     @staticmethod
-    def get_v3_client():
-        uri = os.getenv("MONGO_V3_URI")
-        if not uri:
-            # V3 URI가 명시적으로 설정되지 않은 경우 V2 URI를 사용 (동일 클러스터로 가정)
-            uri = os.getenv("MONGO_V2_URI")
-            if not uri:
-                 raise ValueError(".env 파일에서 MONGO_V3_URI 또는 MONGO_V2_URI를 찾을 수 없습니다.")
-        return AsyncIOMotorClient(uri, tlsCAFile=certifi.where())
-
-    @staticmethod
-    def get_v3_db():
-        from src.core.config import ZipsaConfig
-        client = MongoDBManager.get_v3_client()
-        return client[ZipsaConfig.get_policy("v3").db_name]
-
-    @staticmethod
-    def get_v3_index_config():
+    def get_v3_index_config(profile: EmbeddingProfile = None):
         return {
             "name": "vector_index",
             "definition": {
                 "fields": [
-                    {"numDimensions": 1536, "path": "embedding", "similarity": "cosine", "type": "vector"},
+                    MongoDBManager.get_vector_field(profile),
                     {"path": "categories", "type": "filter"},
                     {"path": "specialists", "type": "filter"},
+                    # [증분 적재] 원본에서 사라진 문서(툼스톤) 제외용
+                    {"path": "deleted", "type": "filter"},
                     # [메타데이터 필터] 품종 통계를 위한 숫자 필터
                     {"path": "filter_shedding", "type": "filter"},
                     {"path": "filter_energy", "type": "filter"},
@@ -0,0 +1,84 @@
+import time
+import asyncio
+from typing import Optional
+
+class RateLimiter:
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 제한하는 비동기 토큰 버킷입니다.
+    두 버킷은 매 순간 선형으로 다시 채워지며, 한도가 None이면 해당 제한은 적용하지 않습니다.
+    여러 작업(배치 분류, 임베딩 요청 등)이 하나의 인스턴스를 공유해 같은 API 쿼터를 나눠 씁니다.
+    """
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute or 0)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    async def acquire(self, tokens: int = 0):
+        """요청 1건과 tokens만큼의 토큰 여유가 생길 때까지 대기한 뒤 차감합니다."""
+        # 버킷 용량보다 큰 요청은 용량만큼만 요구 (영원히 대기하지 않도록)
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.requests_per_minute and self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60 / self.requests_per_minute)
+                if self.tokens_per_minute and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.requests_per_minute:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= tokens
+
+    def consume(self, tokens: int):
+        """응답 후 실제 사용량이 추정치보다 많았을 때 초과분을 추가로 차감합니다."""
+        if self.tokens_per_minute and tokens > 0:
+            self._refill()
+            self._tokens -= tokens
+
+
+_encodings = {}
+
+def _get_encoding(model: str):
+    """모델별 tiktoken 인코딩 (tiktoken이 없으면 None)."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding("o200k_base")
+    return _encodings[model]
+
+def estimate_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """tiktoken으로 토큰 수를 계산합니다. tiktoken이 없으면 문자 수로 보수적으로 추정합니다."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text)
+    return len(encoding.encode(text))
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o-mini") -> str:
+    """텍스트를 max_tokens 토큰 이내로 자릅니다 (estimate_tokens와 같은 기준)."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens]
+    tokens = encoding.encode(text)
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])